@@ -1,18 +1,23 @@
 """Contract OCR & renewal tracker FastAPI application."""
 
-from processor import process_contract
+from processor import KeywordAutomaton, ocr_cache_stats, process_contract, shutdown_ocr_pool
+from db_pool import close_pools, connect as pool_connect
+from mail_transport import SmtpSettings, send_batch
 
+import base64
 import os
+import re
 import shutil
 import json
 import uuid
 import hashlib
 import hmac
 import secrets
-import smtplib
 import sqlite3
 import logging
 import traceback
+import threading
+import time
 import secrets
 import hmac
 import urllib.parse
@@ -20,7 +25,7 @@ import urllib.request
 from datetime import datetime, date, timedelta
 from email.message import EmailMessage
 from email.utils import parseaddr
-from typing import Optional, List, Literal, Dict, Any, Set, Tuple
+from typing import Callable, Iterator, Optional, List, Literal, Dict, Any, Set, Tuple
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Depends, Response
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
@@ -40,7 +45,46 @@ LOG_DIR = os.environ.get("CONTRACT_LOG", r"C:\ContractOCR\log")
 TESSERACT_CMD = os.environ.get(
     "TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 )
+# Processes used to OCR the pages of one contract in parallel (shared by all OCR workers).
+OCR_PAGE_WORKERS = max(1, int(os.environ.get("OCR_PAGE_WORKERS", str(os.cpu_count() or 1))))
+TESSERACT_LANG = os.environ.get("TESSERACT_LANG", "eng")
+# Per-page OCR text cache keyed by file hash + OCR settings; set OCR_CACHE_DIR="" to disable.
+OCR_CACHE_DIR = os.environ.get(
+    "OCR_CACHE_DIR", os.path.join(os.path.dirname(DB_PATH), "ocr_cache")
+)
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_MB", "512")) * 1024 * 1024
 POPPLER_PATH = os.environ.get("POPPLER_PATH", r"C:\poppler-25.12.0\Library\bin")
+OCR_WORKERS = max(1, int(os.environ.get("OCR_WORKERS", "2")))
+OCR_QUEUE_POLL_SECONDS = float(os.environ.get("OCR_QUEUE_POLL_SECONDS", "2"))
+# Each process refreshes heartbeat_at on the OCR jobs it is running; a 'processing' job
+# whose heartbeat is older than OCR_JOB_STALE_SECONDS belongs to a dead process and is requeued.
+OCR_JOB_HEARTBEAT_SECONDS = max(1.0, float(os.environ.get("OCR_JOB_HEARTBEAT_SECONDS", "30")))
+OCR_JOB_STALE_SECONDS = max(
+    OCR_JOB_HEARTBEAT_SECONDS * 2, float(os.environ.get("OCR_JOB_STALE_SECONDS", "180"))
+)
+# Notification outbox: queued email is delivered by a background dispatcher, retrying
+# failures after NOTIFICATION_OUTBOX_BACKOFF_SECONDS, doubled per attempt.
+NOTIFICATION_OUTBOX_POLL_SECONDS = float(os.environ.get("NOTIFICATION_OUTBOX_POLL_SECONDS", "5"))
+NOTIFICATION_OUTBOX_BATCH_SIZE = max(1, int(os.environ.get("NOTIFICATION_OUTBOX_BATCH_SIZE", "50")))
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = max(1, int(os.environ.get("NOTIFICATION_OUTBOX_MAX_ATTEMPTS", "5")))
+NOTIFICATION_OUTBOX_BACKOFF_SECONDS = float(
+    os.environ.get("NOTIFICATION_OUTBOX_BACKOFF_SECONDS", "30")
+)
+# How long a dispatcher owns the messages it claimed; after that another worker may
+# requeue them (e.g. when the claiming process died mid-send).
+NOTIFICATION_OUTBOX_CLAIM_SECONDS = max(
+    1, int(os.environ.get("NOTIFICATION_OUTBOX_CLAIM_SECONDS", "600"))
+)
+# Identifies this process on the rows and leases it claims, so concurrent uvicorn
+# workers only recover work whose owner has gone away.
+WORKER_TOKEN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+# Days of missed event reminders a run will catch up on after downtime.
+REMINDER_CATCHUP_MAX_DAYS = max(0, int(os.environ.get("REMINDER_CATCHUP_MAX_DAYS", "30")))
+# Built-in scheduler for the daily reminder jobs. Every worker checks on this cadence;
+# a lease in job_leases lets only one of them run a job at a time.
+JOB_SCHEDULER_ENABLED = os.environ.get("JOB_SCHEDULER_ENABLED", "true").lower() in {"1", "true", "yes"}
+JOB_SCHEDULER_INTERVAL_SECONDS = max(1.0, float(os.environ.get("JOB_SCHEDULER_INTERVAL_SECONDS", "900")))
+JOB_LEASE_SECONDS = max(1, int(os.environ.get("JOB_LEASE_SECONDS", "600")))
 
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 os.makedirs(DATA_ROOT, exist_ok=True)
@@ -155,6 +199,7 @@ def _startup():
     logger.info(f"APP START pid={os.getpid()}")
     logger.info(f"POPPLER_PATH: {POPPLER_PATH}")
     logger.info(f"TESSERACT_CMD: {TESSERACT_CMD}")
+    logger.info(f"OCR_WORKERS: {OCR_WORKERS} OCR_PAGE_WORKERS: {OCR_PAGE_WORKERS}")
 
     if not os.path.exists(TESSERACT_CMD):
         logger.error(f"Tesseract not found at: {TESSERACT_CMD}")
@@ -168,11 +213,19 @@ def _startup():
             logger.error(f"pdftoppm.exe not found at: {pdftoppm}")
 
     init_db()
+    _start_ocr_workers()
+    _start_notification_dispatcher()
+    _start_job_scheduler()
     logger.info("APP READY")
 
 
 @app.on_event("shutdown")
 def _shutdown():
+    _stop_job_scheduler()
+    _stop_ocr_workers()
+    _stop_notification_dispatcher()
+    shutdown_ocr_pool()
+    close_pools()
     logger.info("APP SHUTDOWN")
 
 
@@ -203,10 +256,13 @@ async def global_exception_handler(request: Request, exc: Exception):
 # DB helpers
 # ----------------------------
 def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return pool_connect(DB_PATH)
+
+
+def get_db() -> Iterator[sqlite3.Connection]:
+    """Per-request connection for handlers that query through it instead of ``db()``."""
+    with db() as conn:
+        yield conn
 
 
 def now_iso() -> str:
@@ -244,6 +300,28 @@ def safe_json_dict(value: Optional[str]) -> Dict[str, Any]:
     return data if isinstance(data, dict) else {}
 
 
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor: the last row's sort key followed by its id."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+    # Values are bound straight into SQL, so only plain sort keys are accepted.
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(v, (str, int)) and not isinstance(v, bool) for v in values)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
 def safe_json_int_list(value: Optional[str]) -> List[int]:
     if not value:
         return []
@@ -293,7 +371,7 @@ def _validate_role_ids(conn: sqlite3.Connection, role_ids: List[int]) -> List[in
 
 
 def _permission_definition_map() -> Dict[str, Dict[str, Any]]:
-    return {perm["key"]: perm for perm in PERMISSION_DEFINITIONS}
+    return PERMISSION_DEFINITION_MAP
 
 
 def _permission_default_allow(permission_key: str) -> bool:
@@ -319,6 +397,58 @@ def _ensure_permission_defaults(conn: sqlite3.Connection) -> None:
         )
 
 
+# Role name -> permission keys, rebuilt when role_permissions or roles change in this
+# process; PERMISSION_CACHE_SECONDS bounds staleness for changes made by other workers.
+_permission_matrix: Optional[Dict[str, Any]] = None
+_permission_matrix_version = 0
+_permission_matrix_lock = threading.Lock()
+
+
+def _invalidate_permission_matrix() -> None:
+    global _permission_matrix, _permission_matrix_version
+    with _permission_matrix_lock:
+        _permission_matrix_version += 1
+        _permission_matrix = None
+
+
+def _get_permission_matrix(conn: sqlite3.Connection) -> Dict[str, Any]:
+    global _permission_matrix
+    with _permission_matrix_lock:
+        matrix = _permission_matrix
+        version = _permission_matrix_version
+    if matrix is not None and time.monotonic() < matrix["expires_at"]:
+        return matrix
+    rows = conn.execute(
+        """
+        SELECT rp.permission_key, r.name AS role_name
+        FROM role_permissions rp
+        JOIN auth_roles r ON r.id = rp.role_id
+        """
+    ).fetchall()
+    role_keys: Dict[str, Set[str]] = {}
+    for row in rows:
+        role_keys.setdefault(row["role_name"], set()).add(row["permission_key"])
+    assigned = {
+        row["permission_key"]
+        for row in conn.execute("SELECT DISTINCT permission_key FROM role_permissions")
+    }
+    matrix = {
+        "version": version,
+        "expires_at": time.monotonic() + PERMISSION_CACHE_SECONDS,
+        "role_keys": role_keys,
+        # Keys nobody is assigned to fall back to their default_allow flag.
+        "default_keys": {
+            key
+            for key, perm in PERMISSION_DEFINITION_MAP.items()
+            if perm.get("default_allow") and key not in assigned
+        },
+    }
+    with _permission_matrix_lock:
+        if _permission_matrix_version == version:
+            _permission_matrix = matrix
+    return matrix
+
+
 def _get_permission_assignments(conn: sqlite3.Connection) -> Dict[str, List[int]]:
     rows = conn.execute(
         "SELECT permission_key, role_id FROM role_permissions"
@@ -346,22 +476,11 @@ def _user_has_permission(
         return True
     if not user:
         return False
-    row = conn.execute(
-        """
-        SELECT 1
-        FROM role_permissions rp
-        JOIN auth_user_roles ur ON ur.role_id = rp.role_id
-        WHERE ur.user_id = ? AND rp.permission_key = ?
-        LIMIT 1
-        """,
-        (user["id"], permission_key),
-    ).fetchone()
-    if row:
-        return True
-    assignments = _get_permission_assignments(conn)
-    if not assignments.get(permission_key) and _permission_default_allow(permission_key):
+    matrix = _get_permission_matrix(conn)
+    if permission_key in matrix["default_keys"]:
         return True
-    return False
+    role_keys = matrix["role_keys"]
+    return any(permission_key in role_keys.get(role, ()) for role in user.get("roles", []))
 
 
 def _require_permission(
@@ -382,34 +501,11 @@ def _get_user_permission_keys(
         return [perm["key"] for perm in PERMISSION_DEFINITIONS]
     if not user:
         return []
-    role_rows = conn.execute(
-        "SELECT role_id FROM auth_user_roles WHERE user_id = ?",
-        (user["id"],),
-    ).fetchall()
-    role_ids = {row["role_id"] for row in role_rows}
-    if not role_ids:
-        role_ids = set()
-    rows = []
-    if role_ids:
-        placeholders = ",".join("?" for _ in role_ids)
-        rows = conn.execute(
-            f"""
-            SELECT DISTINCT permission_key
-            FROM role_permissions
-            WHERE role_id IN ({placeholders})
-            """,
-            tuple(role_ids),
-        ).fetchall()
-    assigned = {row["permission_key"] for row in rows}
-    assignments = _get_permission_assignments(conn)
-    for permission in PERMISSION_DEFINITIONS:
-        key = permission["key"]
-        if key in assigned:
-            continue
-        if not assignments.get(key) and permission.get("default_allow"):
-            assigned.add(key)
-    if user:
-        assigned.add("pending_agreements_view")
+    matrix = _get_permission_matrix(conn)
+    assigned = set(matrix["default_keys"])
+    for role in user.get("roles", []):
+        assigned.update(matrix["role_keys"].get(role, ()))
+    assigned.add("pending_agreements_view")
     return sorted(assigned)
 
 
@@ -536,6 +632,7 @@ def _set_contract_profit_centers(
 
 
 def _set_user_roles(conn: sqlite3.Connection, user_id: int, role_ids: List[int]) -> None:
+    # Callers invalidate the session cache once their transaction has committed.
     conn.execute("DELETE FROM auth_user_roles WHERE user_id = ?", (user_id,))
     if not role_ids:
         return
@@ -628,6 +725,18 @@ def verify_password(password: str, stored_hash: str) -> bool:
 AUTH_REQUIRED = _env_bool("AUTH_REQUIRED", True)
 AUTH_COOKIE_NAME = os.environ.get("AUTH_COOKIE_NAME", "contractocr_session")
 AUTH_COOKIE_SECURE = _env_bool("AUTH_COOKIE_SECURE", False)
+# Seconds a resolved session is reused in-process before re-reading auth tables (0 disables).
+AUTH_SESSION_CACHE_SECONDS = float(os.environ.get("AUTH_SESSION_CACHE_SECONDS", "30"))
+PERMISSION_CACHE_SECONDS = float(os.environ.get("PERMISSION_CACHE_SECONDS", "30"))
+# Seconds a notification log total is reused for the same filters (0 disables).
+NOTIFICATION_LOG_TOTAL_CACHE_SECONDS = float(
+    os.environ.get("NOTIFICATION_LOG_TOTAL_CACHE_SECONDS", "60")
+)
+# Seconds the compiled tag / agreement-type keyword matcher is reused before reloading,
+# which bounds staleness for keyword changes made by other workers.
+KEYWORD_MATCHER_CACHE_SECONDS = float(os.environ.get("KEYWORD_MATCHER_CACHE_SECONDS", "60"))
+# SMTP sessions a reminder run keeps open in parallel; each is reused for many messages.
+SMTP_MAX_CONNECTIONS = max(1, int(os.environ.get("SMTP_MAX_CONNECTIONS", "4")))
 try:
     AUTH_SESSION_DAYS = int(os.environ.get("AUTH_SESSION_DAYS", "7"))
 except ValueError:
@@ -662,6 +771,9 @@ def init_db():
         conn.executescript(SEED_TERMS_SQL)
         conn.executescript(SEED_TAGS_SQL)
         _apply_migrations(conn)
+    # After commit, so a concurrent reader cannot re-cache the pre-migration rows.
+    _invalidate_permission_matrix()
+    _invalidate_keyword_matcher()
 
 
 def _seed_agreement_types(conn: sqlite3.Connection) -> None:
@@ -809,6 +921,7 @@ PERMISSION_DEFINITIONS = [
         "default_allow": False,
     },
 ]
+PERMISSION_DEFINITION_MAP = {perm["key"]: perm for perm in PERMISSION_DEFINITIONS}
 
 
 def _seed_profit_centers(conn: sqlite3.Connection) -> None:
@@ -948,6 +1061,9 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
         )
 
     conn.execute("CREATE INDEX IF NOT EXISTS idx_contracts_title ON contracts(title)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contracts_uploaded_at_id ON contracts(uploaded_at, id)"
+    )
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_contracts_original_filename ON contracts(original_filename)"
     )
@@ -1131,6 +1247,8 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
           ON action_logs(entity_type, entity_id);
         CREATE INDEX IF NOT EXISTS idx_action_logs_user
           ON action_logs(user_id);
+        CREATE INDEX IF NOT EXISTS idx_action_logs_created_at_id
+          ON action_logs(created_at, id);
         """
     )
 
@@ -1212,6 +1330,16 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
             ),
         )
 
+    if has_table("auth_users") and not has_column("auth_users", "is_active"):
+        conn.execute(
+            "ALTER TABLE auth_users ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1"
+        )
+    if has_table("auth_user_roles") and not has_column("auth_user_roles", "created_at"):
+        conn.execute("ALTER TABLE auth_user_roles ADD COLUMN created_at TEXT")
+    if has_table("auth_sessions") and not has_column("auth_sessions", "id"):
+        # Sessions are disposable; recreate with the id column the auth code expects.
+        conn.execute("DROP TABLE auth_sessions")
+
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS auth_users (
@@ -1324,6 +1452,60 @@ CREATE INDEX IF NOT EXISTS idx_auth_oidc_states_expires ON auth_oidc_states(expi
             CREATE INDEX IF NOT EXISTS idx_notification_logs_status ON notification_logs(status);
             """
         )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_notification_logs_created_at_id
+          ON notification_logs(created_at, id)
+        """
+    )
+    if not has_column("notification_logs", "attempts"):
+        conn.execute(
+            "ALTER TABLE notification_logs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+        )
+    if not has_column("notification_logs", "next_attempt_at"):
+        conn.execute("ALTER TABLE notification_logs ADD COLUMN next_attempt_at TEXT")
+    if not has_column("notification_logs", "sent_at"):
+        conn.execute("ALTER TABLE notification_logs ADD COLUMN sent_at TEXT")
+    if not has_column("notification_logs", "claimed_by"):
+        conn.execute("ALTER TABLE notification_logs ADD COLUMN claimed_by TEXT")
+    if not has_column("notification_logs", "claim_expires_at"):
+        conn.execute("ALTER TABLE notification_logs ADD COLUMN claim_expires_at TEXT")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_notification_logs_outbox
+          ON notification_logs(next_attempt_at) WHERE status = 'queued'
+        """
+    )
+    # The full-text index is keyed on log_seq, not the implicit rowid, which VACUUM
+    # may renumber on a table whose primary key is TEXT.
+    if not has_column("notification_logs", "log_seq"):
+        conn.execute("ALTER TABLE notification_logs ADD COLUMN log_seq INTEGER")
+        conn.execute("UPDATE notification_logs SET log_seq = rowid")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_notification_logs_log_seq ON notification_logs(log_seq)"
+    )
+    fts = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notification_logs_fts'"
+    ).fetchone()
+    if fts and "content_rowid='log_seq'" not in fts["sql"]:
+        conn.execute("DROP TABLE notification_logs_fts")
+        fts = None
+    if not fts:
+        conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS notification_logs_fts USING fts5(
+              subject,
+              recipients_json,
+              body,
+              kind,
+              related_id,
+              metadata_json,
+              content='notification_logs',
+              content_rowid='log_seq'
+            );
+            INSERT INTO notification_logs_fts(notification_logs_fts) VALUES ('rebuild');
+            """
+        )
 
     if not has_table("pending_agreements"):
         conn.executescript(
@@ -1464,6 +1646,25 @@ CREATE INDEX IF NOT EXISTS idx_auth_oidc_states_expires ON auth_oidc_states(expi
             """
         )
 
+    if not has_table("task_assignees"):
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS task_assignees (
+              task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+              email TEXT NOT NULL,
+              PRIMARY KEY (task_id, email)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_task_assignees_email
+              ON task_assignees(email, task_id);
+            """
+        )
+        rows = conn.execute("SELECT id, assignees_json FROM tasks").fetchall()
+        for row in rows:
+            _set_task_assignees(conn, row["id"], safe_json_list(row["assignees_json"]))
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id ON tasks(created_at DESC, id)"
+    )
+
     if not has_table("pending_agreement_files"):
         conn.executescript(
             """
@@ -1509,6 +1710,52 @@ CREATE INDEX IF NOT EXISTS idx_auth_oidc_states_expires ON auth_oidc_states(expi
                 """
             )
 
+    if not has_column("term_instances", "source_start"):
+        conn.execute("ALTER TABLE term_instances ADD COLUMN source_start INTEGER")
+    if not has_column("term_instances", "source_end"):
+        conn.execute("ALTER TABLE term_instances ADD COLUMN source_end INTEGER")
+
+    if not has_column("ocr_pages", "source"):
+        conn.execute("ALTER TABLE ocr_pages ADD COLUMN source TEXT NOT NULL DEFAULT 'ocr'")
+
+    if not has_column("job_runs", "contract_id"):
+        conn.execute("ALTER TABLE job_runs ADD COLUMN contract_id TEXT")
+    if not has_column("job_runs", "progress"):
+        conn.execute("ALTER TABLE job_runs ADD COLUMN progress INTEGER NOT NULL DEFAULT 0")
+    if not has_column("job_runs", "claimed_by"):
+        conn.execute("ALTER TABLE job_runs ADD COLUMN claimed_by TEXT")
+    if not has_column("job_runs", "heartbeat_at"):
+        conn.execute("ALTER TABLE job_runs ADD COLUMN heartbeat_at TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_runs_name_status ON job_runs(job_name, status)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_runs_contract_id ON job_runs(contract_id)"
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_pending_agreement_notes_latest
+          ON pending_agreement_notes(pending_agreement_id, created_at)
+        """
+    )
+
+    if not has_table("reminder_schedule"):
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reminder_schedule (
+              event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+              offset_days INTEGER NOT NULL,
+              scheduled_for TEXT NOT NULL,
+              PRIMARY KEY (event_id, offset_days)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_reminder_schedule_scheduled_for
+              ON reminder_schedule(scheduled_for);
+            """
+        )
+        _refresh_reminder_schedule(conn)
+
+    _install_contract_visibility_index(conn, backfill=not has_table("contract_visibility"))
+
 
 def _get_app_setting(
     conn: sqlite3.Connection, key: str, default: Optional[str] = None
@@ -1605,7 +1852,8 @@ def _send_new_user_notification(
         return
     subject = "New user created - Permissions required"
     body = _format_new_user_notification_body(name, email, created_at, user_id)
-    _send_email_with_log(
+    _enqueue_notification(
+        conn,
         [recipient],
         subject,
         body,
@@ -2382,6 +2630,7 @@ CREATE TABLE IF NOT EXISTS ocr_pages (
   contract_id TEXT NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
   page_number INTEGER NOT NULL,
   text TEXT NOT NULL,
+  source TEXT NOT NULL DEFAULT 'ocr',
   created_at TEXT NOT NULL
 );
 CREATE UNIQUE INDEX IF NOT EXISTS ux_ocr_pages_contract_page ON ocr_pages(contract_id, page_number);
@@ -2407,6 +2656,8 @@ CREATE TABLE IF NOT EXISTS term_instances (
   status TEXT NOT NULL DEFAULT 'smart',
   source_page INTEGER,
   source_snippet TEXT,
+  source_start INTEGER,
+  source_end INTEGER,
   updated_at TEXT NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_term_instances_contract ON term_instances(contract_id);
@@ -2461,6 +2712,7 @@ CREATE TABLE IF NOT EXISTS auth_users (
   email TEXT NOT NULL,
   password_hash TEXT NOT NULL,
   is_admin INTEGER NOT NULL DEFAULT 0,
+  is_active INTEGER NOT NULL DEFAULT 1,
   created_at TEXT NOT NULL,
   updated_at TEXT NOT NULL
 );
@@ -2477,11 +2729,12 @@ CREATE TABLE IF NOT EXISTS auth_roles (
 CREATE TABLE IF NOT EXISTS auth_user_roles (
   user_id INTEGER NOT NULL REFERENCES auth_users(id) ON DELETE CASCADE,
   role_id INTEGER NOT NULL REFERENCES auth_roles(id) ON DELETE CASCADE,
+  created_at TEXT,
   PRIMARY KEY (user_id, role_id)
 );
 
 CREATE TABLE IF NOT EXISTS auth_sessions (
-  token TEXT PRIMARY KEY,
+  id TEXT PRIMARY KEY,
   user_id INTEGER NOT NULL REFERENCES auth_users(id) ON DELETE CASCADE,
   created_at TEXT NOT NULL,
   expires_at TEXT NOT NULL
@@ -2508,7 +2761,13 @@ CREATE TABLE IF NOT EXISTS notification_logs (
   error TEXT,
   related_id TEXT,
   metadata_json TEXT,
-  created_at TEXT NOT NULL
+  created_at TEXT NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at TEXT,
+  sent_at TEXT,
+  log_seq INTEGER,
+  claimed_by TEXT,
+  claim_expires_at TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_notification_logs_created_at ON notification_logs(created_at);
 CREATE INDEX IF NOT EXISTS idx_notification_logs_kind ON notification_logs(kind);
@@ -2562,6 +2821,8 @@ CREATE TABLE IF NOT EXISTS pending_agreement_notes (
 );
 CREATE INDEX IF NOT EXISTS idx_pending_agreement_notes_agreement
   ON pending_agreement_notes(pending_agreement_id);
+CREATE INDEX IF NOT EXISTS idx_pending_agreement_notes_latest
+  ON pending_agreement_notes(pending_agreement_id, created_at);
 
 CREATE TABLE IF NOT EXISTS pending_agreement_reminders (
   id TEXT PRIMARY KEY,
@@ -2597,7 +2858,17 @@ CREATE TABLE IF NOT EXISTS job_runs (
   started_at TEXT NOT NULL,
   finished_at TEXT,
   status TEXT NOT NULL,
-  detail TEXT
+  detail TEXT,
+  contract_id TEXT,
+  progress INTEGER NOT NULL DEFAULT 0,
+  claimed_by TEXT,
+  heartbeat_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS job_leases (
+  job_name TEXT PRIMARY KEY,
+  holder TEXT NOT NULL,
+  expires_at TEXT NOT NULL
 );
 
 CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(
@@ -2762,55 +3033,108 @@ DEFAULT_PENDING_AGREEMENT_RECIPIENTS = [
 # ----------------------------
 # Tag + agreement helpers
 # ----------------------------
+# Tag and agreement-type keywords compiled into one automaton per use, rebuilt when the
+# keyword endpoints change data in this process or after KEYWORD_MATCHER_CACHE_SECONDS.
+_keyword_matcher: Optional[Dict[str, Any]] = None
+_keyword_matcher_version = 0
+_keyword_matcher_lock = threading.Lock()
+
+
+def _invalidate_keyword_matcher() -> None:
+    global _keyword_matcher, _keyword_matcher_version
+    with _keyword_matcher_lock:
+        _keyword_matcher_version += 1
+        _keyword_matcher = None
+
+
+def _get_keyword_matcher(conn: sqlite3.Connection) -> Dict[str, Any]:
+    global _keyword_matcher
+    with _keyword_matcher_lock:
+        matcher = _keyword_matcher
+        version = _keyword_matcher_version
+    if matcher is not None and time.monotonic() < matcher["expires_at"]:
+        return matcher
+
+    tag_keywords: Dict[str, Set[int]] = {}
+    for row in conn.execute(
+        """
+        SELECT t.id as tag_id, tk.keyword
+        FROM tags t
+        JOIN tag_keywords tk ON tk.tag_id = t.id
+        """
+    ):
+        keyword = row["keyword"].lower()
+        if keyword:
+            tag_keywords.setdefault(keyword, set()).add(row["tag_id"])
+
+    # Kept in query order: ties between agreement types go to the first one listed.
+    agreement_keywords: List[Tuple[str, str, int]] = []
+    type_names: Dict[str, str] = {}
+    for row in conn.execute(
+        """
+        SELECT at.name, ak.keyword
+        FROM agreement_types at
+        LEFT JOIN agreement_type_keywords ak ON ak.agreement_type_id = at.id
+        """
+    ):
+        name = row["name"]
+        type_names[name.lower()] = name
+        keyword = (row["keyword"] or "").strip()
+        if keyword:
+            agreement_keywords.append((name, keyword.lower(), len(keyword)))
+
+    matcher = {
+        "version": version,
+        "expires_at": time.monotonic() + KEYWORD_MATCHER_CACHE_SECONDS,
+        "tag_keywords": tag_keywords,
+        "tag_automaton": KeywordAutomaton(tag_keywords),
+        "agreement_keywords": agreement_keywords,
+        "type_names": type_names,
+        "agreement_automaton": KeywordAutomaton(
+            [keyword for _, keyword, _ in agreement_keywords] + list(type_names)
+        ),
+    }
+    with _keyword_matcher_lock:
+        if _keyword_matcher_version == version:
+            _keyword_matcher = matcher
+    return matcher
+
+
 def auto_tag_contract(contract_id: str, ocr_text: str):
     with db() as conn:
-        rows = conn.execute(
-            """
-            SELECT t.id as tag_id, tk.keyword
-            FROM tags t
-            JOIN tag_keywords tk ON tk.tag_id = t.id
+        matcher = _get_keyword_matcher(conn)
+        tag_ids: Set[int] = set()
+        for keyword in matcher["tag_automaton"].find(ocr_text.lower()):
+            tag_ids.update(matcher["tag_keywords"][keyword])
+        if not tag_ids:
+            return
+        created_at = now_iso()
+        conn.executemany(
             """
-        ).fetchall()
-
-        ocr_lower = ocr_text.lower()
-        for row in rows:
-            if row["keyword"].lower() in ocr_lower:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO contract_tags (contract_id, tag_id, auto_generated, created_at)
-                    VALUES (?, ?, 1, ?)
-                    """,
-                    (contract_id, row["tag_id"], now_iso()),
-                )
+            INSERT OR IGNORE INTO contract_tags (contract_id, tag_id, auto_generated, created_at)
+            VALUES (?, ?, 1, ?)
+            """,
+            [(contract_id, tag_id, created_at) for tag_id in sorted(tag_ids)],
+        )
 
 
 def detect_agreement_type(ocr_text: str, filename: str) -> str:
     text_lower = (ocr_text + " " + filename).lower()
 
-    matches: Dict[str, int] = {}
-    type_names: Dict[str, str] = {}
     with db() as conn:
-        rows = conn.execute(
-            """
-            SELECT at.name, ak.keyword
-            FROM agreement_types at
-            LEFT JOIN agreement_type_keywords ak ON ak.agreement_type_id = at.id
-            """
-        ).fetchall()
-        for row in rows:
-            name = row["name"]
-            type_names[name.lower()] = name
-            keyword = (row["keyword"] or "").strip()
-            if not keyword:
-                continue
-            if keyword.lower() in text_lower:
-                matches[name] = max(matches.get(name, 0), len(keyword))
+        matcher = _get_keyword_matcher(conn)
+    found = matcher["agreement_automaton"].find(text_lower)
+
+    matches: Dict[str, int] = {}
+    for name, keyword, length in matcher["agreement_keywords"]:
+        if keyword in found:
+            matches[name] = max(matches.get(name, 0), length)
 
     if matches:
         return max(matches, key=matches.get)
 
-    for lower_name, name in type_names.items():
-        if lower_name and lower_name in text_lower and name not in {"Agreement Types"}:
+    for lower_name, name in matcher["type_names"].items():
+        if lower_name and lower_name in found and name not in {"Agreement Types"}:
             return name
     return "Uncategorized"
 
@@ -2938,39 +3262,99 @@ def _get_user_roles(conn: sqlite3.Connection, user_id: int) -> List[str]:
     return [row["name"] for row in rows]
 
 
-def get_current_user(request: Request) -> Optional[Dict[str, Any]]:
+# token -> (cache deadline on the monotonic clock, session expiry, principal)
+_session_cache: Dict[str, Tuple[float, Optional[datetime], Dict[str, Any]]] = {}
+_session_cache_lock = threading.Lock()
+
+
+def _invalidate_session_cache(
+    user_id: Optional[int] = None, token: Optional[str] = None
+) -> None:
+    """Drop cached principals for one session, one user, or (no arguments) everyone."""
+    with _session_cache_lock:
+        if token is not None:
+            _session_cache.pop(token, None)
+        elif user_id is not None:
+            for key, (_, _, user) in list(_session_cache.items()):
+                if user["id"] == user_id:
+                    del _session_cache[key]
+        else:
+            _session_cache.clear()
+
+
+def _session_cache_get(token: str) -> Optional[Dict[str, Any]]:
+    with _session_cache_lock:
+        entry = _session_cache.get(token)
+        if not entry:
+            return None
+        deadline, expires, user = entry
+        if time.monotonic() >= deadline or (expires and expires <= datetime.utcnow()):
+            del _session_cache[token]
+            return None
+        return user
+
+
+def _load_session_user(conn: sqlite3.Connection, token: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        """
+        SELECT s.id AS session_id, s.expires_at,
+               u.id, u.name, u.email, u.is_active
+        FROM auth_sessions s
+        JOIN auth_users u ON u.id = s.user_id
+        WHERE s.id = ?
+        """,
+        (token,),
+    ).fetchone()
+    if not row:
+        return None
+    if not row["is_active"]:
+        return None
+    expires = _parse_iso_datetime(row["expires_at"])
+    if expires and expires <= datetime.utcnow():
+        conn.execute("DELETE FROM auth_sessions WHERE id = ?", (token,))
+        conn.commit()
+        return None
+    roles = _get_user_roles(conn, row["id"])
+    user = {
+        "id": row["id"],
+        "name": row["name"],
+        "email": row["email"],
+        "roles": roles,
+    }
+    if AUTH_SESSION_CACHE_SECONDS > 0:
+        with _session_cache_lock:
+            _session_cache[token] = (
+                time.monotonic() + AUTH_SESSION_CACHE_SECONDS,
+                expires,
+                user,
+            )
+    return user
+
+
+def get_current_user(
+    request: Request, conn: Optional[sqlite3.Connection] = None
+) -> Optional[Dict[str, Any]]:
+    """Resolve the session principal once per request (then reuse request.state)."""
     token = request.cookies.get(AUTH_COOKIE_NAME)
     if not token:
         return None
-    with db() as conn:
-        row = conn.execute(
-            """
-            SELECT s.id AS session_id, s.expires_at,
-                   u.id, u.name, u.email, u.is_active
-            FROM auth_sessions s
-            JOIN auth_users u ON u.id = s.user_id
-            WHERE s.id = ?
-            """,
-            (token,),
-        ).fetchone()
-        if not row:
-            return None
-        if not row["is_active"]:
-            return None
-        expires = _parse_iso_datetime(row["expires_at"])
-        if expires and expires <= datetime.utcnow():
-            conn.execute("DELETE FROM auth_sessions WHERE id = ?", (token,))
-            return None
-        roles = _get_user_roles(conn, row["id"])
-        return {
-            "id": row["id"],
-            "name": row["name"],
-            "email": row["email"],
-            "roles": roles,
-        }
+    if getattr(request.state, "auth_token", None) == token:
+        return request.state.auth_user
+    user = _session_cache_get(token)
+    if user is None:
+        if conn is None:
+            with db() as conn:
+                user = _load_session_user(conn, token)
+        else:
+            user = _load_session_user(conn, token)
+    request.state.auth_token = token
+    request.state.auth_user = user
+    return user
 
 
 def require_user(request: Request) -> Optional[Dict[str, Any]]:
+    # Checks out a connection only on a session cache miss and returns it before the
+    # handler runs, so a request never holds this one alongside the handler's own.
     if not AUTH_REQUIRED:
         return None
     user = get_current_user(request)
@@ -3258,14 +3642,16 @@ def create_agreement_type(
             "INSERT INTO agreement_types (name, created_at) VALUES (?, ?)",
             (name, now_iso()),
         )
-        return {"id": cur.lastrowid, "name": name}
+    _invalidate_keyword_matcher()
+    return {"id": cur.lastrowid, "name": name}
 
 
 @app.delete("/api/agreement-types/{agreement_type_id}")
 def delete_agreement_type(agreement_type_id: int, _: Dict[str, Any] = Depends(require_admin)):
     with db() as conn:
         conn.execute("DELETE FROM agreement_types WHERE id = ?", (agreement_type_id,))
-        return {"deleted": agreement_type_id}
+    _invalidate_keyword_matcher()
+    return {"deleted": agreement_type_id}
 
 
 @app.get("/api/agreement-type-keywords")
@@ -3307,7 +3693,8 @@ def create_agreement_type_keyword(
             """,
             (payload.agreement_type_id, keyword, now_iso()),
         )
-        return {"id": cur.lastrowid, "agreement_type_id": payload.agreement_type_id, "keyword": keyword}
+    _invalidate_keyword_matcher()
+    return {"id": cur.lastrowid, "agreement_type_id": payload.agreement_type_id, "keyword": keyword}
 
 
 # ----------------------------
@@ -3386,7 +3773,8 @@ def delete_profit_center(
 def delete_agreement_type_keyword(keyword_id: int, _: Dict[str, Any] = Depends(require_admin)):
     with db() as conn:
         conn.execute("DELETE FROM agreement_type_keywords WHERE id = ?", (keyword_id,))
-        return {"deleted": keyword_id}
+    _invalidate_keyword_matcher()
+    return {"deleted": keyword_id}
 
 
 @app.get("/api/tags")
@@ -3404,7 +3792,8 @@ def create_tag(tag: TagCreate, _: Dict[str, Any] = Depends(require_admin)):
             (tag.name, tag.color, now_iso()),
         )
         tag_id = cur.lastrowid
-        return {"id": tag_id, "name": tag.name, "color": tag.color}
+    _invalidate_keyword_matcher()
+    return {"id": tag_id, "name": tag.name, "color": tag.color}
 
 
 @app.put("/api/tags/{tag_id}")
@@ -3421,7 +3810,8 @@ def update_tag(tag_id: int, tag: TagUpdate, _: Dict[str, Any] = Depends(require_
 def delete_tag(tag_id: int, _: Dict[str, Any] = Depends(require_admin)):
     with db() as conn:
         conn.execute("DELETE FROM tags WHERE id = ?", (tag_id,))
-        return {"deleted": tag_id}
+    _invalidate_keyword_matcher()
+    return {"deleted": tag_id}
 
 
 # ----------------------------
@@ -3484,7 +3874,9 @@ def update_role(
                 "UPDATE auth_roles SET description = ? WHERE id = ?",
                 (payload.description, role_id),
             )
-        return {"id": role_id}
+    _invalidate_session_cache()
+    _invalidate_permission_matrix()
+    return {"id": role_id}
 
 
 @app.delete("/api/roles/{role_id}")
@@ -3494,7 +3886,9 @@ def delete_role(role_id: int, _: Dict[str, Any] = Depends(require_admin)):
         if not row:
             raise HTTPException(status_code=404, detail="Role not found")
         conn.execute("DELETE FROM auth_roles WHERE id = ?", (role_id,))
-        return {"deleted": role_id}
+    _invalidate_session_cache()
+    _invalidate_permission_matrix()
+    return {"deleted": role_id}
 
 
 # ----------------------------
@@ -3653,7 +4047,8 @@ def update_admin_user(
                 conn, payload.profit_center_groups
             )
             _set_user_profit_center_groups(conn, user_id, profit_center_groups)
-        return {"id": user_id}
+    _invalidate_session_cache(user_id=user_id)
+    return {"id": user_id}
 
 
 # Admin app settings
@@ -3699,6 +4094,11 @@ def update_pending_agreement_recipients(
     return {"recipients": recipients}
 
 
+@app.get("/api/admin/ocr-cache")
+def get_ocr_cache_stats(_: Dict[str, Any] = Depends(require_admin)):
+    return ocr_cache_stats(OCR_CACHE_DIR or None, OCR_CACHE_MAX_BYTES)
+
+
 # ----------------------------
 # Tag permission endpoints
 # ----------------------------
@@ -3775,7 +4175,8 @@ def update_permission_roles(
                 "INSERT INTO role_permissions (permission_key, role_id, created_at) VALUES (?, ?, ?)",
                 [(permission_key, role_id, now) for role_id in role_ids],
             )
-        return {"permission_key": permission_key, "role_ids": role_ids}
+    _invalidate_permission_matrix()
+    return {"permission_key": permission_key, "role_ids": role_ids}
 
 
 @app.get("/api/action-logs")
@@ -3785,6 +4186,7 @@ def list_action_logs(
     user_id: Optional[int] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     _: Dict[str, Any] = Depends(require_admin),
 ):
     limit = max(1, min(limit, 200))
@@ -3792,14 +4194,18 @@ def list_action_logs(
     where_parts = []
     params: List[Any] = []
     if entity_type:
-        where_parts.append("entity_type = ?")
+        where_parts.append("a.entity_type = ?")
         params.append(entity_type)
     if entity_id:
-        where_parts.append("entity_id = ?")
+        where_parts.append("a.entity_id = ?")
         params.append(entity_id)
     if user_id is not None:
-        where_parts.append("user_id = ?")
+        where_parts.append("a.user_id = ?")
         params.append(user_id)
+    if cursor:
+        where_parts.append("(a.created_at, a.id) < (?, ?)")
+        params.extend(decode_cursor(cursor, 2))
+        offset = 0
     where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
     with db() as conn:
         rows = conn.execute(
@@ -3809,17 +4215,21 @@ def list_action_logs(
             FROM action_logs a
             LEFT JOIN auth_users u ON u.id = a.user_id
             {where_clause}
-            ORDER BY a.created_at DESC
+            ORDER BY a.created_at DESC, a.id DESC
             LIMIT ? OFFSET ?
             """,
-            (*params, limit, offset),
+            (*params, limit + 1, offset),
         ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
         items = []
         for row in rows:
             item = dict(row)
             item["metadata"] = safe_json_dict(item.pop("metadata_json", None))
             items.append(item)
-        return {"items": items, "limit": limit, "offset": offset}
+        return {"items": items, "limit": limit, "offset": offset, "next_cursor": next_cursor}
 
 
 # ----------------------------
@@ -3857,6 +4267,7 @@ def login(payload: AuthLogin, response: Response):
 def logout(request: Request, response: Response):
     token = request.cookies.get(AUTH_COOKIE_NAME)
     if token:
+        _invalidate_session_cache(token=token)
         with db() as conn:
             conn.execute("DELETE FROM auth_sessions WHERE id = ?", (token,))
     response.delete_cookie(AUTH_COOKIE_NAME)
@@ -3920,6 +4331,7 @@ def oidc_callback(code: str, state: str):
             except Exception as exc:
                 logger.warning("New user notification failed: %s", exc)
         token = create_session(conn, user_id)
+    _invalidate_session_cache(user_id=user_id)
     redirect_target = return_to or OIDC_POST_LOGIN_REDIRECT
     redirect_response = RedirectResponse(redirect_target, status_code=303)
     redirect_response.set_cookie(
@@ -4023,6 +4435,40 @@ def delete_notification_user(user_id: int, user: Optional[Dict[str, Any]] = Depe
         return {"deleted": user_id}
 
 
+_notification_log_total_cache: Dict[Tuple[str, str, str], Tuple[float, int]] = {}
+_notification_log_total_cache_lock = threading.Lock()
+
+
+def _notification_log_match_query(query: str) -> str:
+    # Every word must appear, as a prefix, in one of the indexed columns.
+    words = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _count_notification_logs(
+    conn: sqlite3.Connection,
+    cache_key: Tuple[str, str, str],
+    where_clause: str,
+    params: List[Any],
+) -> int:
+    now = time.monotonic()
+    with _notification_log_total_cache_lock:
+        cached = _notification_log_total_cache.get(cache_key)
+    if cached and now < cached[0]:
+        return cached[1]
+    total = conn.execute(
+        f"SELECT COUNT(1) AS count FROM notification_logs l {where_clause}",
+        tuple(params),
+    ).fetchone()["count"]
+    if NOTIFICATION_LOG_TOTAL_CACHE_SECONDS > 0:
+        with _notification_log_total_cache_lock:
+            _notification_log_total_cache[cache_key] = (
+                now + NOTIFICATION_LOG_TOTAL_CACHE_SECONDS,
+                total,
+            )
+    return total
+
+
 @app.get("/api/notification-logs")
 def list_notification_logs(
     limit: int = 50,
@@ -4030,55 +4476,61 @@ def list_notification_logs(
     query: str = "",
     status: str = "all",
     kind: str = "all",
+    cursor: Optional[str] = None,
     _: Dict[str, Any] = Depends(require_admin),
 ):
     limit = max(1, min(limit, 200))
     offset = max(offset, 0)
     params: List[Any] = []
     where_parts = []
-    if query:
-        like = f"%{query.lower()}%"
+    match_query = _notification_log_match_query(query) if query else ""
+    if match_query:
         where_parts.append(
             """
-            (
-              lower(subject) LIKE ?
-              OR lower(recipients_json) LIKE ?
-              OR lower(body) LIKE ?
-              OR lower(kind) LIKE ?
-              OR lower(coalesce(related_id, '')) LIKE ?
-              OR lower(coalesce(metadata_json, '')) LIKE ?
+            l.log_seq IN (
+              SELECT rowid FROM notification_logs_fts WHERE notification_logs_fts MATCH ?
             )
             """
         )
-        params.extend([like, like, like, like, like, like])
+        params.append(match_query)
     if status and status != "all":
-        where_parts.append("status = ?")
+        where_parts.append("l.status = ?")
         params.append(status)
     if kind and kind != "all":
-        where_parts.append("kind = ?")
+        where_parts.append("l.kind = ?")
         params.append(kind)
 
     where_clause = ""
     if where_parts:
         where_clause = "WHERE " + " AND ".join(where_parts)
 
+    # Keyset pagination: continue strictly after the last (created_at, id) seen.
+    page_parts = list(where_parts)
+    page_params = list(params)
+    if cursor:
+        page_parts.append("(l.created_at, l.id) < (?, ?)")
+        page_params.extend(decode_cursor(cursor, 2))
+        offset = 0
+    page_where = "WHERE " + " AND ".join(page_parts) if page_parts else ""
+
     with db() as conn:
-        total = conn.execute(
-            f"SELECT COUNT(1) AS count FROM notification_logs {where_clause}",
-            tuple(params),
-        ).fetchone()["count"]
+        total = _count_notification_logs(
+            conn, (match_query, status or "all", kind or "all"), where_clause, params
+        )
         rows = conn.execute(
             f"""
-            SELECT id, kind, recipients_json, subject, body, status, error, related_id,
-                   metadata_json, created_at
-            FROM notification_logs
-            {where_clause}
-            ORDER BY created_at DESC
+            SELECT l.id, l.kind, l.recipients_json, l.subject, l.body, l.status, l.error,
+                   l.related_id, l.metadata_json, l.created_at
+            FROM notification_logs l
+            {page_where}
+            ORDER BY l.created_at DESC, l.id DESC
             LIMIT ? OFFSET ?
             """,
-            (*params, limit, offset),
+            (*page_params, limit + 1, offset),
         ).fetchall()
 
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     items = []
     for row in rows:
         data = dict(row)
@@ -4090,11 +4542,15 @@ def list_notification_logs(
             data["metadata"] = None
         items.append(data)
 
+    next_cursor = None
+    if has_more and items:
+        next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"])
     return {
         "items": items,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
 
 
@@ -4124,17 +4580,7 @@ def _pending_agreement_visible_to_user(
     if not contract_id:
         return True
     context = _get_visibility_context(conn, request)
-    if context is None:
-        return True
-    visible_ids = _filter_contract_visibility(
-        conn,
-        [contract_id],
-        context["user_role_ids"],
-        context["user_profit_center_ids"],
-        context["user_profit_center_groups"],
-        context["is_admin"],
-    )
-    return contract_id in visible_ids
+    return _is_contract_visible(conn, contract_id, context)
 
 
 def _can_manage_pending_agreements(
@@ -4282,7 +4728,7 @@ def _create_contract_from_pending_file(
                 contract_path,
                 file_record["mime_type"] or "application/octet-stream",
                 uploaded_at,
-                "processing",
+                "queued",
             ),
         )
         conn.execute(
@@ -4293,12 +4739,15 @@ def _create_contract_from_pending_file(
             "UPDATE pending_agreements SET contract_id = ? WHERE id = ?",
             (contract_id, agreement_id),
         )
+        job_id = _enqueue_ocr_job(conn, contract_id)
+    _ocr_wakeup.set()
 
     return {
         "contract_id": contract_id,
         "stored_path": contract_path,
         "agreement_type": None,
-        "status": "processing",
+        "status": "queued",
+        "job_id": job_id,
         "new": True,
     }
 
@@ -4313,18 +4762,18 @@ def list_pending_agreements(
 ):
     limit = max(1, min(limit, 100))
     offset = max(offset, 0)
-    where_clause = ""
+    where_parts: List[str] = []
     params: List[Any] = []
     if query:
-        where_clause = (
-            "WHERE lower(coalesce(p.matter, p.title)) LIKE ? "
+        where_parts.append(
+            "(lower(coalesce(p.matter, p.title)) LIKE ? "
             "OR lower(coalesce(p.team_member, p.owner)) LIKE ? "
             "OR lower(coalesce(p.requester_email, p.owner_email, '')) LIKE ? "
             "OR lower(coalesce(p.attorney_assigned, '')) LIKE ? "
             "OR lower(coalesce(p.internal_company, '')) LIKE ? "
             "OR lower(coalesce(p.status, '')) LIKE ? "
             "OR lower(coalesce(c.title, '')) LIKE ? "
-            "OR lower(coalesce(c.vendor, '')) LIKE ?"
+            "OR lower(coalesce(c.vendor, '')) LIKE ?)"
         )
         like = f"%{query.lower()}%"
         params.extend([like, like, like, like, like, like, like, like])
@@ -4332,59 +4781,63 @@ def list_pending_agreements(
     with db() as conn:
         can_manage = _can_manage_pending_agreements(conn, user)
         if AUTH_REQUIRED and not can_manage:
-            recipient_clause = (
-                "(lower(coalesce(p.requester_email, p.owner_email, '')) = ? "
-                "OR lower(coalesce(p.team_member, p.owner, '')) = ?)"
+            # Same rules as _pending_agreement_visible_to_user, evaluated in SQL.
+            user_email = (user.get("email") or "").lower()
+            user_name = (user.get("name") or "").lower()
+            visibility_sql, visibility_params = _contract_visibility_clause(
+                _get_visibility_context(conn, request), "p.contract_id"
             )
-            if where_clause:
-                where_clause = f"{where_clause} AND {recipient_clause}"
-            else:
-                where_clause = f"WHERE {recipient_clause}"
-            params.extend(
-                [
-                    (user.get("email") or "").lower(),
-                    (user.get("name") or "").lower(),
-                ]
+            where_parts.append(
+                f"""(
+                  (? <> '' AND lower(coalesce(nullif(p.requester_email, ''), p.owner_email, '')) = ?)
+                  OR (? <> '' AND lower(coalesce(nullif(p.team_member, ''), p.owner, '')) = ?)
+                )
+                AND (coalesce(p.contract_id, '') = '' OR {visibility_sql})"""
             )
+            params.extend([user_email, user_email, user_name, user_name, *visibility_params])
+        where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
 
-        rows = conn.execute(
+        total = conn.execute(
             f"""
-            SELECT p.id, p.internal_company, p.team_member, p.requester_email,
-                   p.attorney_assigned, p.matter, p.status_notes, p.status,
-                   p.internal_completion_date, p.fully_executed_date,
-                   p.title, p.owner, p.owner_email, p.contract_id,
-                   p.created_at, p.updated_at,
-                   c.title AS contract_title, c.vendor AS contract_vendor,
-                   (
-                       SELECT n.note_text
-                       FROM pending_agreement_notes n
-                       WHERE n.pending_agreement_id = p.id
-                       ORDER BY n.created_at DESC
-                       LIMIT 1
-                   ) AS latest_note,
-                   (
-                       SELECT n.created_at
-                       FROM pending_agreement_notes n
-                       WHERE n.pending_agreement_id = p.id
-                       ORDER BY n.created_at DESC
-                       LIMIT 1
-                   ) AS latest_note_at
+            SELECT COUNT(1) AS count
             FROM pending_agreements p
             LEFT JOIN contracts c ON c.id = p.contract_id
             {where_clause}
-            ORDER BY p.created_at DESC
             """,
             params,
+        ).fetchone()["count"]
+        rows = conn.execute(
+            f"""
+            WITH page AS (
+                SELECT p.id, p.internal_company, p.team_member, p.requester_email,
+                       p.attorney_assigned, p.matter, p.status_notes, p.status,
+                       p.internal_completion_date, p.fully_executed_date,
+                       p.title, p.owner, p.owner_email, p.contract_id,
+                       p.created_at, p.updated_at,
+                       c.title AS contract_title, c.vendor AS contract_vendor
+                FROM pending_agreements p
+                LEFT JOIN contracts c ON c.id = p.contract_id
+                {where_clause}
+                ORDER BY p.created_at DESC, p.id ASC
+                LIMIT ? OFFSET ?
+            ),
+            latest_notes AS (
+                SELECT n.pending_agreement_id, n.note_text, n.created_at,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY n.pending_agreement_id
+                           ORDER BY n.created_at DESC, n.id DESC
+                       ) AS rn
+                FROM pending_agreement_notes n
+                WHERE n.pending_agreement_id IN (SELECT id FROM page)
+            )
+            SELECT page.*, ln.note_text AS latest_note, ln.created_at AS latest_note_at
+            FROM page
+            LEFT JOIN latest_notes ln ON ln.pending_agreement_id = page.id AND ln.rn = 1
+            ORDER BY page.created_at DESC, page.id ASC
+            """,
+            [*params, limit, offset],
         ).fetchall()
-        items = [dict(r) for r in rows]
-        if AUTH_REQUIRED and not can_manage:
-            items = [
-                item
-                for item in items
-                if _pending_agreement_visible_to_user(conn, item, user, request)
-            ]
-        total = len(items)
-        paged = items[offset : offset + limit]
+        paged = [dict(r) for r in rows]
         return {"items": paged, "total": total, "limit": limit, "offset": offset}
 
 
@@ -4656,48 +5109,48 @@ async def create_pending_agreement_intake(
             {"file_attached": bool(file_record)},
         )
 
-        recipients = _get_pending_agreement_recipient_emails(conn)
-
-    recipients = _parse_email_list(recipients)
-    portal_link = _format_app_link(
-        "View Pending Agreement",
-        f"/?pendingAgreementId={agreement_id}",
-    )
-    if recipients:
-        subject = f"New Contract Intake Submission: {matter}"
-        body_lines = [
-            "Intake Form – Contracts & Agreements has a new submission.",
-        ]
-        if portal_link:
-            body_lines.append(
-                f"Click here to view it in the Contracts & Agreements Portal: {portal_link}"
-            )
-        _send_email_with_log(
-            recipients,
-            subject,
-            "\n".join(body_lines),
-            kind="pending_agreement_intake_legal",
-            related_id=agreement_id,
-            metadata={"agreement_id": agreement_id, "matter": matter},
+        recipients = _parse_email_list(_get_pending_agreement_recipient_emails(conn))
+        portal_link = _format_app_link(
+            "View Pending Agreement",
+            f"/?pendingAgreementId={agreement_id}",
         )
-
-    if cleaned_requester_email:
-        subject = f"Contract Intake Submitted: {matter}"
-        body_lines = [
-            "Your Intake Form – Contracts & Agreements has been submitted to Legal.",
-        ]
-        if portal_link:
-            body_lines.append(
-                f"Please visit the portal to view your Pending Agreement: {portal_link}"
+        if recipients:
+            subject = f"New Contract Intake Submission: {matter}"
+            body_lines = [
+                "Intake Form – Contracts & Agreements has a new submission.",
+            ]
+            if portal_link:
+                body_lines.append(
+                    f"Click here to view it in the Contracts & Agreements Portal: {portal_link}"
+                )
+            _enqueue_notification(
+                conn,
+                recipients,
+                subject,
+                "\n".join(body_lines),
+                kind="pending_agreement_intake_legal",
+                related_id=agreement_id,
+                metadata={"agreement_id": agreement_id, "matter": matter},
+            )
+
+        if cleaned_requester_email:
+            subject = f"Contract Intake Submitted: {matter}"
+            body_lines = [
+                "Your Intake Form – Contracts & Agreements has been submitted to Legal.",
+            ]
+            if portal_link:
+                body_lines.append(
+                    f"Please visit the portal to view your Pending Agreement: {portal_link}"
+                )
+            _enqueue_notification(
+                conn,
+                [cleaned_requester_email],
+                subject,
+                "\n".join(body_lines),
+                kind="pending_agreement_intake_requester",
+                related_id=agreement_id,
+                metadata={"agreement_id": agreement_id, "matter": matter},
             )
-        _send_email_with_log(
-            [cleaned_requester_email],
-            subject,
-            "\n".join(body_lines),
-            kind="pending_agreement_intake_requester",
-            related_id=agreement_id,
-            metadata={"agreement_id": agreement_id, "matter": matter},
-        )
 
     response = {
         "id": agreement_id,
@@ -5043,75 +5496,38 @@ def upload_pending_agreement_file(
         )
 
         requester_email = _resolve_pending_agreement_recipient(conn, agreement_row)
+        if file_type == "executed" and requester_email:
+            portal_link = _format_app_link(
+                "View Pending Agreement",
+                f"/?pendingAgreementId={agreement_id}",
+            )
+            subject = "Executed contract available"
+            body_lines = [
+                "The final executed contract has been uploaded to your Pending Agreement.",
+            ]
+            if portal_link:
+                body_lines.append(f"View the record here: {portal_link}")
+            _enqueue_notification(
+                conn,
+                [requester_email],
+                subject,
+                "\n".join(body_lines),
+                kind="pending_agreement_executed",
+                related_id=agreement_id,
+                metadata={"agreement_id": agreement_id, "file_id": file_record["id"]},
+            )
 
     contract_info = None
     if file_type == "executed":
         contract_info = _create_contract_from_pending_file(agreement_id, agreement, file_record)
         if contract_info.get("new"):
             logger.info(
-                "PROCESS START contract_id=%s pending_agreement_id=%s file=%s",
+                "PROCESS QUEUED contract_id=%s job_id=%s pending_agreement_id=%s file=%s",
                 contract_info["contract_id"],
+                contract_info["job_id"],
                 agreement_id,
                 file_record["file_name"],
             )
-            try:
-                result = process_contract(
-                    db_path=DB_PATH,
-                    contract_id=contract_info["contract_id"],
-                    stored_path=contract_info["stored_path"],
-                    tesseract_cmd=TESSERACT_CMD,
-                    max_pages=8,
-                    poppler_path=POPPLER_PATH,
-                )
-
-                ocr_text = result.get("ocr_text", "")
-                agreement_type = contract_info.get("agreement_type")
-                if not agreement_type:
-                    agreement_type = detect_agreement_type(ocr_text, file_record["file_name"])
-
-                with db() as conn:
-                    conn.execute(
-                        "UPDATE contracts SET status='processed', agreement_type=? WHERE id=?",
-                        (agreement_type, contract_info["contract_id"]),
-                    )
-
-                auto_tag_contract(contract_info["contract_id"], ocr_text)
-                logger.info("PROCESS SUCCESS contract_id=%s", contract_info["contract_id"])
-            except Exception as e:
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                with db() as conn:
-                    conn.execute(
-                        "UPDATE contracts SET status='error' WHERE id=?",
-                        (contract_info["contract_id"],),
-                    )
-                logger.error(
-                    "PROCESS FAILED contract_id=%s pending_agreement_id=%s filename=%s | %s\n%s",
-                    contract_info["contract_id"],
-                    agreement_id,
-                    file_record["file_name"],
-                    error_msg,
-                    traceback.format_exc(),
-                )
-
-    if file_type == "executed" and requester_email:
-        portal_link = _format_app_link(
-            "View Pending Agreement",
-            f"/?pendingAgreementId={agreement_id}",
-        )
-        subject = "Executed contract available"
-        body_lines = [
-            "The final executed contract has been uploaded to your Pending Agreement.",
-        ]
-        if portal_link:
-            body_lines.append(f"View the record here: {portal_link}")
-        _send_email_with_log(
-            [requester_email],
-            subject,
-            "\n".join(body_lines),
-            kind="pending_agreement_executed",
-            related_id=agreement_id,
-            metadata={"agreement_id": agreement_id, "file_id": file_record["id"]},
-        )
 
     return file_record
 
@@ -5312,6 +5728,15 @@ def delete_pending_agreement_reminder(
         return {"deleted": reminder_id}
 
 
+def _set_task_assignees(conn: sqlite3.Connection, task_id: str, assignees: List[Any]) -> None:
+    conn.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+    emails = {str(value).strip().lower() for value in assignees if str(value).strip()}
+    conn.executemany(
+        "INSERT INTO task_assignees (task_id, email) VALUES (?, ?)",
+        [(task_id, email) for email in sorted(emails)],
+    )
+
+
 @app.get("/api/tasks")
 def list_tasks(
     limit: int = 20,
@@ -5321,12 +5746,12 @@ def list_tasks(
 ):
     limit = max(1, min(limit, 100))
     offset = max(offset, 0)
-    where_clause = ""
+    where_parts: List[str] = []
     params: List[Any] = []
     if query:
-        where_clause = (
-            "WHERE lower(title) LIKE ? OR lower(coalesce(description, '')) LIKE ? "
-            "OR lower(assignees_json) LIKE ?"
+        where_parts.append(
+            "(lower(title) LIKE ? OR lower(coalesce(description, '')) LIKE ? "
+            "OR lower(assignees_json) LIKE ?)"
         )
         like = f"%{query.lower()}%"
         params.extend([like, like, like])
@@ -5335,31 +5760,34 @@ def list_tasks(
         _require_permission(conn, user, "tasks_view")
         can_manage = _user_has_permission(conn, user, "tasks_manage")
         is_admin = _is_admin_user(user)
+        if AUTH_REQUIRED and not is_admin and not can_manage:
+            user_email = (user.get("email") or "").strip().lower() if user else ""
+            where_parts.append("id IN (SELECT task_id FROM task_assignees WHERE email = ?)")
+            params.append(user_email)
+        where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
+
+        total = conn.execute(
+            f"SELECT COUNT(1) AS count FROM tasks {where_clause}", params
+        ).fetchone()["count"]
         rows = conn.execute(
             f"""
             SELECT id, title, description, due_date, recurrence, reminders_json, assignees_json,
                    completed, created_at
             FROM tasks
             {where_clause}
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id ASC
+            LIMIT ? OFFSET ?
             """,
-            params,
+            [*params, limit, offset],
         ).fetchall()
         items = []
-        user_email = (user.get("email") or "").lower() if user else ""
         for row in rows:
             data = dict(row)
             data["reminders"] = safe_json_list(data.pop("reminders_json", None))
             data["assignees"] = safe_json_list(data.pop("assignees_json", None))
             data["completed"] = bool(data.get("completed"))
-            if AUTH_REQUIRED and not is_admin and not can_manage:
-                assignee_emails = [str(a).lower() for a in data["assignees"]]
-                if not user_email or user_email not in assignee_emails:
-                    continue
             items.append(data)
-        total = len(items)
-        paged = items[offset : offset + limit]
-        return {"items": paged, "total": total, "limit": limit, "offset": offset}
+        return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
 @app.post("/api/tasks")
@@ -5394,6 +5822,7 @@ def create_task(payload: TaskCreate, user: Optional[Dict[str, Any]] = Depends(re
                 created_at,
             ),
         )
+        _set_task_assignees(conn, task_id, payload.assignees or [])
     return {
         "id": task_id,
         "title": title,
@@ -5463,11 +5892,33 @@ def remove_tag_from_contract(
         return {"contract_id": contract_id, "tag_id": tag_id}
 
 
+def _run_process_contract(
+    contract_id: str,
+    stored_path: str,
+    file_sha256: Optional[str],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    return process_contract(
+        db_path=DB_PATH,
+        contract_id=contract_id,
+        stored_path=stored_path,
+        tesseract_cmd=TESSERACT_CMD,
+        max_pages=8,
+        poppler_path=POPPLER_PATH,
+        progress_callback=progress_callback,
+        ocr_workers=OCR_PAGE_WORKERS,
+        lang=TESSERACT_LANG,
+        file_sha256=file_sha256,
+        ocr_cache_dir=OCR_CACHE_DIR or None,
+        ocr_cache_max_bytes=OCR_CACHE_MAX_BYTES,
+    )
+
+
 def _reprocess_contract(contract_id: str) -> Dict[str, Any]:
     with db() as conn:
         existing = conn.execute(
             """
-            SELECT id, stored_path, original_filename, agreement_type
+            SELECT id, stored_path, original_filename, agreement_type, sha256
             FROM contracts
             WHERE id = ?
             """,
@@ -5484,13 +5935,8 @@ def _reprocess_contract(contract_id: str) -> Dict[str, Any]:
     logger.info(f"REPROCESS START contract_id={contract_id}")
 
     try:
-        result = process_contract(
-            db_path=DB_PATH,
-            contract_id=contract_id,
-            stored_path=existing["stored_path"],
-            tesseract_cmd=TESSERACT_CMD,
-            max_pages=8,
-            poppler_path=POPPLER_PATH,
+        result = _run_process_contract(
+            contract_id, existing["stored_path"], existing["sha256"]
         )
 
         ocr_text = result.get("ocr_text", "")
@@ -5525,6 +5971,214 @@ def _reprocess_contract(contract_id: str) -> Dict[str, Any]:
             status_code=500, detail=f"Reprocessing failed: {error_msg}"
         )
 
+# ----------------------------
+# OCR job queue
+# ----------------------------
+OCR_JOB_NAME = "ocr_contract"
+_ocr_wakeup = threading.Event()
+_ocr_stop = threading.Event()
+_ocr_threads: List[threading.Thread] = []
+
+
+def _iso_seconds_ago(seconds: float) -> str:
+    moment = datetime.utcnow().replace(microsecond=0) - timedelta(seconds=seconds)
+    return moment.isoformat() + "Z"
+
+
+def _enqueue_ocr_job(conn: sqlite3.Connection, contract_id: str) -> int:
+    """Queue an OCR job in the caller's transaction. The caller sets ``_ocr_wakeup``
+    after committing, so a worker woken at once is sure to see the new row."""
+    cur = conn.execute(
+        """
+        INSERT INTO job_runs (job_name, started_at, status, contract_id, progress)
+        VALUES (?, ?, 'queued', ?, 0)
+        """,
+        (OCR_JOB_NAME, now_iso(), contract_id),
+    )
+    return cur.lastrowid
+
+
+def _claim_next_ocr_job() -> Optional[Dict[str, Any]]:
+    with db() as conn:
+        while True:
+            row = conn.execute(
+                """
+                SELECT id, contract_id FROM job_runs
+                WHERE job_name = ? AND status = 'queued'
+                ORDER BY id ASC
+                LIMIT 1
+                """,
+                (OCR_JOB_NAME,),
+            ).fetchone()
+            if not row:
+                return None
+            # Guard on status so concurrent workers never claim the same job.
+            now = now_iso()
+            cur = conn.execute(
+                """
+                UPDATE job_runs
+                SET status = 'processing', started_at = ?, claimed_by = ?, heartbeat_at = ?
+                WHERE id = ? AND status = 'queued'
+                """,
+                (now, WORKER_TOKEN, now, row["id"]),
+            )
+            if cur.rowcount == 1:
+                return dict(row)
+
+
+def _finish_ocr_job(job_id: int, status: str, detail: Optional[str] = None) -> None:
+    with db() as conn:
+        conn.execute(
+            """
+            UPDATE job_runs
+            SET status = ?, finished_at = ?, detail = ?,
+                progress = CASE WHEN ? = 'processed' THEN 100 ELSE progress END
+            WHERE id = ? AND claimed_by = ?
+            """,
+            (status, now_iso(), detail, status, job_id, WORKER_TOKEN),
+        )
+
+
+def _run_ocr_job(job_id: int, contract_id: str) -> None:
+    with db() as conn:
+        contract = conn.execute(
+            """
+            SELECT id, stored_path, original_filename, agreement_type, sha256
+            FROM contracts
+            WHERE id = ?
+            """,
+            (contract_id,),
+        ).fetchone()
+    if not contract:
+        _finish_ocr_job(job_id, "error", "Contract not found")
+        return
+
+    def _report_progress(done: int, total: int) -> None:
+        with db() as conn:
+            conn.execute(
+                "UPDATE job_runs SET progress = ?, heartbeat_at = ? WHERE id = ?",
+                (int(done * 100 / max(total, 1)), now_iso(), job_id),
+            )
+
+    logger.info(f"PROCESS START contract_id={contract_id} job_id={job_id}")
+
+    try:
+        result = _run_process_contract(
+            contract_id,
+            contract["stored_path"],
+            contract["sha256"],
+            progress_callback=_report_progress,
+        )
+
+        ocr_text = result.get("ocr_text", "")
+        agreement_type = contract["agreement_type"]
+        if not agreement_type:
+            agreement_type = detect_agreement_type(ocr_text, contract["original_filename"])
+
+        with db() as conn:
+            conn.execute(
+                "UPDATE contracts SET status='processed', agreement_type=? WHERE id=?",
+                (agreement_type, contract_id),
+            )
+
+        auto_tag_contract(contract_id, ocr_text)
+        _finish_ocr_job(job_id, "processed")
+        logger.info(f"PROCESS SUCCESS contract_id={contract_id} job_id={job_id}")
+
+    except Exception as e:
+        error_msg = f"{type(e).__name__}: {str(e)}"
+        with db() as conn:
+            conn.execute("UPDATE contracts SET status='error' WHERE id=?", (contract_id,))
+        _finish_ocr_job(job_id, "error", error_msg)
+        logger.error(
+            f"PROCESS FAILED contract_id={contract_id} job_id={job_id} | {error_msg}\n{traceback.format_exc()}"
+        )
+
+
+def _ocr_worker_loop() -> None:
+    while not _ocr_stop.is_set():
+        try:
+            job = _claim_next_ocr_job()
+        except sqlite3.Error:
+            logger.error(f"OCR QUEUE CLAIM FAILED\n{traceback.format_exc()}")
+            job = None
+        if not job:
+            _ocr_wakeup.wait(OCR_QUEUE_POLL_SECONDS)
+            _ocr_wakeup.clear()
+            continue
+        _run_ocr_job(job["id"], job["contract_id"])
+
+
+def _requeue_stale_ocr_jobs(conn: sqlite3.Connection) -> int:
+    """Requeue jobs whose process stopped heartbeating; live workers' jobs are left alone."""
+    requeued = conn.execute(
+        """
+        UPDATE job_runs
+        SET status = 'queued', progress = 0, claimed_by = NULL, heartbeat_at = NULL
+        WHERE job_name = ? AND status = 'processing'
+          AND (heartbeat_at IS NULL OR heartbeat_at <= ?)
+        """,
+        (OCR_JOB_NAME, _iso_seconds_ago(OCR_JOB_STALE_SECONDS)),
+    ).rowcount
+    if requeued:
+        conn.execute(
+            """
+            UPDATE contracts SET status = 'queued'
+            WHERE status = 'processing'
+              AND id IN (SELECT contract_id FROM job_runs WHERE job_name = ? AND status = 'queued')
+            """,
+            (OCR_JOB_NAME,),
+        )
+    return requeued
+
+
+def _ocr_heartbeat_loop() -> None:
+    while not _ocr_stop.wait(OCR_JOB_HEARTBEAT_SECONDS):
+        try:
+            with db() as conn:
+                conn.execute(
+                    """
+                    UPDATE job_runs SET heartbeat_at = ?
+                    WHERE job_name = ? AND status = 'processing' AND claimed_by = ?
+                    """,
+                    (now_iso(), OCR_JOB_NAME, WORKER_TOKEN),
+                )
+                requeued = _requeue_stale_ocr_jobs(conn)
+            if requeued:
+                logger.info(f"OCR QUEUE requeued {requeued} job(s) from a stopped worker")
+                _ocr_wakeup.set()
+        except sqlite3.Error:
+            logger.error(f"OCR QUEUE HEARTBEAT FAILED\n{traceback.format_exc()}")
+
+
+def _start_ocr_workers() -> None:
+    if _ocr_threads:
+        return
+    with db() as conn:
+        # Jobs left in flight by a process that has since died go back on the queue.
+        requeued = _requeue_stale_ocr_jobs(conn)
+    if requeued:
+        logger.info(f"OCR QUEUE requeued {requeued} interrupted job(s)")
+    _ocr_stop.clear()
+    for i in range(OCR_WORKERS):
+        thread = threading.Thread(
+            target=_ocr_worker_loop, name=f"ocr-worker-{i + 1}", daemon=True
+        )
+        thread.start()
+        _ocr_threads.append(thread)
+    thread = threading.Thread(target=_ocr_heartbeat_loop, name="ocr-heartbeat", daemon=True)
+    thread.start()
+    _ocr_threads.append(thread)
+    logger.info(f"OCR QUEUE started workers={OCR_WORKERS}")
+
+
+def _stop_ocr_workers() -> None:
+    _ocr_stop.set()
+    _ocr_wakeup.set()
+    for thread in _ocr_threads:
+        thread.join(timeout=5)
+    _ocr_threads.clear()
+
 # ----------------------------
 # Upload
 # ----------------------------
@@ -5589,58 +6243,24 @@ async def upload_contract(
                 stored_path,
                 file.content_type or "application/octet-stream",
                 now_iso(),
-                "processing",
+                "queued",
             ),
         )
         conn.execute(
             "INSERT INTO contracts_fts (contract_id, title, vendor, ocr_text) VALUES (?, ?, ?, ?)",
             (contract_id, contract_title, vendor or "", ""),
         )
-
-    logger.info(f"PROCESS START contract_id={contract_id} file={fn}")
-
-    try:
-        result = process_contract(
-            db_path=DB_PATH,
-            contract_id=contract_id,
-            stored_path=stored_path,
-            tesseract_cmd=TESSERACT_CMD,
-            max_pages=8,
-            poppler_path=POPPLER_PATH,
-        )
-
-        ocr_text = result.get("ocr_text", "")
-
-        if not agreement_type:
-            agreement_type = detect_agreement_type(ocr_text, fn)
-
-        with db() as conn:
-            conn.execute(
-                "UPDATE contracts SET status='processed', agreement_type=? WHERE id=?",
-                (agreement_type, contract_id),
-            )
-
-        auto_tag_contract(contract_id, ocr_text)
-
-        logger.info(f"PROCESS SUCCESS contract_id={contract_id}")
-        return UploadResponse(
-            contract_id=contract_id,
-            title=contract_title,
-            stored_path=stored_path,
-            sha256=file_hash,
-            status="processed",
-        )
-
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        with db() as conn:
-            conn.execute("UPDATE contracts SET status='error' WHERE id=?", (contract_id,))
-        logger.error(
-            f"PROCESS FAILED contract_id={contract_id} filename={fn} | {error_msg}\n{traceback.format_exc()}"
-        )
-        raise HTTPException(
-            status_code=500, detail=f"Processing failed: {error_msg}"
-        )
+        job_id = _enqueue_ocr_job(conn, contract_id)
+    _ocr_wakeup.set()
+
+    logger.info(f"PROCESS QUEUED contract_id={contract_id} job_id={job_id} file={fn}")
+    return UploadResponse(
+        contract_id=contract_id,
+        title=contract_title,
+        stored_path=stored_path,
+        sha256=file_hash,
+        status="queued",
+    )
 
 # ----------------------------
 # Reprocess
@@ -5730,44 +6350,24 @@ def get_calendar_events(
 ):
     """Get events for calendar view (start and end are YYYY-MM-DD)"""
     with db() as conn:
+        context = _get_visibility_context(conn, request)
+        visibility_sql, visibility_params = _contract_visibility_clause(context)
         rows = conn.execute(
-            """
+            f"""
             SELECT e.*, c.title, c.vendor, c.agreement_type
             FROM events e
             JOIN contracts c ON c.id = e.contract_id
             WHERE e.event_date >= ? AND e.event_date <= ?
+              AND {visibility_sql}
             ORDER BY e.event_date ASC
             """,
-            (start, end),
+            (start, end, *visibility_params),
         ).fetchall()
 
-        context = _get_visibility_context(conn, request)
-        if context is not None and rows:
-            contract_ids = [row["contract_id"] for row in rows]
-            visible_ids = set(
-                _filter_contract_visibility(
-                    conn,
-                    contract_ids,
-                    context["user_role_ids"],
-                    context["user_profit_center_ids"],
-                    context["user_profit_center_groups"],
-                    context["is_admin"],
-                )
-            )
-            rows = [row for row in rows if row["contract_id"] in visible_ids]
-
+        tag_map = _load_contract_tags_for_list(conn, [row["contract_id"] for row in rows])
         events = []
         for r in rows:
-            tags = conn.execute(
-                """
-                SELECT t.name, t.color
-                FROM contract_tags ct
-                JOIN tags t ON t.id = ct.tag_id
-                WHERE ct.contract_id = ?
-                """,
-                (r["contract_id"],),
-            ).fetchall()
-
+            tags = tag_map.get(r["contract_id"], [])
             events.append(
                 {
                     **dict(r),
@@ -5785,19 +6385,136 @@ def _get_visibility_context(
 ) -> Optional[Dict[str, Any]]:
     if not AUTH_REQUIRED or request is None:
         return None
-    user = get_current_user(request)
+    user = get_current_user(request, conn)
     if not user:
         return None
-    role_ids = _get_user_role_ids(conn, user["id"])
-    profit_center_ids = _get_user_profit_center_ids(conn, user["id"])
-    profit_center_groups = _get_user_profit_center_groups(conn, user["id"])
     is_admin = bool(user.get("is_admin")) or "admin" in user.get("roles", [])
-    return {
-        "user_role_ids": role_ids,
-        "user_profit_center_ids": profit_center_ids,
-        "user_profit_center_groups": profit_center_groups,
-        "is_admin": is_admin,
-    }
+    return {"user_id": user["id"], "is_admin": is_admin}
+
+
+# Visibility rule for one (u.id, c.id) pair; mirrors _filter_contract_visibility.
+CONTRACT_VISIBILITY_RULE_SQL = """
+(
+  NOT EXISTS (
+    SELECT 1 FROM contract_tags vct
+    JOIN tag_roles vtr ON vtr.tag_id = vct.tag_id
+    WHERE vct.contract_id = c.id
+  )
+  OR EXISTS (
+    SELECT 1 FROM contract_tags vct
+    JOIN tag_roles vtr ON vtr.tag_id = vct.tag_id
+    JOIN auth_user_roles vur ON vur.role_id = vtr.role_id
+    WHERE vct.contract_id = c.id AND vur.user_id = u.id
+  )
+)
+AND (
+  EXISTS (
+    SELECT 1 FROM contract_profit_centers vcpc
+    JOIN profit_centers vpc ON vpc.id = vcpc.profit_center_id
+    WHERE vcpc.contract_id = c.id
+      AND (
+        EXISTS (
+          SELECT 1 FROM user_profit_centers vupc
+          WHERE vupc.user_id = u.id AND vupc.profit_center_id = vcpc.profit_center_id
+        )
+        OR EXISTS (
+          SELECT 1 FROM user_profit_center_groups vupg
+          WHERE vupg.user_id = u.id AND vupg.group_name <> '' AND vupg.group_name = vpc.group_name
+        )
+      )
+  )
+  OR (
+    NOT EXISTS (SELECT 1 FROM contract_profit_centers vcpc WHERE vcpc.contract_id = c.id)
+    AND EXISTS (
+      SELECT 1 FROM contract_tags vct
+      JOIN tag_roles vtr ON vtr.tag_id = vct.tag_id
+      WHERE vct.contract_id = c.id
+    )
+  )
+)
+"""
+
+# (trigger suffix, table, event, "contract" or "user", SQL selecting the affected ids)
+CONTRACT_VISIBILITY_TRIGGERS = [
+    ("contracts_ins", "contracts", "INSERT", "contract", "SELECT NEW.id"),
+    ("contract_tags_ins", "contract_tags", "INSERT", "contract", "SELECT NEW.contract_id"),
+    ("contract_tags_del", "contract_tags", "DELETE", "contract", "SELECT OLD.contract_id"),
+    ("tag_roles_ins", "tag_roles", "INSERT", "contract",
+     "SELECT contract_id FROM contract_tags WHERE tag_id = NEW.tag_id"),
+    ("tag_roles_del", "tag_roles", "DELETE", "contract",
+     "SELECT contract_id FROM contract_tags WHERE tag_id = OLD.tag_id"),
+    ("contract_pcs_ins", "contract_profit_centers", "INSERT", "contract", "SELECT NEW.contract_id"),
+    ("contract_pcs_del", "contract_profit_centers", "DELETE", "contract", "SELECT OLD.contract_id"),
+    ("profit_centers_group_upd", "profit_centers", "UPDATE OF group_name", "contract",
+     "SELECT contract_id FROM contract_profit_centers WHERE profit_center_id = NEW.id"),
+    ("auth_users_ins", "auth_users", "INSERT", "user", "SELECT NEW.id"),
+    ("auth_user_roles_ins", "auth_user_roles", "INSERT", "user", "SELECT NEW.user_id"),
+    ("auth_user_roles_del", "auth_user_roles", "DELETE", "user", "SELECT OLD.user_id"),
+    ("auth_roles_name_upd", "auth_roles", "UPDATE OF name", "user",
+     "SELECT user_id FROM auth_user_roles WHERE role_id = NEW.id"),
+    ("user_pcs_ins", "user_profit_centers", "INSERT", "user", "SELECT NEW.user_id"),
+    ("user_pcs_del", "user_profit_centers", "DELETE", "user", "SELECT OLD.user_id"),
+    ("user_pc_groups_ins", "user_profit_center_groups", "INSERT", "user", "SELECT NEW.user_id"),
+    ("user_pc_groups_del", "user_profit_center_groups", "DELETE", "user", "SELECT OLD.user_id"),
+]
+
+
+def _install_contract_visibility_index(conn: sqlite3.Connection, backfill: bool) -> None:
+    """Create contract_visibility(user_id, contract_id) and the triggers that maintain it.
+
+    Rows exist only for non-admin users; admins see everything without a lookup.
+    The view and triggers are recreated on every start so rule changes apply.
+    """
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS contract_visibility (
+          user_id INTEGER NOT NULL REFERENCES auth_users(id) ON DELETE CASCADE,
+          contract_id TEXT NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
+          PRIMARY KEY (user_id, contract_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_contract_visibility_contract
+          ON contract_visibility(contract_id);
+        DROP VIEW IF EXISTS contract_visibility_source;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE VIEW contract_visibility_source AS
+        SELECT u.id AS user_id, c.id AS contract_id
+        FROM auth_users u
+        CROSS JOIN contracts c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM auth_user_roles aur
+            JOIN auth_roles ar ON ar.id = aur.role_id
+            WHERE aur.user_id = u.id AND ar.name = 'admin'
+          )
+          AND {CONTRACT_VISIBILITY_RULE_SQL}
+        """
+    )
+    for suffix, table, event, scope, affected_sql in CONTRACT_VISIBILITY_TRIGGERS:
+        column = "contract_id" if scope == "contract" else "user_id"
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_contract_visibility_{suffix}")
+        conn.execute(
+            f"""
+            CREATE TRIGGER trg_contract_visibility_{suffix}
+            AFTER {event} ON {table}
+            BEGIN
+              DELETE FROM contract_visibility WHERE {column} IN ({affected_sql});
+              INSERT OR IGNORE INTO contract_visibility (user_id, contract_id)
+              SELECT user_id, contract_id FROM contract_visibility_source
+              WHERE {column} IN ({affected_sql});
+            END
+            """
+        )
+    if backfill:
+        conn.execute("DELETE FROM contract_visibility")
+        conn.execute(
+            """
+            INSERT INTO contract_visibility (user_id, contract_id)
+            SELECT user_id, contract_id FROM contract_visibility_source
+            """
+        )
+
 
 def _filter_contract_visibility(
     conn: sqlite3.Connection,
@@ -5807,6 +6524,7 @@ def _filter_contract_visibility(
     user_profit_center_groups: List[str],
     is_admin: bool,
 ) -> List[str]:
+    """Reference implementation of the rules materialized in contract_visibility."""
     if not contract_ids:
         return []
     if is_admin:
@@ -5878,22 +6596,40 @@ def _filter_contract_visibility(
     return [cid for cid in contract_ids if cid in visible_ids]
 
 
+def _contract_visibility_clause(
+    context: Optional[Dict[str, Any]], contract_column: str = "c.id"
+) -> Tuple[str, List[Any]]:
+    """SQL predicate (and params) limiting contract_column to contracts the user may see.
+
+    Uses the materialized contract_visibility index, so LIMIT/OFFSET count only
+    visible rows and the check is one primary-key range scan per query.
+    """
+    if context is None or context["is_admin"]:
+        return "1=1", []
+    return (
+        f"{contract_column} IN (SELECT contract_id FROM contract_visibility WHERE user_id = ?)",
+        [context["user_id"]],
+    )
+
+
+def _is_contract_visible(
+    conn: sqlite3.Connection, contract_id: str, context: Optional[Dict[str, Any]]
+) -> bool:
+    if context is None or context["is_admin"]:
+        return True
+    row = conn.execute(
+        "SELECT 1 FROM contract_visibility WHERE user_id = ? AND contract_id = ?",
+        (context["user_id"], contract_id),
+    ).fetchone()
+    return row is not None
+
+
 def _ensure_contract_visibility(
     conn: sqlite3.Connection,
     contract_id: str,
     context: Optional[Dict[str, Any]],
 ) -> None:
-    if context is None:
-        return
-    visible_ids = _filter_contract_visibility(
-        conn,
-        [contract_id],
-        context["user_role_ids"],
-        context["user_profit_center_ids"],
-        context["user_profit_center_groups"],
-        context["is_admin"],
-    )
-    if contract_id not in visible_ids:
+    if not _is_contract_visible(conn, contract_id, context):
         raise HTTPException(status_code=404, detail="Contract not found")
 
 
@@ -5918,41 +6654,110 @@ def _load_contract_profit_centers_for_list(
         profit_centers.setdefault(row["contract_id"], []).append(dict(row))
     return profit_centers
 
-# ----------------------------
-# List contracts
-# ----------------------------
-@app.get("/api/contracts")
-def list_contracts(
-    limit: int = 50,
-    offset: int = 0,
-    status: Optional[str] = None,
-    agreement_type: Optional[str] = None,
-    q: Optional[str] = None,
-    mode: Optional[Literal["quick", "fulltext"]] = "quick",
-    include_tags: bool = True,
-    request: Request = None,
-    _: Dict[str, Any] = Depends(require_user),
-):
-    limit = max(1, min(limit, 200))
-    offset = max(0, offset)
-    q = (q or "").strip()
 
-    with db() as conn:
-        where_clauses = []
-        params: List[Any] = []
+def _load_contract_tags_for_list(
+    conn: sqlite3.Connection, contract_ids: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    contract_ids = list(dict.fromkeys(contract_ids))
+    if not contract_ids:
+        return {}
+    placeholders = ",".join("?" for _ in contract_ids)
+    rows = conn.execute(
+        f"""
+        SELECT ct.contract_id, t.id, t.name, t.color, ct.auto_generated
+        FROM contract_tags ct
+        JOIN tags t ON t.id = ct.tag_id
+        WHERE ct.contract_id IN ({placeholders})
+        ORDER BY ct.contract_id ASC, ct.tag_id ASC
+        """,
+        tuple(contract_ids),
+    ).fetchall()
+    tags: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        tags.setdefault(row["contract_id"], []).append(
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "color": row["color"],
+                "auto_generated": row["auto_generated"],
+            }
+        )
+    return tags
+
+
+def _load_reminder_settings_for_events(
+    conn: sqlite3.Connection, event_ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    if not event_ids:
+        return {}
+    placeholders = ",".join("?" for _ in event_ids)
+    rows = conn.execute(
+        f"""
+        SELECT event_id, recipients, offsets_json, enabled, updated_at
+        FROM reminder_settings
+        WHERE event_id IN ({placeholders})
+        """,
+        tuple(event_ids),
+    ).fetchall()
+    return {
+        row["event_id"]: {
+            "enabled": bool(row["enabled"]),
+            "recipients": row["recipients"].split(","),
+            "offsets": json.loads(row["offsets_json"]),
+            "updated_at": row["updated_at"],
+        }
+        for row in rows
+    }
+
+# ----------------------------
+# List contracts
+# ----------------------------
+@app.get("/api/contracts")
+def list_contracts(
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[str] = None,
+    agreement_type: Optional[str] = None,
+    q: Optional[str] = None,
+    mode: Optional[Literal["quick", "fulltext"]] = "quick",
+    include_tags: bool = True,
+    cursor: Optional[str] = None,
+    request: Request = None,
+    _: Dict[str, Any] = Depends(require_user),
+):
+    """Newest contracts first. Passing ``cursor`` (empty for the first page)
+    switches to keyset paging and an ``{items, limit, next_cursor}`` response."""
+    limit = max(1, min(limit, 200))
+    offset = max(0, offset)
+    q = (q or "").strip()
+    keyset = cursor is not None
+    fetch_limit = limit + 1 if keyset else limit
+
+    with db() as conn:
+        where_clauses = []
+        params: List[Any] = []
 
         if status:
-            where_clauses.append("status = ?")
+            where_clauses.append("c.status = ?")
             params.append(status)
         if agreement_type:
-            where_clauses.append("agreement_type = ?")
+            where_clauses.append("c.agreement_type = ?")
             params.append(agreement_type)
+        context = _get_visibility_context(conn, request)
+        if context is not None:
+            visibility_sql, visibility_params = _contract_visibility_clause(context)
+            where_clauses.append(visibility_sql)
+            params.extend(visibility_params)
+        if cursor:
+            where_clauses.append("(c.uploaded_at, c.id) < (?, ?)")
+            params.extend(decode_cursor(cursor, 2))
+            offset = 0
 
         where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
 
         if q:
             if mode == "fulltext":
-                params = [q] + params + [limit, offset]
+                params = [q] + params + [fetch_limit, offset]
                 rows = conn.execute(
                     f"""
                     SELECT c.id, c.title, c.vendor, c.agreement_type,
@@ -5961,77 +6766,60 @@ def list_contracts(
                     JOIN contracts c ON c.id = f.contract_id
                     WHERE contracts_fts MATCH ?
                       AND {where_sql}
-                    ORDER BY c.uploaded_at DESC
+                    ORDER BY c.uploaded_at DESC, c.id DESC
                     LIMIT ? OFFSET ?
                     """,
                     tuple(params),
                 ).fetchall()
             else:
                 like = f"%{q}%"
-                params = [like, like, like] + params + [limit, offset]
+                params = [like, like, like] + params + [fetch_limit, offset]
                 rows = conn.execute(
                     f"""
-                    SELECT id, title, vendor, agreement_type,
-                           original_filename, status, pages, uploaded_at, sha256
-                    FROM contracts
-                    WHERE (title LIKE ? OR vendor LIKE ? OR original_filename LIKE ?)
+                    SELECT c.id, c.title, c.vendor, c.agreement_type,
+                           c.original_filename, c.status, c.pages, c.uploaded_at, c.sha256
+                    FROM contracts c
+                    WHERE (c.title LIKE ? OR c.vendor LIKE ? OR c.original_filename LIKE ?)
                       AND {where_sql}
-                    ORDER BY uploaded_at DESC
+                    ORDER BY c.uploaded_at DESC, c.id DESC
                     LIMIT ? OFFSET ?
                     """,
                     tuple(params),
                 ).fetchall()
         else:
-            params.append(limit)
+            params.append(fetch_limit)
             params.append(offset)
             rows = conn.execute(
                 f"""
-                SELECT id, title, vendor, agreement_type,
-                       original_filename, status, pages, uploaded_at, sha256
-                FROM contracts
+                SELECT c.id, c.title, c.vendor, c.agreement_type,
+                       c.original_filename, c.status, c.pages, c.uploaded_at, c.sha256
+                FROM contracts c
                 WHERE {where_sql}
-                ORDER BY uploaded_at DESC
+                ORDER BY c.uploaded_at DESC, c.id DESC
                 LIMIT ? OFFSET ?
                 """,
                 tuple(params),
             ).fetchall()
 
+        next_cursor = None
+        if keyset and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["uploaded_at"], rows[-1]["id"])
+
         result = [dict(r) for r in rows]
-        context = _get_visibility_context(conn, request)
-        if result and context is not None:
-            contract_ids = [item["id"] for item in result]
-            visible_ids = set(
-                _filter_contract_visibility(
-                    conn,
-                    contract_ids,
-                    context["user_role_ids"],
-                    context["user_profit_center_ids"],
-                    context["user_profit_center_groups"],
-                    context["is_admin"],
-                )
-            )
-            result = [item for item in result if item["id"] in visible_ids]
         if result:
             profit_center_map = _load_contract_profit_centers_for_list(
                 conn, [item["id"] for item in result]
             )
             for item in result:
                 item["profit_centers"] = profit_center_map.get(item["id"], [])
-        if not include_tags:
-            return result
-
-        for item in result:
-            tags = conn.execute(
-                """
-                SELECT t.id, t.name, t.color, ct.auto_generated
-                FROM contract_tags ct
-                JOIN tags t ON t.id = ct.tag_id
-                WHERE ct.contract_id = ?
-                """,
-                (item["id"],),
-            ).fetchall()
-            item["tags"] = [dict(t) for t in tags]
+        if include_tags:
+            tag_map = _load_contract_tags_for_list(conn, [item["id"] for item in result])
+            for item in result:
+                item["tags"] = tag_map.get(item["id"], [])
 
+        if keyset:
+            return {"items": result, "limit": limit, "next_cursor": next_cursor}
         return result
 
 
@@ -6265,20 +7053,8 @@ def _get_contract_detail(conn: sqlite3.Connection, contract_id: str) -> Dict[str
         (contract_id,),
     ).fetchall()
 
-    reminder_map: Dict[str, Any] = {}
-    for ev in events:
-        rs = conn.execute(
-            "SELECT * FROM reminder_settings WHERE event_id = ?", (ev["id"],)
-        ).fetchone()
-        if rs:
-            reminder_map[ev["id"]] = {
-                "enabled": bool(rs["enabled"]),
-                "recipients": rs["recipients"].split(","),
-                "offsets": json.loads(rs["offsets_json"]),
-                "updated_at": rs["updated_at"],
-            }
-        else:
-            reminder_map[ev["id"]] = None
+    settings = _load_reminder_settings_for_events(conn, [ev["id"] for ev in events])
+    reminder_map: Dict[str, Any] = {ev["id"]: settings.get(ev["id"]) for ev in events}
 
     profit_centers = _get_contract_profit_centers(conn, contract_id)
 
@@ -6401,6 +7177,8 @@ def update_event(
             "UPDATE events SET event_type = ?, event_date = ?, derived_from_term_key = ? WHERE id = ?",
             (new_type, new_date, derived, event_id),
         )
+        if new_date != ev["event_date"]:
+            _refresh_reminder_schedule(conn, event_id)
 
     return {"event_id": event_id, "event_type": new_type, "event_date": new_date}
 
@@ -6408,6 +7186,7 @@ def update_event(
 @app.delete("/api/events/{event_id}")
 def delete_event(event_id: str, _: Dict[str, Any] = Depends(require_user)):
     with db() as conn:
+        conn.execute("DELETE FROM reminder_schedule WHERE event_id = ?", (event_id,))
         conn.execute("DELETE FROM reminder_settings WHERE event_id = ?", (event_id,))
         conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
     return {"deleted": event_id}
@@ -6418,17 +7197,42 @@ def get_contract_status(
     contract_id: str,
     request: Request,
     _: Dict[str, Any] = Depends(require_user),
+    conn: sqlite3.Connection = Depends(get_db),
 ):
-    with db() as conn:
-        context = _get_visibility_context(conn, request)
-        _ensure_contract_visibility(conn, contract_id, context)
-        c = conn.execute(
-            "SELECT id, status, pages FROM contracts WHERE id = ?",
-            (contract_id,),
-        ).fetchone()
-        if not c:
-            raise HTTPException(status_code=404, detail="Contract not found")
-        return dict(c)
+    context = _get_visibility_context(conn, request)
+    _ensure_contract_visibility(conn, contract_id, context)
+    c = conn.execute(
+        "SELECT id, status, pages FROM contracts WHERE id = ?",
+        (contract_id,),
+    ).fetchone()
+    if not c:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    job = conn.execute(
+        """
+        SELECT id, status, progress, detail, started_at, finished_at
+        FROM job_runs
+        WHERE job_name = ? AND contract_id = ?
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (OCR_JOB_NAME, contract_id),
+    ).fetchone()
+    result = dict(c)
+    result["progress"] = 100 if c["status"] == "processed" else 0
+    result["job"] = None
+    if job:
+        result["progress"] = job["progress"]
+        result["job"] = dict(job)
+        if job["status"] == "queued":
+            ahead = conn.execute(
+                """
+                SELECT COUNT(1) AS count FROM job_runs
+                WHERE job_name = ? AND status = 'queued' AND id < ?
+                """,
+                (OCR_JOB_NAME, job["id"]),
+            ).fetchone()
+            result["job"]["queue_position"] = ahead["count"] + 1
+    return result
 
 # ----------------------------
 # View / download
@@ -6490,6 +7294,7 @@ def download_contract(
 def get_contract_ocr_text(
     contract_id: str,
     request: Request,
+    page: Optional[int] = None,
     _: Dict[str, Any] = Depends(require_user),
 ):
     with db() as conn:
@@ -6502,14 +7307,19 @@ def get_contract_ocr_text(
         if not c:
             raise HTTPException(status_code=404, detail="Contract not found")
 
+        where = "contract_id = ?"
+        params: List[Any] = [contract_id]
+        if page is not None:
+            where += " AND page_number = ?"
+            params.append(page)
         rows = conn.execute(
-            """
-            SELECT page_number, text
+            f"""
+            SELECT page_number, text, source
             FROM ocr_pages
-            WHERE contract_id = ?
+            WHERE {where}
             ORDER BY page_number ASC
             """,
-            (contract_id,),
+            params,
         ).fetchall()
 
     pages = [dict(r) for r in rows]
@@ -6527,11 +7337,15 @@ def list_events(
     request: Request,
     event_type: str = "all",
     sort: str = "date_asc",
+    limit: Optional[int] = None,
+    offset: int = 0,
     _: Dict[str, Any] = Depends(require_user),
 ):
     """
     month: 'YYYY-MM'
     event_type: 'all' | 'renewal' | 'effective' | 'termination' | 'auto_opt_out' etc.
+    limit/offset: optional; when limit is given the response is
+    {"items", "total", "limit", "offset"} instead of a bare list.
     """
     params: List[Any] = []
     where = "WHERE 1=1"
@@ -6560,8 +7374,35 @@ def list_events(
         order = "ORDER BY c.title ASC, e.event_date ASC"
     elif sort == "title_desc":
         order = "ORDER BY c.title DESC, e.event_date ASC"
+    # Stable tie-break so limit/offset pages neither overlap nor skip rows.
+    order += ", e.id ASC"
+
+    paginate = limit is not None
+    if paginate:
+        limit = max(1, min(limit, 500))
+        offset = max(0, offset)
 
     with db() as conn:
+        context = _get_visibility_context(conn, request)
+        visibility_sql, visibility_params = _contract_visibility_clause(context)
+        where += f" AND {visibility_sql}"
+        params.extend(visibility_params)
+        page_sql = ""
+        page_params: List[Any] = []
+        total = None
+        if paginate:
+            total = conn.execute(
+                f"""
+                SELECT COUNT(1) AS count
+                FROM events e
+                JOIN contracts c ON c.id = e.contract_id
+                {where}
+                """,
+                tuple(params),
+            ).fetchone()["count"]
+            page_sql = "LIMIT ? OFFSET ?"
+            page_params = [limit, offset]
+
         rows = conn.execute(
             f"""
             SELECT e.*, c.title, c.vendor, c.agreement_type
@@ -6569,40 +7410,26 @@ def list_events(
             JOIN contracts c ON c.id = e.contract_id
             {where}
             {order}
+            {page_sql}
             """,
-            tuple(params),
+            tuple(params + page_params),
         ).fetchall()
 
-        context = _get_visibility_context(conn, request)
-        if context is not None and rows:
-            contract_ids = [row["contract_id"] for row in rows]
-            visible_ids = set(
-                _filter_contract_visibility(
-                    conn,
-                    contract_ids,
-                    context["user_role_ids"],
-                    context["user_profit_center_ids"],
-                    context["user_profit_center_groups"],
-                    context["is_admin"],
-                )
-            )
-            rows = [row for row in rows if row["contract_id"] in visible_ids]
-
+        settings = _load_reminder_settings_for_events(conn, [r["id"] for r in rows])
         out = []
         for r in rows:
-            rs = conn.execute(
-                "SELECT * FROM reminder_settings WHERE event_id = ?", (r["id"],)
-            ).fetchone()
+            rs = settings.get(r["id"])
             reminder = None
             if rs:
-                offsets = sorted(json.loads(rs["offsets_json"]))
                 reminder = {
-                    "enabled": bool(rs["enabled"]),
-                    "offsets": offsets,
-                    "recipients": rs["recipients"].split(","),
+                    "enabled": rs["enabled"],
+                    "offsets": sorted(rs["offsets"]),
+                    "recipients": rs["recipients"],
                 }
             out.append({**dict(r), "reminder": reminder})
 
+        if paginate:
+            return {"items": out, "total": total, "limit": limit, "offset": offset}
         return out
 
 # ----------------------------
@@ -6621,35 +7448,23 @@ def search(
     limit = max(1, min(limit, 200))
 
     with db() as conn:
+        context = _get_visibility_context(conn, request)
+        visibility_sql, visibility_params = _contract_visibility_clause(context)
         if mode == "quick":
             like = f"%{q}%"
             rows = conn.execute(
-                """
-                SELECT id, title, vendor, agreement_type,
-                       original_filename, uploaded_at, status
-                FROM contracts
-                WHERE title LIKE ? OR vendor LIKE ? OR original_filename LIKE ?
-                ORDER BY uploaded_at DESC
+                f"""
+                SELECT c.id, c.title, c.vendor, c.agreement_type,
+                       c.original_filename, c.uploaded_at, c.status
+                FROM contracts c
+                WHERE (c.title LIKE ? OR c.vendor LIKE ? OR c.original_filename LIKE ?)
+                  AND {visibility_sql}
+                ORDER BY c.uploaded_at DESC
                 LIMIT ?
                 """,
-                (like, like, like, limit),
+                (like, like, like, *visibility_params, limit),
             ).fetchall()
-            result = [dict(r) for r in rows]
-            context = _get_visibility_context(conn, request)
-            if context is None or not result:
-                return result
-            contract_ids = [item["id"] for item in result]
-            visible_ids = set(
-                _filter_contract_visibility(
-                    conn,
-                    contract_ids,
-                    context["user_role_ids"],
-                    context["user_profit_center_ids"],
-                    context["user_profit_center_groups"],
-                    context["is_admin"],
-                )
-            )
-            return [item for item in result if item["id"] in visible_ids]
+            return [dict(r) for r in rows]
 
         if mode == "terms":
             if not term_key:
@@ -6658,7 +7473,7 @@ def search(
                 )
             like = f"%{q}%"
             rows = conn.execute(
-                """
+                f"""
                 SELECT c.id, c.title, c.vendor, c.agreement_type,
                        c.original_filename, ti.term_key,
                        ti.value_normalized, ti.status, ti.confidence
@@ -6666,58 +7481,30 @@ def search(
                 JOIN contracts c ON c.id = ti.contract_id
                 WHERE ti.term_key = ?
                   AND (ti.value_raw LIKE ? OR ti.value_normalized LIKE ?)
+                  AND {visibility_sql}
                 ORDER BY ti.confidence DESC
                 LIMIT ?
                 """,
-                (term_key, like, like, limit),
+                (term_key, like, like, *visibility_params, limit),
             ).fetchall()
-            result = [dict(r) for r in rows]
-            context = _get_visibility_context(conn, request)
-            if context is None or not result:
-                return result
-            contract_ids = [item["id"] for item in result]
-            visible_ids = set(
-                _filter_contract_visibility(
-                    conn,
-                    contract_ids,
-                    context["user_role_ids"],
-                    context["user_profit_center_ids"],
-                    context["user_profit_center_groups"],
-                    context["is_admin"],
-                )
-            )
-            return [item for item in result if item["id"] in visible_ids]
+            return [dict(r) for r in rows]
 
         if not q:
             return []
 
         rows = conn.execute(
-            """
+            f"""
             SELECT c.id, c.title, c.vendor, c.agreement_type,
                    c.original_filename, c.uploaded_at
             FROM contracts_fts f
             JOIN contracts c ON c.id = f.contract_id
             WHERE contracts_fts MATCH ?
+              AND {visibility_sql}
             LIMIT ?
             """,
-            (q, limit),
+            (q, *visibility_params, limit),
         ).fetchall()
-        result = [dict(r) for r in rows]
-        context = _get_visibility_context(conn, request)
-        if context is None or not result:
-            return result
-        contract_ids = [item["id"] for item in result]
-        visible_ids = set(
-            _filter_contract_visibility(
-                conn,
-                contract_ids,
-                context["user_role_ids"],
-                context["user_profit_center_ids"],
-                context["user_profit_center_groups"],
-                context["is_admin"],
-            )
-        )
-        return [item for item in result if item["id"] in visible_ids]
+        return [dict(r) for r in rows]
 
 # ----------------------------
 # Reminders
@@ -6767,6 +7554,7 @@ def update_reminders(
                 now_iso(),
             ),
         )
+        _refresh_reminder_schedule(conn, event_id)
 
     return {
         "event_id": event_id,
@@ -6800,42 +7588,234 @@ def _format_app_link(label: str, path: str = "") -> Optional[str]:
     return f"{label}: {base}{path}"
 
 
-def _log_notification_send(
-    kind: str,
+# ----------------------------
+# Notification outbox
+# ----------------------------
+# notification_logs doubles as the outbox: rows are written 'queued' in the caller's
+# transaction and move to 'sending' (claimed by one worker until claim_expires_at),
+# then 'sent' or (after the last retry) 'error'.
+_outbox_wakeup = threading.Event()
+_outbox_stop = threading.Event()
+_outbox_threads: List[threading.Thread] = []
+
+
+def _enqueue_notification(
+    conn: sqlite3.Connection,
     recipients: List[str],
     subject: str,
     body: str,
-    status: str,
-    error: Optional[str] = None,
+    kind: str,
     related_id: Optional[str] = None,
     metadata: Optional[Dict[str, Any]] = None,
-) -> None:
+) -> str:
+    log_id = str(uuid.uuid4())
+    created_at = now_iso()
     payload = json.dumps(recipients)
     metadata_json = json.dumps(metadata) if metadata else None
+    # log_seq is allocated by the insert itself: a separate max() read runs before the
+    # transaction takes the write lock, so two enqueues could pick the same number.
+    conn.execute(
+        """
+        INSERT INTO notification_logs (
+          id, kind, recipients_json, subject, body, status, related_id, metadata_json,
+          created_at, attempts, next_attempt_at, log_seq
+        )
+        SELECT ?, ?, ?, ?, ?, 'queued', ?, ?, ?, 0, ?, coalesce(max(log_seq), 0) + 1
+        FROM notification_logs
+        """,
+        (
+            log_id,
+            kind,
+            payload,
+            subject,
+            body,
+            related_id,
+            metadata_json,
+            created_at,
+            created_at,
+        ),
+    )
+    log_seq = conn.execute(
+        "SELECT log_seq FROM notification_logs WHERE id = ?", (log_id,)
+    ).fetchone()[0]
+    conn.execute(
+        """
+        INSERT INTO notification_logs_fts (
+          rowid, subject, recipients_json, body, kind, related_id, metadata_json
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (log_seq, subject, payload, body, kind, related_id, metadata_json),
+    )
+    _outbox_wakeup.set()
+    return log_id
+
+
+def _requeue_expired_outbox_claims(conn: sqlite3.Connection) -> int:
+    """Put messages whose claim lapsed (their dispatcher died mid-send) back on the queue."""
+    now = now_iso()
+    return conn.execute(
+        """
+        UPDATE notification_logs
+        SET status = 'queued', next_attempt_at = ?, claimed_by = NULL, claim_expires_at = NULL
+        WHERE status = 'sending' AND (claim_expires_at IS NULL OR claim_expires_at <= ?)
+        """,
+        (now, now),
+    ).rowcount
+
+
+def _claim_outbox_batch(limit: int) -> List[Dict[str, Any]]:
+    claimed: List[Dict[str, Any]] = []
+    claim_expires_at = (
+        datetime.utcnow().replace(microsecond=0)
+        + timedelta(seconds=NOTIFICATION_OUTBOX_CLAIM_SECONDS)
+    ).isoformat() + "Z"
     with db() as conn:
-        conn.execute(
+        _requeue_expired_outbox_claims(conn)
+        rows = conn.execute(
             """
-            INSERT INTO notification_logs (
-              id, kind, recipients_json, subject, body, status, error, related_id, metadata_json, created_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            SELECT id, kind, recipients_json, subject, body, related_id, metadata_json, attempts
+            FROM notification_logs
+            WHERE status = 'queued' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at ASC
+            LIMIT ?
             """,
-            (
-                str(uuid.uuid4()),
-                kind,
-                payload,
-                subject,
-                body,
-                status,
-                error,
-                related_id,
-                metadata_json,
-                now_iso(),
-            ),
-        )
+            (now_iso(), limit),
+        ).fetchall()
+        for row in rows:
+            # Guard on status so concurrent dispatchers never claim the same message.
+            cur = conn.execute(
+                """
+                UPDATE notification_logs
+                SET status = 'sending', attempts = attempts + 1,
+                    claimed_by = ?, claim_expires_at = ?
+                WHERE id = ? AND status = 'queued'
+                """,
+                (WORKER_TOKEN, claim_expires_at, row["id"]),
+            )
+            if cur.rowcount == 1:
+                item = dict(row)
+                item["attempts"] += 1
+                claimed.append(item)
+    return claimed
+
+
+def _outbox_retry_at(attempts: int) -> str:
+    delay = NOTIFICATION_OUTBOX_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    retry_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=delay)
+    return retry_at.isoformat() + "Z"
+
+
+def _record_reminder_send(
+    conn: sqlite3.Connection, metadata: Dict[str, Any], status: str, error: Optional[str]
+) -> None:
+    conn.execute(
+        """
+        UPDATE reminder_sends
+        SET status = ?, error = ?, sent_at = CASE WHEN ? = 'sent' THEN ? ELSE sent_at END
+        WHERE event_id = ? AND offset_days = ? AND scheduled_for = ?
+        """,
+        (
+            status,
+            error,
+            status,
+            now_iso(),
+            metadata.get("event_id"),
+            metadata.get("offset_days"),
+            metadata.get("scheduled_for"),
+        ),
+    )
 
 
-def _send_email(recipients: List[str], subject: str, body: str) -> None:
+def _dispatch_outbox_batch() -> int:
+    items = _claim_outbox_batch(NOTIFICATION_OUTBOX_BATCH_SIZE)
+    if not items:
+        return 0
+    try:
+        settings = _smtp_settings()
+        messages = [
+            _build_email_message(safe_json_list(item["recipients_json"]), item["subject"], item["body"])
+            for item in items
+        ]
+        results: List[Optional[Exception]] = send_batch(settings, messages, SMTP_MAX_CONNECTIONS)
+    except Exception as exc:
+        results = [exc] * len(items)
+
+    with db() as conn:
+        for item, exc in zip(items, results):
+            if exc is None:
+                status, error_msg, next_attempt_at = "sent", None, None
+            else:
+                error_msg = f"{type(exc).__name__}: {exc}"
+                if item["attempts"] >= NOTIFICATION_OUTBOX_MAX_ATTEMPTS:
+                    status, next_attempt_at = "error", None
+                else:
+                    status, next_attempt_at = "queued", _outbox_retry_at(item["attempts"])
+                logger.warning(
+                    "NOTIFICATION SEND FAILED id=%s attempt=%s | %s",
+                    item["id"],
+                    item["attempts"],
+                    error_msg,
+                )
+            # Only the claim owner records the result; a lapsed claim may have been requeued.
+            updated = conn.execute(
+                """
+                UPDATE notification_logs
+                SET status = ?, error = ?, next_attempt_at = ?,
+                    sent_at = CASE WHEN ? = 'sent' THEN ? ELSE sent_at END,
+                    claimed_by = NULL, claim_expires_at = NULL
+                WHERE id = ? AND claimed_by = ?
+                """,
+                (status, error_msg, next_attempt_at, status, now_iso(), item["id"], WORKER_TOKEN),
+            ).rowcount
+            if updated and item["kind"] == "event_reminder":
+                _record_reminder_send(
+                    conn,
+                    safe_json_dict(item["metadata_json"]),
+                    "pending" if status == "queued" else status,
+                    error_msg,
+                )
+    return len(items)
+
+
+def _notification_dispatcher_loop() -> None:
+    while not _outbox_stop.is_set():
+        try:
+            dispatched = _dispatch_outbox_batch()
+        except Exception:
+            logger.error(f"NOTIFICATION OUTBOX DISPATCH FAILED\n{traceback.format_exc()}")
+            dispatched = 0
+        if not dispatched:
+            _outbox_wakeup.wait(NOTIFICATION_OUTBOX_POLL_SECONDS)
+            _outbox_wakeup.clear()
+
+
+def _start_notification_dispatcher() -> None:
+    if _outbox_threads:
+        return
+    with db() as conn:
+        # Messages left mid-send by a dead process go back on the queue; claims held by
+        # other live workers are left alone until they expire.
+        requeued = _requeue_expired_outbox_claims(conn)
+    if requeued:
+        logger.info(f"NOTIFICATION OUTBOX requeued {requeued} interrupted message(s)")
+    _outbox_stop.clear()
+    thread = threading.Thread(
+        target=_notification_dispatcher_loop, name="notification-dispatcher", daemon=True
+    )
+    thread.start()
+    _outbox_threads.append(thread)
+
+
+def _stop_notification_dispatcher() -> None:
+    _outbox_stop.set()
+    _outbox_wakeup.set()
+    for thread in _outbox_threads:
+        thread.join(timeout=5)
+    _outbox_threads.clear()
+
+
+def _smtp_settings() -> SmtpSettings:
     # SMTP configuration (set as environment variables):
     #   SMTP_HOST        -> SMTP server hostname (e.g., smtp.sendgrid.net)
     #   SMTP_PORT        -> SMTP server port (e.g., 587)
@@ -6844,15 +7824,23 @@ def _send_email(recipients: List[str], subject: str, body: str) -> None:
     # Optional/alternate keys also accepted:
     #   SMTP_SERVER or SMTP_Server (host), SMTPUsers (username), SMTP_Password (password)
     #   SMTP_FROM / SMTP_FROM_ADDRESS (from email), SMTP_FROM_NAME (sender name)
+    #   SMTP_TIMEOUT_SECONDS (socket timeout), SMTP_MAX_CONNECTIONS (parallel sessions per reminder run)
     host = _env_first("SMTP_HOST", "SMTP_SERVER", "SMTP_Server")
     if not host:
         raise RuntimeError("SMTP_HOST is not configured")
 
-    port = int(_env_first("SMTP_PORT") or "587")
-    username = _env_first("SMTP_USERNAME", "SMTP_USER", "SMTP_LOGIN", "SMTPUsers")
-    password = _env_first("SMTP_PASSWORD", "SMTP_Password")
-    use_tls = os.getenv("SMTP_USE_TLS", "true").lower() in {"1", "true", "yes"}
-    use_ssl = os.getenv("SMTP_USE_SSL", "false").lower() in {"1", "true", "yes"}
+    return SmtpSettings(
+        host=host,
+        port=int(_env_first("SMTP_PORT") or "587"),
+        username=_env_first("SMTP_USERNAME", "SMTP_USER", "SMTP_LOGIN", "SMTPUsers"),
+        password=_env_first("SMTP_PASSWORD", "SMTP_Password"),
+        use_tls=os.getenv("SMTP_USE_TLS", "true").lower() in {"1", "true", "yes"},
+        use_ssl=os.getenv("SMTP_USE_SSL", "false").lower() in {"1", "true", "yes"},
+        timeout=float(_env_first("SMTP_TIMEOUT_SECONDS") or "30"),
+    )
+
+
+def _build_email_message(recipients: List[str], subject: str, body: str) -> EmailMessage:
     from_name = _env_first("SMTP_FROM_NAME", "SMTP_SENDER_NAME")
     from_addr = _smtp_from_address()
 
@@ -6861,54 +7849,8 @@ def _send_email(recipients: List[str], subject: str, body: str) -> None:
     msg["From"] = f"{from_name} <{from_addr}>" if from_name else from_addr
     msg["To"] = ", ".join(recipients)
     msg.set_content(body)
+    return msg
 
-    if use_ssl:
-        with smtplib.SMTP_SSL(host, port) as smtp:
-            if username and password:
-                smtp.login(username, password)
-            smtp.send_message(msg)
-        return
-
-    with smtplib.SMTP(host, port) as smtp:
-        if use_tls:
-            smtp.starttls()
-        if username and password:
-            smtp.login(username, password)
-        smtp.send_message(msg)
-
-
-def _send_email_with_log(
-    recipients: List[str],
-    subject: str,
-    body: str,
-    kind: str,
-    related_id: Optional[str] = None,
-    metadata: Optional[Dict[str, Any]] = None,
-) -> None:
-    try:
-        _send_email(recipients, subject, body)
-        _log_notification_send(
-            kind=kind,
-            recipients=recipients,
-            subject=subject,
-            body=body,
-            status="sent",
-            related_id=related_id,
-            metadata=metadata,
-        )
-    except Exception as exc:
-        error_msg = f"{type(exc).__name__}: {exc}"
-        _log_notification_send(
-            kind=kind,
-            recipients=recipients,
-            subject=subject,
-            body=body,
-            status="error",
-            error=error_msg,
-            related_id=related_id,
-            metadata=metadata,
-        )
-        raise
 
 def _format_event_subject(event_type: str, title: str, event_date: str, offset_days: int) -> str:
     kind = event_type.replace("_", " ").title()
@@ -6942,113 +7884,173 @@ def _format_event_body(event: sqlite3.Row, offset_days: int) -> str:
     return "\n".join(lines)
 
 
-def _send_due_reminders(reference_date: date) -> Dict[str, Any]:
-    sent = 0
+REMINDER_JOB_NAME = "event_reminders"
+
+
+def _refresh_reminder_schedule(conn: sqlite3.Connection, event_id: Optional[str] = None) -> None:
+    """Rebuild reminder_schedule rows (one per enabled offset) for one event, or all."""
+    event_filter = "AND e.id = ?" if event_id else ""
+    params: Tuple[Any, ...] = (event_id,) if event_id else ()
+    if event_id:
+        conn.execute("DELETE FROM reminder_schedule WHERE event_id = ?", params)
+    else:
+        conn.execute("DELETE FROM reminder_schedule")
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO reminder_schedule (event_id, offset_days, scheduled_for)
+        SELECT e.id, o.value, date(e.event_date, printf('%+d days', -o.value))
+        FROM events e
+        JOIN reminder_settings rs ON rs.event_id = e.id
+        JOIN json_each(rs.offsets_json) o
+        WHERE rs.enabled = 1
+          AND json_valid(rs.offsets_json)
+          AND o.type = 'integer'
+          AND date(e.event_date) IS NOT NULL
+          {event_filter}
+        """,
+        params,
+    )
+
+
+def _send_due_reminders(
+    reference_date: date, since: Optional[date] = None
+) -> Dict[str, Any]:
+    """Queue reminders scheduled for ``reference_date``, or for every day after
+    ``since`` up to and including it when catching up."""
+    queued = 0
     skipped = 0
-    errors: List[Dict[str, str]] = []
+    start = since or reference_date - timedelta(days=1)
 
+    # Each due reminder is claimed in reminder_sends and queued in the outbox in the
+    # same transaction; the dispatcher records the delivery result back on reminder_sends.
     with db() as conn:
         rows = conn.execute(
             """
-            SELECT rs.event_id, rs.recipients, rs.offsets_json, rs.enabled,
+            SELECT sch.event_id, sch.offset_days, sch.scheduled_for, rs.recipients,
                    e.event_date, e.event_type, e.contract_id,
-                   c.title, c.vendor, c.agreement_type, c.status as contract_status
-            FROM reminder_settings rs
-            JOIN events e ON e.id = rs.event_id
+                   c.title, c.vendor, c.agreement_type, c.status as contract_status,
+                   sends.status AS send_status
+            FROM reminder_schedule sch
+            JOIN reminder_settings rs ON rs.event_id = sch.event_id AND rs.enabled = 1
+            JOIN events e ON e.id = sch.event_id
             JOIN contracts c ON c.id = e.contract_id
-            WHERE rs.enabled = 1
-            """
+            LEFT JOIN reminder_sends sends
+              ON sends.event_id = sch.event_id
+             AND sends.offset_days = sch.offset_days
+             AND sends.scheduled_for = sch.scheduled_for
+            WHERE sch.scheduled_for > ? AND sch.scheduled_for <= ?
+            ORDER BY sch.scheduled_for, sch.event_id, sch.offset_days
+            """,
+            (start.isoformat(), reference_date.isoformat()),
         ).fetchall()
 
         for row in rows:
-            offsets = json.loads(row["offsets_json"])
-            event_date = date.fromisoformat(row["event_date"])
             recipients = [r.strip() for r in row["recipients"].split(",") if r.strip()]
-            if not recipients:
+            # 'pending' is already in the outbox; only failed sends are queued again.
+            if not recipients or row["send_status"] in {"sent", "pending"}:
                 skipped += 1
                 continue
 
-            for offset in offsets:
-                try:
-                    offset_days = int(offset)
-                except (TypeError, ValueError):
-                    continue
+            offset_days = row["offset_days"]
+            scheduled_for = row["scheduled_for"]
+            conn.execute(
+                """
+                INSERT INTO reminder_sends (event_id, offset_days, scheduled_for, status)
+                VALUES (?, ?, ?, 'pending')
+                ON CONFLICT(event_id, offset_days, scheduled_for)
+                DO UPDATE SET status = 'pending', error = NULL
+                """,
+                (row["event_id"], offset_days, scheduled_for),
+            )
+            _enqueue_notification(
+                conn,
+                recipients,
+                _format_event_subject(
+                    row["event_type"], row["title"], row["event_date"], offset_days
+                ),
+                _format_event_body(row, offset_days),
+                kind="event_reminder",
+                related_id=row["event_id"],
+                metadata={
+                    "event_id": row["event_id"],
+                    "contract_id": row["contract_id"],
+                    "event_type": row["event_type"],
+                    "event_date": row["event_date"],
+                    "offset_days": offset_days,
+                    "scheduled_for": scheduled_for,
+                },
+            )
+            queued += 1
 
-                scheduled_for = (event_date - timedelta(days=offset_days)).isoformat()
-                if scheduled_for != reference_date.isoformat():
-                    continue
+    return {"queued": queued, "skipped": skipped}
 
-                existing = conn.execute(
-                    """
-                    SELECT status FROM reminder_sends
-                    WHERE event_id = ? AND offset_days = ? AND scheduled_for = ?
-                    """,
-                    (row["event_id"], offset_days, scheduled_for),
-                ).fetchone()
-                if existing and existing["status"] == "sent":
-                    skipped += 1
-                    continue
 
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO reminder_sends (event_id, offset_days, scheduled_for, status)
-                    VALUES (?, ?, ?, 'pending')
-                    """,
-                    (row["event_id"], offset_days, scheduled_for),
+def _last_job_detail(conn: sqlite3.Connection, job_name: str) -> Dict[str, Any]:
+    row = conn.execute(
+        """
+        SELECT detail FROM job_runs
+        WHERE job_name = ? AND status = 'processed'
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (job_name,),
+    ).fetchone()
+    return safe_json_dict(row["detail"]) if row else {}
+
+
+def _run_tracked_job(
+    job_name: str, run: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Run ``run(last_detail)`` and record it in job_runs; its result becomes the detail."""
+    with db() as conn:
+        last_detail = _last_job_detail(conn, job_name)
+        job_id = conn.execute(
+            """
+            INSERT INTO job_runs (job_name, started_at, status, progress)
+            VALUES (?, ?, 'processing', 0)
+            """,
+            (job_name, now_iso()),
+        ).lastrowid
+
+    try:
+        result = run(last_detail)
+    except Exception as exc:
+        with db() as conn:
+            conn.execute(
+                "UPDATE job_runs SET status = 'error', finished_at = ?, detail = ? WHERE id = ?",
+                (now_iso(), f"{type(exc).__name__}: {exc}", job_id),
+            )
+        raise
+
+    with db() as conn:
+        conn.execute(
+            """
+            UPDATE job_runs SET status = 'processed', finished_at = ?, progress = 100, detail = ?
+            WHERE id = ?
+            """,
+            (now_iso(), json.dumps(result), job_id),
+        )
+    return result
+
+
+def _run_reminder_job(reference_date: date) -> Dict[str, Any]:
+    """Daily reminder run that also covers days missed since the last successful run."""
+
+    def run(last_detail: Dict[str, Any]) -> Dict[str, Any]:
+        since = reference_date - timedelta(days=1)
+        through = last_detail.get("through")
+        if through:
+            try:
+                since = max(
+                    min(date.fromisoformat(through), since),
+                    reference_date - timedelta(days=REMINDER_CATCHUP_MAX_DAYS + 1),
                 )
+            except ValueError:
+                pass
+        result = _send_due_reminders(reference_date, since=since)
+        return {**result, "since": since.isoformat(), "through": reference_date.isoformat()}
 
-                try:
-                    subject = _format_event_subject(
-                        row["event_type"],
-                        row["title"],
-                        row["event_date"],
-                        offset_days,
-                    )
-                    body = _format_event_body(row, offset_days)
-                    _send_email_with_log(
-                        recipients,
-                        subject,
-                        body,
-                        kind="event_reminder",
-                        related_id=row["event_id"],
-                        metadata={
-                            "event_id": row["event_id"],
-                            "contract_id": row["contract_id"],
-                            "event_type": row["event_type"],
-                            "event_date": row["event_date"],
-                            "offset_days": offset_days,
-                            "scheduled_for": scheduled_for,
-                        },
-                    )
-                    conn.execute(
-                        """
-                        UPDATE reminder_sends
-                        SET sent_at = ?, status = 'sent', error = NULL
-                        WHERE event_id = ? AND offset_days = ? AND scheduled_for = ?
-                        """,
-                        (now_iso(), row["event_id"], offset_days, scheduled_for),
-                    )
-                    sent += 1
-                except Exception as exc:
-                    error_msg = f"{type(exc).__name__}: {exc}"
-                    conn.execute(
-                        """
-                        UPDATE reminder_sends
-                        SET status = 'error', error = ?
-                        WHERE event_id = ? AND offset_days = ? AND scheduled_for = ?
-                        """,
-                        (error_msg, row["event_id"], offset_days, scheduled_for),
-                    )
-                    errors.append(
-                        {
-                            "event_id": row["event_id"],
-                            "offset_days": offset_days,
-                            "scheduled_for": scheduled_for,
-                            "error": error_msg,
-                        }
-                    )
-
-    return {"sent": sent, "skipped": skipped, "errors": errors}
+    return _run_tracked_job(REMINDER_JOB_NAME, run)
 
 
 def _parse_email_list(values: List[str]) -> List[str]:
@@ -7199,23 +8201,34 @@ def _format_task_nudge_body(task: sqlite3.Row) -> str:
 def send_reminders(date_str: Optional[str] = None):
     if date_str:
         target_date = _normalize_date_string(date_str)
-        reference_date = date.fromisoformat(target_date)
-    else:
-        reference_date = date.today()
-    return _send_due_reminders(reference_date)
+        return _send_due_reminders(date.fromisoformat(target_date))
+    return _run_scheduled_job_now(REMINDER_JOB_NAME)
+
+
+PENDING_AGREEMENT_REMINDER_JOB_NAME = "pending_agreement_reminders"
 
 
 @app.post("/api/pending-agreement-reminders/send")
 def send_pending_agreement_reminders(date_str: Optional[str] = None):
     if date_str:
         target_date = _normalize_date_string(date_str)
-        reference_date = date.fromisoformat(target_date)
-    else:
-        reference_date = date.today()
+        return _send_pending_agreement_reminders(date.fromisoformat(target_date))
+    return _run_scheduled_job_now(PENDING_AGREEMENT_REMINDER_JOB_NAME)
 
-    sent = 0
+
+def _run_pending_agreement_reminder_job(reference_date: date) -> Dict[str, Any]:
+    return _run_tracked_job(
+        PENDING_AGREEMENT_REMINDER_JOB_NAME,
+        lambda _: {
+            **_send_pending_agreement_reminders(reference_date),
+            "through": reference_date.isoformat(),
+        },
+    )
+
+
+def _send_pending_agreement_reminders(reference_date: date) -> Dict[str, Any]:
+    queued = 0
     skipped = 0
-    errors: List[Dict[str, str]] = []
 
     with db() as conn:
         reminders = conn.execute(
@@ -7251,29 +8264,230 @@ def send_pending_agreement_reminders(date_str: Optional[str] = None):
 
             subject = _format_pending_agreement_subject(reminder["frequency"])
             body = _format_pending_agreement_body(reminder["message"], agreements)
-            try:
-                _send_email_with_log(
-                    recipients,
-                    subject,
-                    body,
-                    kind="pending_agreement_reminder",
-                    related_id=reminder["id"],
-                    metadata={
-                        "frequency": reminder["frequency"],
-                        "agreement_count": len(agreements),
-                        "reference_date": reference_date.isoformat(),
-                    },
-                )
-                sent += 1
-            except Exception as exc:
-                errors.append(
-                    {
-                        "reminder_id": reminder["id"],
-                        "error": f"{type(exc).__name__}: {exc}",
-                    }
-                )
+            _enqueue_notification(
+                conn,
+                recipients,
+                subject,
+                body,
+                kind="pending_agreement_reminder",
+                related_id=reminder["id"],
+                metadata={
+                    "frequency": reminder["frequency"],
+                    "agreement_count": len(agreements),
+                    "reference_date": reference_date.isoformat(),
+                },
+            )
+            queued += 1
+
+    return {"queued": queued, "skipped": skipped}
+
+
+# ----------------------------
+# Job scheduler
+# ----------------------------
+# Jobs the scheduler runs once per calendar day; each runner takes the reference date.
+SCHEDULED_JOBS: Dict[str, Callable[[date], Dict[str, Any]]] = {
+    REMINDER_JOB_NAME: _run_reminder_job,
+    PENDING_AGREEMENT_REMINDER_JOB_NAME: _run_pending_agreement_reminder_job,
+}
+_scheduler_stop = threading.Event()
+_scheduler_threads: List[threading.Thread] = []
+
+
+def _job_lease_expiry() -> str:
+    expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=JOB_LEASE_SECONDS)
+    return expires_at.isoformat() + "Z"
+
+
+def _acquire_job_lease(job_name: str, holder: str) -> bool:
+    with db() as conn:
+        # Taken only when free or expired; the upsert is atomic across workers. Each run
+        # passes its own holder, so a live lease is never re-entered, even in-process.
+        acquired = conn.execute(
+            """
+            INSERT INTO job_leases (job_name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(job_name) DO UPDATE
+              SET holder = excluded.holder, expires_at = excluded.expires_at
+              WHERE job_leases.expires_at <= ?
+            """,
+            (job_name, holder, _job_lease_expiry(), now_iso()),
+        ).rowcount
+    return acquired == 1
+
+
+def _renew_job_lease(job_name: str, holder: str) -> bool:
+    with db() as conn:
+        renewed = conn.execute(
+            "UPDATE job_leases SET expires_at = ? WHERE job_name = ? AND holder = ?",
+            (_job_lease_expiry(), job_name, holder),
+        ).rowcount
+    return renewed == 1
+
+
+def _job_lease_renewal_loop(job_name: str, holder: str, done: threading.Event) -> None:
+    # Keeps a run that outlasts JOB_LEASE_SECONDS from being taken over mid-run.
+    while not done.wait(JOB_LEASE_SECONDS / 3):
+        try:
+            if not _renew_job_lease(job_name, holder):
+                logger.warning(f"JOB LEASE LOST job={job_name} holder={holder}")
+                return
+        except sqlite3.Error:
+            logger.error(f"JOB LEASE RENEWAL FAILED job={job_name}\n{traceback.format_exc()}")
+
+
+def _release_job_lease(job_name: str, holder: str) -> None:
+    with db() as conn:
+        conn.execute(
+            "DELETE FROM job_leases WHERE job_name = ? AND holder = ?", (job_name, holder)
+        )
+
+
+def _run_scheduled_job(job_name: str, today: date) -> Dict[str, Any]:
+    """Run one scheduled job for ``today`` unless another worker holds its lease or a
+    run already covered the day. Shared by the scheduler and the manual send endpoints."""
+    holder = f"{WORKER_TOKEN}:{uuid.uuid4().hex[:8]}"
+    if not _acquire_job_lease(job_name, holder):
+        return {"status": "leased"}
+    done = threading.Event()
+    renewer = threading.Thread(
+        target=_job_lease_renewal_loop,
+        args=(job_name, holder, done),
+        name=f"job-lease-{job_name}",
+        daemon=True,
+    )
+    renewer.start()
+    try:
+        # Checked under the lease so a run finished by another worker is seen.
+        with db() as conn:
+            through = _last_job_detail(conn, job_name).get("through")
+        if through and through >= today.isoformat():
+            return {"status": "up_to_date", "through": through}
+        try:
+            result = SCHEDULED_JOBS[job_name](today)
+        except Exception as exc:
+            logger.error(f"SCHEDULED JOB FAILED job={job_name}\n{traceback.format_exc()}")
+            return {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        return {"status": "processed", **result}
+    finally:
+        done.set()
+        renewer.join(timeout=5)
+        _release_job_lease(job_name, holder)
+
+
+def _run_scheduled_jobs(today: Optional[date] = None) -> Dict[str, str]:
+    """Run every scheduled job not yet done for ``today``; returns an outcome per job."""
+    today = today or date.today()
+    return {
+        job_name: _run_scheduled_job(job_name, today)["status"] for job_name in SCHEDULED_JOBS
+    }
+
+
+def _run_scheduled_job_now(job_name: str) -> Dict[str, Any]:
+    outcome = _run_scheduled_job(job_name, date.today())
+    if outcome["status"] == "error":
+        raise HTTPException(status_code=500, detail=outcome["error"])
+    return outcome
+
+
+def _job_scheduler_loop() -> None:
+    while not _scheduler_stop.is_set():
+        try:
+            _run_scheduled_jobs()
+        except Exception:
+            logger.error(f"JOB SCHEDULER FAILED\n{traceback.format_exc()}")
+        _scheduler_stop.wait(JOB_SCHEDULER_INTERVAL_SECONDS)
+
 
-    return {"sent": sent, "skipped": skipped, "errors": errors}
+def _start_job_scheduler() -> None:
+    if _scheduler_threads or not JOB_SCHEDULER_ENABLED:
+        return
+    with db() as conn:
+        # Runs cut off by a restart would otherwise show as in progress forever.
+        conn.execute(
+            f"""
+            UPDATE job_runs SET status = 'error', finished_at = ?, detail = 'Interrupted'
+            WHERE status = 'processing'
+              AND job_name IN ({",".join("?" for _ in SCHEDULED_JOBS)})
+              AND NOT EXISTS (
+                SELECT 1 FROM job_leases l
+                WHERE l.job_name = job_runs.job_name AND l.expires_at > ?
+              )
+            """,
+            (now_iso(), *SCHEDULED_JOBS, now_iso()),
+        )
+    _scheduler_stop.clear()
+    thread = threading.Thread(target=_job_scheduler_loop, name="job-scheduler", daemon=True)
+    thread.start()
+    _scheduler_threads.append(thread)
+
+
+def _stop_job_scheduler() -> None:
+    _scheduler_stop.set()
+    for thread in _scheduler_threads:
+        thread.join(timeout=5)
+    _scheduler_threads.clear()
+
+
+@app.get("/api/jobs/status")
+def job_status(limit: int = 10, _: Dict[str, Any] = Depends(require_admin)):
+    limit = max(1, min(limit, 100))
+    job_names = list(SCHEDULED_JOBS)
+    placeholders = ",".join("?" for _ in job_names)
+    with db() as conn:
+        runs = conn.execute(
+            f"""
+            SELECT job_name, id, status, started_at, finished_at, detail,
+                   round((julianday(finished_at) - julianday(started_at)) * 86400, 3)
+                     AS duration_seconds
+            FROM (
+              SELECT *, ROW_NUMBER() OVER (PARTITION BY job_name ORDER BY id DESC) AS rn
+              FROM job_runs
+              WHERE job_name IN ({placeholders})
+            )
+            WHERE rn <= ?
+            ORDER BY job_name, id DESC
+            """,
+            (*job_names, limit),
+        ).fetchall()
+        leases = {
+            row["job_name"]: dict(row)
+            for row in conn.execute(
+                f"SELECT job_name, holder, expires_at FROM job_leases WHERE job_name IN ({placeholders})",
+                job_names,
+            )
+        }
+
+    jobs = []
+    for job_name in job_names:
+        recent = [dict(row) for row in runs if row["job_name"] == job_name]
+        for run in recent:
+            run.pop("job_name")
+            if run["status"] == "processed":
+                run["detail"] = safe_json_dict(run["detail"])
+        durations = [
+            run["duration_seconds"]
+            for run in recent
+            if run["status"] == "processed" and run["duration_seconds"] is not None
+        ]
+        last_success = next((run for run in recent if run["status"] == "processed"), None)
+        jobs.append(
+            {
+                "job_name": job_name,
+                "last_run": recent[0] if recent else None,
+                "last_success_at": last_success["finished_at"] if last_success else None,
+                "average_duration_seconds": (
+                    round(sum(durations) / len(durations), 3) if durations else None
+                ),
+                "recent_runs": recent,
+                "lease": leases.get(job_name),
+            }
+        )
+    return {
+        "scheduler_enabled": JOB_SCHEDULER_ENABLED,
+        "interval_seconds": JOB_SCHEDULER_INTERVAL_SECONDS,
+        "running": any(thread.is_alive() for thread in _scheduler_threads),
+        "jobs": jobs,
+    }
 
 
 @app.post("/api/pending-agreements/{agreement_id}/nudge")
@@ -7307,23 +8521,24 @@ def nudge_pending_agreement(
                 detail="Pending agreement owner email is missing",
             )
 
-    subject = f"Pending agreement nudge: {agreement['matter'] or agreement['title']}"
-    body = _format_pending_agreement_nudge_body(agreement)
-    _send_email_with_log(
-        [recipient],
-        subject,
-        body,
-        kind="pending_agreement_nudge",
-        related_id=agreement_id,
-        metadata={
-            "agreement_id": agreement_id,
-            "title": agreement["title"],
-            "matter": agreement["matter"] or agreement["title"],
-            "owner_email": recipient,
-            "contract_id": agreement["contract_id"],
-        },
-    )
-    return {"nudge": "sent", "agreement_id": agreement_id, "recipients": [recipient]}
+        subject = f"Pending agreement nudge: {agreement['matter'] or agreement['title']}"
+        body = _format_pending_agreement_nudge_body(agreement)
+        _enqueue_notification(
+            conn,
+            [recipient],
+            subject,
+            body,
+            kind="pending_agreement_nudge",
+            related_id=agreement_id,
+            metadata={
+                "agreement_id": agreement_id,
+                "title": agreement["title"],
+                "matter": agreement["matter"] or agreement["title"],
+                "owner_email": recipient,
+                "contract_id": agreement["contract_id"],
+            },
+        )
+    return {"nudge": "queued", "agreement_id": agreement_id, "recipients": [recipient]}
 
 
 @app.post("/api/pending-agreements/{agreement_id}/action")
@@ -7375,24 +8590,25 @@ def action_pending_agreement(
                 detail="Pending agreement owner email is missing",
             )
 
-    subject = f"Pending agreement {action}: {agreement['matter'] or agreement['title']}"
-    updated_agreement = dict(agreement)
-    updated_agreement["status"] = action_label
-    body = _format_pending_agreement_action_body(updated_agreement, action_label)
-    _send_email_with_log(
-        [recipient],
-        subject,
-        body,
-        kind="pending_agreement_action",
-        related_id=agreement_id,
-        metadata={
-            "agreement_id": agreement_id,
-            "action": action,
-            "status": action_label,
-            "owner_email": recipient,
-            "contract_id": agreement["contract_id"],
-        },
-    )
+        subject = f"Pending agreement {action}: {agreement['matter'] or agreement['title']}"
+        updated_agreement = dict(agreement)
+        updated_agreement["status"] = action_label
+        body = _format_pending_agreement_action_body(updated_agreement, action_label)
+        _enqueue_notification(
+            conn,
+            [recipient],
+            subject,
+            body,
+            kind="pending_agreement_action",
+            related_id=agreement_id,
+            metadata={
+                "agreement_id": agreement_id,
+                "action": action,
+                "status": action_label,
+                "owner_email": recipient,
+                "contract_id": agreement["contract_id"],
+            },
+        )
 
     response = dict(agreement)
     response["status"] = action_label
@@ -7414,25 +8630,26 @@ def nudge_task(task_id: str, user: Optional[Dict[str, Any]] = Depends(require_us
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
-    assignees = _parse_email_list(safe_json_list(task["assignees_json"]))
-    if not assignees:
-        raise HTTPException(status_code=400, detail="Task has no assignees to nudge")
+        assignees = _parse_email_list(safe_json_list(task["assignees_json"]))
+        if not assignees:
+            raise HTTPException(status_code=400, detail="Task has no assignees to nudge")
 
-    subject = f"Task nudge: {task['title']}"
-    body = _format_task_nudge_body(task)
-    _send_email_with_log(
-        assignees,
-        subject,
-        body,
-        kind="task_nudge",
-        related_id=task_id,
-        metadata={
-            "task_id": task_id,
-            "title": task["title"],
-            "due_date": task["due_date"],
-        },
-    )
-    return {"nudge": "sent", "task_id": task_id, "recipients": assignees}
+        subject = f"Task nudge: {task['title']}"
+        body = _format_task_nudge_body(task)
+        _enqueue_notification(
+            conn,
+            assignees,
+            subject,
+            body,
+            kind="task_nudge",
+            related_id=task_id,
+            metadata={
+                "task_id": task_id,
+                "title": task["title"],
+                "due_date": task["due_date"],
+            },
+        )
+    return {"nudge": "queued", "task_id": task_id, "recipients": assignees}
 
 # ----------------------------
 # In-app bell notifications
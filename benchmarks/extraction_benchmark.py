@@ -0,0 +1,80 @@
+"""Micro-benchmark for processor term extraction.
+
+Compares per-contract extraction time with every date going through
+dateutil's fuzzy parser (the previous behaviour) against the numeric fast
+path plus memoized _parse_date.
+
+    python benchmarks/extraction_benchmark.py [--pages 40] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import processor  # noqa: E402
+
+PAGE_TEMPLATE = """MASTER SERVICES AGREEMENT - PAGE {page}
+This Agreement is made and entered into as of the {day}th day of March {year} by and between Acme Corp. and Vendor LLC.
+The Effective Date of this Agreement is {month:02d}/{day:02d}/{year}.
+The initial term of this Agreement is three (3) years, and each renewal term shall be twelve (12) months.
+This Agreement shall automatically renew unless either party provides written notice at least 60 days prior to renewal.
+Either party may terminate this Agreement upon 30 days written notice of termination to the other party.
+Renewal Date: {renewal_year}-{month:02d}-{day:02d}. Termination date: {month:02d}-{day:02d}-{renewal_year}.
+Invoices are payable within thirty days; see Exhibit A dated {month:02d}/01/{year} and Schedule B dated January {day}, {year}.
+This Agreement shall be governed by the laws of the State of Delaware without regard to conflicts of law.
+"""
+
+
+def build_contract(pages: int) -> str:
+    return "\n".join(
+        PAGE_TEMPLATE.format(
+            page=page,
+            day=page % 27 + 1,
+            month=page % 12 + 1,
+            year=2015 + page % 10,
+            renewal_year=2025 + page % 5,
+        )
+        for page in range(1, pages + 1)
+    )
+
+
+def time_extraction(text: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        cache_clear = getattr(processor._parse_date, "cache_clear", None)
+        if cache_clear:
+            cache_clear()
+        start = time.perf_counter()
+        processor._extract_terms(text)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_contract(args.pages)
+    cached_parse = processor._parse_date
+
+    processor._parse_date = processor._parse_date_fuzzy
+    try:
+        before = time_extraction(text, args.runs)
+    finally:
+        processor._parse_date = cached_parse
+
+    after = time_extraction(text, args.runs)
+
+    print(f"contract: {args.pages} pages, {len(text)} chars, median of {args.runs} runs")
+    print(f"dateutil only:          {before * 1000:8.1f} ms")
+    print(f"fast path + memo cache: {after * 1000:8.1f} ms ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Query-count benchmark for the contract list and calendar endpoints.
+
+Seeds a throwaway database with contracts that each carry tags and events,
+then reports how many SELECT statements and how long one request to
+/api/contracts and /api/calendar/events takes as the page grows. With the
+batched tag loader the statement count stays flat instead of growing by one
+query per row.
+
+    python benchmarks/list_queries_benchmark.py [--sizes 10,50,200] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TAGS_PER_CONTRACT = 3
+EVENTS_PER_CONTRACT = 2
+
+
+def seed(app_module, contracts: int) -> None:
+    now = app_module.now_iso()
+    with app_module.db() as conn:
+        conn.execute("DELETE FROM contracts")
+        conn.execute("DELETE FROM tags")
+        tag_ids = [
+            conn.execute(
+                "INSERT INTO tags (name, color, created_at) VALUES (?, '#3b82f6', ?)",
+                (f"tag-{i}", now),
+            ).lastrowid
+            for i in range(TAGS_PER_CONTRACT * 2)
+        ]
+        for i in range(contracts):
+            contract_id = uuid.uuid4().hex
+            conn.execute(
+                """
+                INSERT INTO contracts
+                  (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                VALUES (?, ?, 'contract.pdf', ?, 'contract.pdf', 'application/pdf', ?, 'processed')
+                """,
+                (contract_id, f"Contract {i}", contract_id, now),
+            )
+            conn.executemany(
+                "INSERT INTO contract_tags (contract_id, tag_id, auto_generated, created_at) VALUES (?, ?, 0, ?)",
+                [
+                    (contract_id, tag_ids[(i + offset) % len(tag_ids)], now)
+                    for offset in range(TAGS_PER_CONTRACT)
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO events (id, contract_id, event_type, event_date, derived_from_term_key, created_at) VALUES (?, ?, 'renewal', ?, 'renewal_date', ?)",
+                [
+                    (uuid.uuid4().hex, contract_id, f"2026-{month:02d}-15", now)
+                    for month in range(1, EVENTS_PER_CONTRACT + 1)
+                ],
+            )
+
+
+def measure(app_module, client, url: str, runs: int):
+    statements = []
+
+    def counting_db():
+        conn = original_db()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    original_db = app_module.db
+    app_module.db = counting_db
+    try:
+        samples = []
+        for _ in range(runs):
+            statements.clear()
+            start = time.perf_counter()
+            res = client.get(url)
+            samples.append(time.perf_counter() - start)
+            assert res.status_code == 200, res.text
+        selects = [
+            sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        ]
+        return len(selects), statistics.median(samples)
+    finally:
+        app_module.db = original_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,50,200")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["CONTRACT_DB"] = os.path.join(temp_dir.name, "bench.db")
+    os.environ["CONTRACT_DATA"] = os.path.join(temp_dir.name, "data")
+    os.environ["AUTH_REQUIRED"] = "false"
+
+    import app as app_module
+    from fastapi.testclient import TestClient
+
+    app_module.init_db()
+    client = TestClient(app_module.app)
+
+    print(f"{TAGS_PER_CONTRACT} tags and {EVENTS_PER_CONTRACT} events per contract, median of {args.runs} runs")
+    print(f"{'rows':>6} | {'endpoint':<22} | {'SELECTs':>7} | {'ms':>8}")
+    for size in [int(value) for value in args.sizes.split(",")]:
+        seed(app_module, size)
+        for label, url in (
+            ("/api/contracts", f"/api/contracts?limit={size}"),
+            ("/api/calendar/events", "/api/calendar/events?start=2026-01-01&end=2026-12-31"),
+        ):
+            queries, elapsed = measure(app_module, client, url, args.runs)
+            print(f"{size:>6} | {label:<22} | {queries:>7} | {elapsed * 1000:8.1f}")
+
+    app_module.close_pools()
+    temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Shared SQLite connection pool used by the API (app.db) and the OCR processor (processor._db)."""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+# WAL lets readers keep working while an OCR job writes; NORMAL is durable enough under WAL.
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", "20000"))
+SQLITE_MMAP_SIZE_MB = int(os.environ.get("SQLITE_MMAP_SIZE_MB", "256"))
+# Idle connections kept per database; extra connections are closed when released.
+SQLITE_POOL_SIZE = max(1, int(os.environ.get("SQLITE_POOL_SIZE", "8")))
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection that goes back to its pool at the end of a ``with`` block.
+
+    ``with db() as conn:`` keeps its usual meaning (commit on success, rollback on
+    error); the only difference is the connection is reused instead of leaked.
+    """
+
+    pool: Optional["ConnectionPool"] = None
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return super().__exit__(exc_type, exc, tb)
+        finally:
+            if self.pool is not None:
+                self.pool.release(self)
+
+
+class ConnectionPool:
+    def __init__(self, db_path: str, size: int = SQLITE_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._journal_mode_set = False
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.pool = self
+        if not self._journal_mode_set:
+            # journal_mode is persistent in the database file; set it once per pool.
+            conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE};")
+            self._journal_mode_set = True
+        conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS};")
+        conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS};")
+        conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB};")
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE_MB * 1024 * 1024};")
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Check out a pooled connection; use it as ``with connect(path) as conn:``."""
+    return get_pool(db_path).acquire()
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,115 @@
+"""SMTP delivery for notification email: reusable sessions and batched sends."""
+
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import List, Optional, Sequence
+
+
+class SmtpSettings:
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        use_ssl: bool = False,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+
+
+class SmtpSession:
+    """One SMTP connection reused for many messages.
+
+    The connection (and STARTTLS/login) is opened on the first send; if the
+    server drops an idle session it is reopened once before giving up.
+    """
+
+    def __init__(self, settings: SmtpSettings):
+        self.settings = settings
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        settings = self.settings
+        if settings.use_ssl:
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(
+                settings.host, settings.port, timeout=settings.timeout
+            )
+        else:
+            smtp = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+            if settings.use_tls:
+                smtp.starttls()
+        if settings.username and settings.password:
+            smtp.login(settings.username, settings.password)
+        return smtp
+
+    def send(self, message: EmailMessage) -> None:
+        if self._smtp is None:
+            self._smtp = self._connect()
+            self._smtp.send_message(message)
+            return
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._smtp = self._connect()
+            self._smtp.send_message(message)
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def send_batch(
+    settings: SmtpSettings,
+    messages: Sequence[EmailMessage],
+    max_connections: int = 4,
+) -> List[Optional[Exception]]:
+    """Send ``messages`` over at most ``max_connections`` reused sessions.
+
+    Returns one entry per message, in order: ``None`` when it was accepted,
+    otherwise the exception that stopped it. A failed message does not stop
+    the rest of the batch.
+    """
+    results: List[Optional[Exception]] = [None] * len(messages)
+    if not messages:
+        return results
+    workers = max(1, min(max_connections, len(messages)))
+
+    def deliver(indexes: List[int]) -> None:
+        with SmtpSession(settings) as session:
+            for index in indexes:
+                try:
+                    session.send(messages[index])
+                except Exception as exc:
+                    results[index] = exc
+                    # Refused recipients leave the session usable; a dropped or
+                    # broken connection is reopened for the next message.
+                    if isinstance(exc, smtplib.SMTPServerDisconnected) or not isinstance(
+                        exc, smtplib.SMTPException
+                    ):
+                        session.close()
+
+    shards = [list(range(start, len(messages), workers)) for start in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp") as pool:
+        list(pool.map(deliver, shards))
+    return results
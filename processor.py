@@ -1,16 +1,26 @@
 import os
 import re
+import uuid
+import io
+import hashlib
 import sqlite3
 import logging
 import subprocess
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Deque, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
 
 from PIL import Image
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import pdfinfo_from_path
 from dateutil import parser as dtparser
 
+import db_pool
+
 logger = logging.getLogger("contractocr")
 
 KEYWORDS = {
@@ -90,141 +100,219 @@ WORD_NUMBER_MAP = {
     "hundred": 100,
 }
 
+# Compiled once at import; nothing below passes raw pattern strings to re.
+DATE_REGEXES = [re.compile(p, re.IGNORECASE) for p in DATE_PATTERNS]
+# One alternation over every date pattern: a chunk with no match here has no dates at all.
+ANY_DATE_REGEX = re.compile("|".join(f"(?:{p})" for p in DATE_PATTERNS), re.IGNORECASE)
+DAYS_REGEX = re.compile(DAYS_PATTERN, re.IGNORECASE)
+TERM_LENGTH_REGEX = re.compile(TERM_LENGTH_PATTERN, re.IGNORECASE)
+DAY_OF_MONTH_YEAR_REGEX = re.compile(DAY_OF_MONTH_YEAR_PATTERN, re.IGNORECASE)
+DAY_NUMBER_REGEX = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\b")
+WHITESPACE_REGEX = re.compile(r"\s+")
+CHUNK_SPLIT_REGEX = re.compile(r"[\r\n]+|(?<=[.])\s+")
+# Exact forms of the first two DATE_PATTERNS, parsed without dateutil.
+NUMERIC_DATE_REGEX = re.compile(r"(\d{1,2})([/-])(\d{1,2})\2(\d{2}|\d{4})")
+ISO_DATE_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+PARSE_DATE_CACHE_SIZE = 4096
+
+# Pages whose embedded text has fewer words than this are OCR'd. Scanned pages often
+# carry a one-line overlay (a DocuSign envelope ID, a Bates number) that is not the
+# page's content, so a handful of words is not enough to skip Tesseract.
+MIN_TEXT_LAYER_WORDS = 20
+TEXT_LAYER_WORD_REGEX = re.compile(r"[^\W\d_]{2,}")
+# Rasterized pages held per contract while OCR runs, regardless of OCR_PAGE_WORKERS.
+OCR_MAX_PAGES_IN_FLIGHT = 8
+# Upper bound on one pdftotext/pdftoppm call, so a malformed PDF cannot hang a worker.
+POPPLER_TIMEOUT_SECONDS = 120
+
 def now_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 def _normalize_ws(s: str) -> str:
-    return re.sub(r"\s+", " ", s or "").strip()
+    return WHITESPACE_REGEX.sub(" ", s or "").strip()
+
+def _iter_chunks(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (normalized chunk, start, end); offsets are raw positions in ``text``."""
+    text = text or ""
+    pos = 0
+    for sep in CHUNK_SPLIT_REGEX.finditer(text):
+        part = text[pos:sep.start()]
+        chunk = _normalize_ws(part)
+        if chunk:
+            yield chunk, pos + len(part) - len(part.lstrip()), pos + len(part.rstrip())
+        pos = sep.end()
+    part = text[pos:]
+    chunk = _normalize_ws(part)
+    if chunk:
+        yield chunk, pos + len(part) - len(part.lstrip()), pos + len(part.rstrip())
 
 def _split_chunks(text: str) -> List[str]:
-    parts = re.split(r"[\r\n]+|(?<=[.])\s+", text or "")
-    return [_normalize_ws(p) for p in parts if _normalize_ws(p)]
+    return [chunk for chunk, _, _ in _iter_chunks(text)]
+
+def _build_page_index(page_texts: List[str]) -> List[int]:
+    """Start offset of each page within the newline-joined document text."""
+    starts: List[int] = []
+    pos = 0
+    for text in page_texts:
+        starts.append(pos)
+        pos += len(text) + 1
+    return starts
+
+def _locate(page_starts: List[int], start: int, end: int) -> Tuple[int, Tuple[int, int]]:
+    """Map a document span to (1-based page number, span within that page)."""
+    idx = bisect_right(page_starts, start) - 1
+    base = page_starts[idx]
+    return idx + 1, (start - base, end - base)
+
+def _two_digit_year(yy: int) -> int:
+    # Same sliding window dateutil uses: within 50 years of the current year.
+    this_year = date.today().year
+    year = yy + this_year // 100 * 100
+    if year >= this_year + 50:
+        year -= 100
+    elif year < this_year - 50:
+        year += 100
+    return year
+
+def _parse_numeric_date(s: str) -> Optional[str]:
+    """Parse ISO and month/day/year forms directly; None means "ask dateutil"."""
+    try:
+        if ISO_DATE_REGEX.fullmatch(s):
+            return date.fromisoformat(s).isoformat()
+        m = NUMERIC_DATE_REGEX.fullmatch(s)
+        if not m:
+            return None
+        month, day, year_raw = int(m.group(1)), int(m.group(3)), m.group(4)
+        if month > 12:
+            # Day-first and other ambiguous orderings follow dateutil's rules.
+            return None
+        year = int(year_raw) if len(year_raw) == 4 else _two_digit_year(int(year_raw))
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
 
-def _parse_date(s: str) -> Optional[str]:
+def _parse_date_fuzzy(s: str) -> Optional[str]:
     try:
         dt = dtparser.parse(s, fuzzy=True)
         return dt.date().isoformat()
     except Exception:
         return None
 
+@lru_cache(maxsize=PARSE_DATE_CACHE_SIZE)
+def _parse_date(s: str) -> Optional[str]:
+    return _parse_numeric_date(s) or _parse_date_fuzzy(s)
+
 def _compute_opt_out_date(renewal_iso: str, opt_out_days: int) -> str:
     d = date.fromisoformat(renewal_iso) - timedelta(days=opt_out_days)
     return d.isoformat()
 
 def _db(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
-
-def _find_best_date_near(text: str, keywords: List[str]) -> Tuple[Optional[str], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    best: Optional[Tuple[str, float, str, Optional[int]]] = None
-    for ch in chunks:
-        lc = ch.lower()
-        if any(k in lc for k in keywords):
-            raw_dates: List[str] = []
-            for pat in DATE_PATTERNS:
-                raw_dates.extend(re.findall(pat, ch, flags=re.IGNORECASE))
-            for raw in raw_dates:
-                iso = _parse_date(raw)
-                if iso:
-                    conf = 0.80
-                    if any(k in lc for k in ["renewal date", "effective date", "termination date"]):
-                        conf += 0.10
-                    conf = min(conf, 0.95)
-                    cand = (iso, conf, ch[:350], None)
-                    best = cand if best is None else (cand if cand[1] > best[1] else best)
-    if best:
-        return best
-    return None, 0.0, None, None
-
-def _find_opt_out_days(text: str) -> Tuple[Optional[int], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    best: Optional[Tuple[int, float, str, Optional[int]]] = None
-    for ch in chunks:
-        lc = ch.lower()
-        if any(k in lc for k in KEYWORDS["auto_renew_opt_out_days"]):
-            m = re.search(DAYS_PATTERN, ch, flags=re.IGNORECASE)
-            if m:
-                days = int(m.group(1))
-                conf = 0.75
-                if "renew" in lc:
-                    conf += 0.10
-                conf = min(conf, 0.90)
-                cand = (days, conf, ch[:350], None)
-                best = cand if best is None else (cand if cand[1] > best[1] else best)
-    if best:
-        return best
-    return None, 0.0, None, None
-
-def _find_termination_notice_days(text: str) -> Tuple[Optional[int], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    best: Optional[Tuple[int, float, str, Optional[int]]] = None
-    for ch in chunks:
-        lc = ch.lower()
-        if "notice" in lc and any(k in lc for k in ["terminate", "termination"]):
-            m = re.search(DAYS_PATTERN, ch, flags=re.IGNORECASE)
-            if m:
-                days = int(m.group(1))
-                conf = 0.78
-                if "written notice" in lc:
-                    conf += 0.08
-                conf = min(conf, 0.90)
-                cand = (days, conf, ch[:350], None)
-                best = cand if best is None else (cand if cand[1] > best[1] else best)
-    if best:
-        return best
-    return None, 0.0, None, None
-
-def _find_agreement_date(text: str) -> Tuple[Optional[str], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    best: Optional[Tuple[str, float, str, Optional[int]]] = None
-    prev_chunk: Optional[str] = None
-    for ch in chunks:
-        lc = ch.lower()
-        if (
-            "made and entered into" in lc
-            or "entered into" in lc
-            or "day of" in lc
-            or "agreement date" in lc
-            or "date of this agreement" in lc
-            or "date of agreement" in lc
-        ):
-            raw_dates: List[str] = []
-            for pat in DATE_PATTERNS:
-                raw_dates.extend(re.findall(pat, ch, flags=re.IGNORECASE))
-            if not raw_dates and "day of" in lc:
-                month_year = re.search(DAY_OF_MONTH_YEAR_PATTERN, ch, flags=re.IGNORECASE)
-                if month_year:
-                    day_match = re.search(r"\b(\d{1,2})(?:st|nd|rd|th)?\b", ch)
-                    if not day_match and prev_chunk:
-                        day_match = re.search(r"\b(\d{1,2})(?:st|nd|rd|th)?\b", prev_chunk)
-                    if day_match:
-                        raw_dates.append(f"{day_match.group(1)} {month_year.group(0)}")
-            for raw in raw_dates:
-                iso = _parse_date(raw)
-                if iso:
-                    conf = 0.86
-                    if "made and entered into" in lc:
-                        conf += 0.06
-                    conf = min(conf, 0.95)
-                    cand = (iso, conf, ch[:350], None)
-                    best = cand if best is None else (cand if cand[1] > best[1] else best)
-        prev_chunk = ch
-    if best:
-        return best
-    return None, 0.0, None, None
-
-def _find_governing_law(text: str) -> Tuple[Optional[str], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    for ch in chunks:
-        lc = ch.lower()
-        if "governed by the laws of" in lc:
-            idx = lc.find("governed by the laws of")
-            tail = ch[idx:]
-            return tail[:200], 0.70, ch[:350], None
-    return None, 0.0, None, None
+    return db_pool.connect(db_path)
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher that reports which keywords occur anywhere in a text.
+
+    Equivalent to ``{k for k in keywords if k in text}`` but scans the text once
+    regardless of how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[frozenset] = [frozenset()]
+        outputs: List[Set[str]] = [set()]
+        for keyword in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            outputs[state].add(keyword)
+
+        queue: Deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        self._out = [frozenset(o) for o in outputs]
+
+    def find(self, text: str) -> Set[str]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+DATE_CONFIDENCE_KEYWORDS = ["renewal date", "effective date", "termination date"]
+AGREEMENT_DATE_KEYWORDS = [
+    "made and entered into",
+    "entered into",
+    "day of",
+    "agreement date",
+    "date of this agreement",
+    "date of agreement",
+]
+GOVERNING_LAW_PHRASE = "governed by the laws of"
+
+_EXTRACTION_AUTOMATON = KeywordAutomaton(
+    set(KEYWORDS["effective_date"])
+    | set(KEYWORDS["renewal_date"])
+    | set(KEYWORDS["termination_date"])
+    | set(KEYWORDS["auto_renew_opt_out_days"])
+    | set(KEYWORDS["term_length"])
+    | set(DATE_CONFIDENCE_KEYWORDS)
+    | set(AGREEMENT_DATE_KEYWORDS)
+    | {"renew", "notice", "written notice", "terminate", "termination", "initial term", "renewal term", GOVERNING_LAW_PHRASE}
+)
+_EFFECTIVE_KEYWORDS = frozenset(KEYWORDS["effective_date"])
+_RENEWAL_KEYWORDS = frozenset(KEYWORDS["renewal_date"])
+_TERMINATION_KEYWORDS = frozenset(KEYWORDS["termination_date"])
+_OPT_OUT_KEYWORDS = frozenset(KEYWORDS["auto_renew_opt_out_days"])
+_TERM_LENGTH_KEYWORDS = frozenset(KEYWORDS["term_length"])
+_DATE_CONFIDENCE_KEYWORDS = frozenset(DATE_CONFIDENCE_KEYWORDS)
+_AGREEMENT_DATE_KEYWORDS = frozenset(AGREEMENT_DATE_KEYWORDS)
+
+# (value, confidence, snippet, source page, (start, end) offsets within that page)
+Extraction = Tuple[Any, float, Optional[str], Optional[int], Optional[Tuple[int, int]]]
+EXTRACTED_TERM_KEYS = [
+    "effective_date",
+    "renewal_date",
+    "termination_date",
+    "agreement_date",
+    "auto_renew_opt_out_days",
+    "termination_notice_days",
+    "governing_law",
+    "term_length",
+]
+
+def _find_raw_dates(ch: str) -> List[str]:
+    if not ANY_DATE_REGEX.search(ch):
+        return []
+    # Per-pattern order (not position order) decides which date wins a tie.
+    raw_dates: List[str] = []
+    for rx in DATE_REGEXES:
+        raw_dates.extend(rx.findall(ch))
+    return raw_dates
 
 def _parse_term_length_match(match: re.Match) -> Optional[str]:
     digit = match.group(1)
@@ -248,27 +336,117 @@ def _parse_term_length_match(match: re.Match) -> Optional[str]:
     unit_label = unit_norm if count == 1 else f"{unit_norm}s"
     return f"{count} {unit_label}"
 
-def _find_term_length(text: str) -> Tuple[Optional[str], float, Optional[str], Optional[int]]:
-    chunks = _split_chunks(text)
-    best: Optional[Tuple[str, float, str, Optional[int]]] = None
-    for ch in chunks:
+def _extract_terms(text: str, page_starts: Optional[List[int]] = None) -> Dict[str, Extraction]:
+    """Run every term extractor over ``text`` in one pass.
+
+    The text is chunked and lowercased once, keywords are matched with a single
+    automaton and each chunk's dates are found and parsed once, then offered to
+    every extractor whose keywords hit. For each term the highest-confidence
+    candidate wins, ties going to the earliest one.
+
+    ``page_starts`` (see _build_page_index) maps the winning chunk's offsets back
+    to its page; without it source page and offsets are None.
+    """
+    best: Dict[str, Optional[Extraction]] = {key: None for key in EXTRACTED_TERM_KEYS}
+    span: Tuple[int, int] = (0, 0)
+
+    def offer(key: str, value: Any, conf: float, ch: str) -> None:
+        current = best[key]
+        if current is None or conf > current[1]:
+            page, offsets = _locate(page_starts, *span) if page_starts else (None, None)
+            best[key] = (value, conf, ch[:350], page, offsets)
+
+    prev_chunk: Optional[str] = None
+    for ch, start, end in _iter_chunks(text):
+        span = (start, end)
         lc = ch.lower()
-        if any(k in lc for k in KEYWORDS["term_length"]):
-            for match in re.finditer(TERM_LENGTH_PATTERN, ch, flags=re.IGNORECASE):
-                normalized = _parse_term_length_match(match)
-                if not normalized:
-                    continue
-                conf = 0.70
-                if "initial term" in lc:
+        hits = _EXTRACTION_AUTOMATON.find(lc)
+        if not hits:
+            prev_chunk = ch
+            continue
+
+        date_keys = [
+            key
+            for key, keywords in (
+                ("effective_date", _EFFECTIVE_KEYWORDS),
+                ("renewal_date", _RENEWAL_KEYWORDS),
+                ("termination_date", _TERMINATION_KEYWORDS),
+            )
+            if hits & keywords
+        ]
+        wants_agreement_date = bool(hits & _AGREEMENT_DATE_KEYWORDS)
+        if date_keys or wants_agreement_date:
+            raw_dates = _find_raw_dates(ch)
+
+            if date_keys:
+                conf = 0.80
+                if hits & _DATE_CONFIDENCE_KEYWORDS:
+                    conf += 0.10
+                conf = min(conf, 0.95)
+                for raw in raw_dates:
+                    iso = _parse_date(raw)
+                    if iso:
+                        for key in date_keys:
+                            offer(key, iso, conf, ch)
+
+            if wants_agreement_date:
+                agreement_dates = raw_dates
+                if not raw_dates and "day of" in hits:
+                    agreement_dates = []
+                    month_year = DAY_OF_MONTH_YEAR_REGEX.search(ch)
+                    if month_year:
+                        day_match = DAY_NUMBER_REGEX.search(ch)
+                        if not day_match and prev_chunk:
+                            day_match = DAY_NUMBER_REGEX.search(prev_chunk)
+                        if day_match:
+                            agreement_dates = [f"{day_match.group(1)} {month_year.group(0)}"]
+                conf = 0.86
+                if "made and entered into" in hits:
+                    conf += 0.06
+                conf = min(conf, 0.95)
+                for raw in agreement_dates:
+                    iso = _parse_date(raw)
+                    if iso:
+                        offer("agreement_date", iso, conf, ch)
+
+        if hits & _OPT_OUT_KEYWORDS:
+            m = DAYS_REGEX.search(ch)
+            if m:
+                conf = 0.75
+                if "renew" in hits:
                     conf += 0.10
-                if "renewal term" in lc:
-                    conf += 0.05
-                conf = min(conf, 0.90)
-                cand = (normalized, conf, ch[:350], None)
-                best = cand if best is None else (cand if cand[1] > best[1] else best)
-    if best:
-        return best
-    return None, 0.0, None, None
+                offer("auto_renew_opt_out_days", int(m.group(1)), min(conf, 0.90), ch)
+
+        if "notice" in hits and ("terminate" in hits or "termination" in hits):
+            m = DAYS_REGEX.search(ch)
+            if m:
+                conf = 0.78
+                if "written notice" in hits:
+                    conf += 0.08
+                offer("termination_notice_days", int(m.group(1)), min(conf, 0.90), ch)
+
+        if GOVERNING_LAW_PHRASE in hits and best["governing_law"] is None:
+            idx = lc.find(GOVERNING_LAW_PHRASE)
+            offer("governing_law", ch[idx:][:200], 0.70, ch)
+
+        if hits & _TERM_LENGTH_KEYWORDS:
+            conf = 0.70
+            if "initial term" in hits:
+                conf += 0.10
+            if "renewal term" in hits:
+                conf += 0.05
+            conf = min(conf, 0.90)
+            for match in TERM_LENGTH_REGEX.finditer(ch):
+                normalized = _parse_term_length_match(match)
+                if normalized:
+                    offer("term_length", normalized, conf, ch)
+
+        prev_chunk = ch
+
+    return {
+        key: (found if found is not None else (None, 0.0, None, None, None))
+        for key, found in best.items()
+    }
 
 def _set_contract_status(conn: sqlite3.Connection, contract_id: str, status: str) -> None:
     conn.execute("UPDATE contracts SET status = ? WHERE id = ?", (status, contract_id))
@@ -281,29 +459,26 @@ def _clear_previous_processing(conn: sqlite3.Connection, contract_id: str) -> No
     conn.execute("DELETE FROM term_instances WHERE contract_id = ?", (contract_id,))
     conn.execute("DELETE FROM events WHERE contract_id = ?", (contract_id,))
 
-def _insert_ocr_page(conn: sqlite3.Connection, contract_id: str, page_number: int, text: str) -> None:
-    conn.execute(
-        "INSERT INTO ocr_pages (contract_id, page_number, text, created_at) VALUES (?, ?, ?, ?)",
-        (contract_id, page_number, text, now_iso()),
+def _insert_ocr_pages(conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+    conn.executemany(
+        "INSERT INTO ocr_pages (contract_id, page_number, text, source, created_at) VALUES (?, ?, ?, ?, ?)",
+        rows,
     )
 
-def _insert_term(conn: sqlite3.Connection, contract_id: str, term_key: str,
-                 value_raw: Optional[str], value_norm: Optional[str],
-                 confidence: float, status: str,
-                 source_page: Optional[int], source_snippet: Optional[str]) -> None:
-    conn.execute(
+def _insert_terms(conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+    conn.executemany(
         """INSERT INTO term_instances
-           (contract_id, term_key, value_raw, value_normalized, confidence, status, source_page, source_snippet, updated_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (contract_id, term_key, value_raw, value_norm, float(confidence), status, source_page, source_snippet, now_iso()),
+           (contract_id, term_key, value_raw, value_normalized, confidence, status, source_page, source_snippet,
+            source_start, source_end, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
     )
 
-def _insert_event(conn: sqlite3.Connection, contract_id: str, event_type: str, event_date_iso: str, derived_from_term_key: str) -> None:
-    import uuid
-    conn.execute(
+def _insert_events(conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+    conn.executemany(
         """INSERT INTO events (id, contract_id, event_type, event_date, derived_from_term_key, created_at)
            VALUES (?, ?, ?, ?, ?, ?)""",
-        (str(uuid.uuid4()), contract_id, event_type, event_date_iso, derived_from_term_key, now_iso()),
+        rows,
     )
 
 def _upsert_fts(conn: sqlite3.Connection, contract_id: str, ocr_text_all: str) -> None:
@@ -330,6 +505,257 @@ def _test_poppler(poppler_path: Optional[str]) -> None:
     # run a lightweight help call
     subprocess.run([pdfinfo, "-h"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
 
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_key: Optional[Tuple[int, str]] = None
+_ocr_pool_lock = threading.Lock()
+
+def _init_ocr_worker(tesseract_cmd: str) -> None:
+    # Pages already run in parallel; keep each tesseract process single-threaded.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+def _ocr_image(img: Image.Image, lang: str = "eng") -> str:
+    return pytesseract.image_to_string(img, lang=lang) or ""
+
+def _ocr_raw_image(mode: str, size: Tuple[int, int], data: bytes, lang: str = "eng") -> str:
+    img = Image.frombytes(mode, size, data)
+    try:
+        return _ocr_image(img, lang)
+    finally:
+        img.close()
+
+def _get_ocr_pool(workers: int, tesseract_cmd: str) -> ProcessPoolExecutor:
+    global _ocr_pool, _ocr_pool_key
+    with _ocr_pool_lock:
+        if _ocr_pool is None or _ocr_pool_key != (workers, tesseract_cmd):
+            if _ocr_pool is not None:
+                _ocr_pool.shutdown(wait=False)
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_ocr_worker,
+                initargs=(tesseract_cmd,),
+            )
+            _ocr_pool_key = (workers, tesseract_cmd)
+        return _ocr_pool
+
+def shutdown_ocr_pool() -> None:
+    global _ocr_pool, _ocr_pool_key
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=True, cancel_futures=True)
+        _ocr_pool = None
+        _ocr_pool_key = None
+
+def _ocr_pages(images: Iterable[Image.Image], tesseract_cmd: str, workers: int, lang: str = "eng") -> Iterator[str]:
+    """Yield OCR text for each image in input order.
+
+    With more than one worker, pages are fanned out to a shared process pool with
+    at most ``OCR_MAX_PAGES_IN_FLIGHT`` pages in flight, so the caller can keep
+    writing results in page order while later pages are still being recognized.
+    Each page is submitted as raw pixel bytes so the image can be closed at once;
+    the pool pickles arguments lazily and would otherwise need the image kept open.
+    """
+    if workers <= 1:
+        for img in images:
+            text = _ocr_image(img, lang)
+            img.close()
+            yield text
+        return
+
+    window = min(workers * 2, OCR_MAX_PAGES_IN_FLIGHT)
+    pool = _get_ocr_pool(min(workers, window), tesseract_cmd)
+    pending: Deque[Future] = deque()
+    for img in images:
+        if img.mode not in ("1", "L", "RGB"):
+            converted = img.convert("RGB")
+            img.close()
+            img = converted
+        mode, size, data = img.mode, img.size, img.tobytes()
+        img.close()
+        pending.append(pool.submit(_ocr_raw_image, mode, size, data, lang))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _poppler_binary(poppler_path: Optional[str], name: str) -> str:
+    exe = f"{name}.exe" if os.name == "nt" else name
+    return os.path.join(poppler_path, exe) if poppler_path else exe
+
+def _has_usable_text(text: str) -> bool:
+    return len(TEXT_LAYER_WORD_REGEX.findall(text)) >= MIN_TEXT_LAYER_WORDS
+
+def _extract_text_layer(stored_path: str, page_count: int, poppler_path: Optional[str]) -> List[str]:
+    """Return the embedded text of pages 1..page_count ("" where a page has none).
+
+    pdftotext ends every page with a form feed, so one call covers the whole range.
+    Any failure (missing binary, encrypted file) falls back to OCR for every page.
+    """
+    if page_count <= 0:
+        return []
+    cmd = [
+        _poppler_binary(poppler_path, "pdftotext"),
+        "-f", "1",
+        "-l", str(page_count),
+        "-enc", "UTF-8",
+        stored_path,
+        "-",
+    ]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=POPPLER_TIMEOUT_SECONDS)
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning(f"pdftotext failed, falling back to OCR: {type(exc).__name__}: {exc}")
+        return [""] * page_count
+    pages = proc.stdout.decode("utf-8", errors="replace").split("\f")
+    pages = (pages + [""] * page_count)[:page_count]
+    return [p if _has_usable_text(p) else "" for p in pages]
+
+def _pdf_page_count(stored_path: str, poppler_path: Optional[str]) -> int:
+    info = pdfinfo_from_path(stored_path, poppler_path=poppler_path)
+    return int(info.get("Pages") or 0)
+
+def _iter_pdf_pages(stored_path: str, page_numbers: Iterable[int], dpi: int, poppler_path: Optional[str]) -> Iterator[Image.Image]:
+    """Rasterize one page per pdftoppm call, only when the OCR stage asks for it.
+
+    pdftoppm is run directly because pdf2image re-reads the page count with pdfinfo
+    on every call; the page numbers here are already bounded by the count read once
+    in process_contract.
+    """
+    pdftoppm = _poppler_binary(poppler_path, "pdftoppm")
+    for page_number in page_numbers:
+        cmd = [
+            pdftoppm,
+            "-r", str(dpi),
+            "-f", str(page_number),
+            "-l", str(page_number),
+            stored_path,
+        ]
+        try:
+            proc = subprocess.run(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=POPPLER_TIMEOUT_SECONDS
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise RuntimeError(
+                f"pdftoppm timed out after {POPPLER_TIMEOUT_SECONDS}s on page {page_number}"
+            ) from exc
+        if proc.stdout:
+            img = Image.open(io.BytesIO(proc.stdout))
+            img.load()
+            yield img
+
+_ocr_cache_lock = threading.Lock()
+_ocr_cache_counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+_ocr_cache_sizes: Dict[str, int] = {}
+_tesseract_versions: Dict[str, str] = {}
+
+def _tesseract_version(tesseract_cmd: str) -> str:
+    version = _tesseract_versions.get(tesseract_cmd)
+    if version is None:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        version = str(pytesseract.get_tesseract_version())
+        _tesseract_versions[tesseract_cmd] = version
+    return version
+
+def _ocr_cache_path(cache_dir: str, file_sha256: str, page_number: int, dpi: int, version: str, lang: str) -> str:
+    key = hashlib.sha256(f"{file_sha256}|{page_number}|{dpi}|{version}|{lang}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key[:2], f"{key}.txt")
+
+def _iter_ocr_cache_files(cache_dir: str) -> Iterator[os.DirEntry]:
+    if not os.path.isdir(cache_dir):
+        return
+    for bucket in os.scandir(cache_dir):
+        if bucket.is_dir():
+            for entry in os.scandir(bucket.path):
+                if entry.is_file() and entry.name.endswith(".txt"):
+                    yield entry
+
+def _ocr_cache_size(cache_dir: str) -> int:
+    # Caller holds _ocr_cache_lock.
+    if cache_dir not in _ocr_cache_sizes:
+        _ocr_cache_sizes[cache_dir] = sum(e.stat().st_size for e in _iter_ocr_cache_files(cache_dir))
+    return _ocr_cache_sizes[cache_dir]
+
+def _ocr_cache_get(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        # Access time drives LRU eviction; bump mtime since atime is often disabled.
+        os.utime(path, None)
+    except OSError:
+        with _ocr_cache_lock:
+            _ocr_cache_counters["misses"] += 1
+        return None
+    with _ocr_cache_lock:
+        _ocr_cache_counters["hits"] += 1
+    return text
+
+def _ocr_cache_put(cache_dir: str, path: str, text: str, max_bytes: int) -> None:
+    data = text.encode("utf-8")
+    with _ocr_cache_lock:
+        # Prime the running total before the write so a cold scan never sees
+        # the new file, and replace (not add) the size of an overwritten entry.
+        size = _ocr_cache_size(cache_dir)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning(f"OCR cache write failed: {type(exc).__name__}: {exc}")
+            return
+        _ocr_cache_counters["writes"] += 1
+        size += len(data) - previous
+        _ocr_cache_sizes[cache_dir] = size
+        if max_bytes and size > max_bytes:
+            _evict_ocr_cache(cache_dir, max_bytes)
+
+def _evict_ocr_cache(cache_dir: str, max_bytes: int) -> None:
+    """Drop least recently used entries until the cache is back under 90% of max_bytes."""
+    # Caller holds _ocr_cache_lock.
+    entries = []
+    for entry in _iter_ocr_cache_files(cache_dir):
+        st = entry.stat()
+        entries.append((st.st_mtime, st.st_size, entry.path))
+    entries.sort()
+    size = sum(e[1] for e in entries)
+    target = int(max_bytes * 0.9)
+    for _, entry_size, entry_path in entries:
+        if size <= target:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        size -= entry_size
+        _ocr_cache_counters["evictions"] += 1
+    _ocr_cache_sizes[cache_dir] = size
+
+def ocr_cache_stats(cache_dir: Optional[str], max_bytes: int) -> Dict[str, Any]:
+    with _ocr_cache_lock:
+        counters = dict(_ocr_cache_counters)
+        entries = 0
+        size = 0
+        if cache_dir:
+            for entry in _iter_ocr_cache_files(cache_dir):
+                entries += 1
+                size += entry.stat().st_size
+            _ocr_cache_sizes[cache_dir] = size
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        "enabled": bool(cache_dir),
+        "directory": cache_dir,
+        "entries": entries,
+        "size_bytes": size,
+        "max_bytes": max_bytes,
+        "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+        **counters,
+    }
+
 def process_contract(
     db_path: str,
     contract_id: str,
@@ -338,6 +764,12 @@ def process_contract(
     max_pages: int = 150,
     dpi: int = 250,
     poppler_path: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    ocr_workers: int = 1,
+    lang: str = "eng",
+    file_sha256: Optional[str] = None,
+    ocr_cache_dir: Optional[str] = None,
+    ocr_cache_max_bytes: int = 0,
 ) -> Dict[str, Any]:
     pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
@@ -348,71 +780,129 @@ def process_contract(
 
     with _db(db_path) as conn:
         _set_contract_status(conn, contract_id, "processing")
-        _clear_previous_processing(conn, contract_id)
 
     page_texts: List[str] = []
 
     if ext == ".pdf":
         _test_poppler(poppler_path)
-        images = convert_from_path(stored_path, dpi=dpi, poppler_path=poppler_path)[:max_pages]
         logger.info("Poppler test successful: OK")
-        logger.info(f"Converted {len(images)} pages from PDF")
+        page_count = min(_pdf_page_count(stored_path, poppler_path), max_pages)
+        text_layer = _extract_text_layer(stored_path, page_count, poppler_path)
     else:
-        images = [Image.open(stored_path)]
-
-    with _db(db_path) as conn:
-        for i, img in enumerate(images, start=1):
-            logger.info(f"OCR processing page {i}/{len(images)}")
-            text = pytesseract.image_to_string(img) or ""
-            page_texts.append(text)
-            _insert_ocr_page(conn, contract_id, i, text)
-        _set_contract_pages(conn, contract_id, len(images))
+        page_count = 1
+        text_layer = [""]
+
+    # Pages without a text layer: serve from the OCR cache where possible.
+    cache_paths: Dict[int, str] = {}
+    cached_text: Dict[int, str] = {}
+    ocr_page_numbers = [n for n, text in enumerate(text_layer, start=1) if not text]
+    if ocr_page_numbers and ocr_cache_dir and file_sha256:
+        try:
+            version = _tesseract_version(tesseract_cmd)
+        except Exception as exc:
+            version = None
+            logger.warning(f"OCR cache disabled, tesseract version unavailable: {type(exc).__name__}: {exc}")
+        if version:
+            for n in ocr_page_numbers:
+                cache_paths[n] = _ocr_cache_path(ocr_cache_dir, file_sha256, n, dpi, version, lang)
+                hit = _ocr_cache_get(cache_paths[n])
+                if hit is not None:
+                    cached_text[n] = hit
+            ocr_page_numbers = [n for n in ocr_page_numbers if n not in cached_text]
+
+    logger.info(
+        f"Pages={page_count} text_layer={page_count - len(ocr_page_numbers) - len(cached_text)} "
+        f"cached={len(cached_text)} ocr={len(ocr_page_numbers)}"
+    )
+    if ext == ".pdf":
+        images: Iterable[Image.Image] = _iter_pdf_pages(stored_path, ocr_page_numbers, dpi, poppler_path)
+    else:
+        images = [Image.open(stored_path)] if ocr_page_numbers else []
+
+    ocr_iter = _ocr_pages(images, tesseract_cmd, ocr_workers, lang)
+    page_sources: List[str] = []
+    for i, layer_text in enumerate(text_layer, start=1):
+        if layer_text:
+            text, source = layer_text, "text_layer"
+        elif i in cached_text:
+            text, source = cached_text[i], "ocr"
+        else:
+            text, source = next(ocr_iter), "ocr"
+            if i in cache_paths:
+                _ocr_cache_put(ocr_cache_dir, cache_paths[i], text, ocr_cache_max_bytes)
+        logger.info(f"Page {i}/{page_count} text from {source}")
+        page_texts.append(text)
+        page_sources.append(source)
+        if progress_callback:
+            progress_callback(i, page_count)
 
     ocr_all = "\n".join(page_texts)
 
-    with _db(db_path) as conn:
-        _upsert_fts(conn, contract_id, ocr_all)
-
-    eff, eff_conf, eff_snip, eff_page = _find_best_date_near(ocr_all, KEYWORDS["effective_date"])
-    if not eff:
-        eff, eff_conf, eff_snip, eff_page = _find_agreement_date(ocr_all)
-    ren, ren_conf, ren_snip, ren_page = _find_best_date_near(ocr_all, KEYWORDS["renewal_date"])
-    ter, ter_conf, ter_snip, ter_page = _find_best_date_near(ocr_all, KEYWORDS["termination_date"])
-    opt_days, opt_conf, opt_snip, opt_page = _find_opt_out_days(ocr_all)
-    termination_notice_days, termination_notice_conf, termination_notice_snip, termination_notice_page = _find_termination_notice_days(ocr_all)
-    law, law_conf, law_snip, law_page = _find_governing_law(ocr_all)
-    term_length, term_length_conf, term_length_snip, term_length_page = _find_term_length(ocr_all)
+    extracted = _extract_terms(ocr_all, _build_page_index(page_texts))
+    eff, eff_conf, eff_snip, eff_page, eff_offsets = extracted["effective_date"]
+    if not eff:
+        eff, eff_conf, eff_snip, eff_page, eff_offsets = extracted["agreement_date"]
+    ren, ren_conf, ren_snip, ren_page, ren_offsets = extracted["renewal_date"]
+    ter, ter_conf, ter_snip, ter_page, ter_offsets = extracted["termination_date"]
+    opt_days, opt_conf, opt_snip, opt_page, opt_offsets = extracted["auto_renew_opt_out_days"]
+    termination_notice_days, termination_notice_conf, termination_notice_snip, termination_notice_page, termination_notice_offsets = extracted["termination_notice_days"]
+    law, law_conf, law_snip, law_page, law_offsets = extracted["governing_law"]
+    term_length, term_length_conf, term_length_snip, term_length_page, term_length_offsets = extracted["term_length"]
+    opt_date = _compute_opt_out_date(ren, opt_days) if (ren and opt_days is not None) else None
+
+    # Collect every row first, then swap the contract's results in one transaction
+    # so readers see either the previous run or this one, never a mix.
+    ts = now_iso()
+    page_rows = [
+        (contract_id, i, text, source, ts)
+        for i, (text, source) in enumerate(zip(page_texts, page_sources), start=1)
+    ]
+    term_rows: List[Tuple[Any, ...]] = []
+    event_rows: List[Tuple[Any, ...]] = []
 
-    with _db(db_path) as conn:
-        if eff:
-            _insert_term(conn, contract_id, "effective_date", eff, eff, eff_conf, _status_for(eff_conf), eff_page, eff_snip)
-            _insert_event(conn, contract_id, "effective", eff, "effective_date")
-
-        if ren:
-            _insert_term(conn, contract_id, "renewal_date", ren, ren, ren_conf, _status_for(ren_conf), ren_page, ren_snip)
-            _insert_event(conn, contract_id, "renewal", ren, "renewal_date")
-
-        if ter:
-            _insert_term(conn, contract_id, "termination_date", ter, ter, ter_conf, _status_for(ter_conf), ter_page, ter_snip)
-            _insert_event(conn, contract_id, "termination", ter, "termination_date")
-
-        if opt_days is not None:
-            _insert_term(conn, contract_id, "auto_renew_opt_out_days", str(opt_days), str(opt_days), opt_conf, _status_for(opt_conf), opt_page, opt_snip)
+    def add_term(term_key: str, value: str, conf: float, status: str, page: Optional[int],
+                 snippet: Optional[str], offsets: Optional[Tuple[int, int]]) -> None:
+        start, end = offsets if offsets else (None, None)
+        term_rows.append((contract_id, term_key, value, value, float(conf), status, page, snippet, start, end, ts))
 
-        if termination_notice_days is not None:
-            _insert_term(conn, contract_id, "termination_notice_days", str(termination_notice_days), str(termination_notice_days), termination_notice_conf, _status_for(termination_notice_conf), termination_notice_page, termination_notice_snip)
+    def add_event(event_type: str, event_date_iso: str, derived_from_term_key: str) -> None:
+        event_rows.append((str(uuid.uuid4()), contract_id, event_type, event_date_iso, derived_from_term_key, ts))
 
-        if ren and opt_days is not None:
-            opt_date = _compute_opt_out_date(ren, opt_days)
-            _insert_term(conn, contract_id, "auto_renew_opt_out_date", opt_date, opt_date, 0.95, "smart", None, "calculated: renewal_date - opt_out_days")
-            _insert_event(conn, contract_id, "auto_opt_out", opt_date, "auto_renew_opt_out_date")
-
-        if law:
-            _insert_term(conn, contract_id, "governing_law", law, law, law_conf, _status_for(law_conf), law_page, law_snip)
+    if eff:
+        add_term("effective_date", eff, eff_conf, _status_for(eff_conf), eff_page, eff_snip, eff_offsets)
+        add_event("effective", eff, "effective_date")
+
+    if ren:
+        add_term("renewal_date", ren, ren_conf, _status_for(ren_conf), ren_page, ren_snip, ren_offsets)
+        add_event("renewal", ren, "renewal_date")
+
+    if ter:
+        add_term("termination_date", ter, ter_conf, _status_for(ter_conf), ter_page, ter_snip, ter_offsets)
+        add_event("termination", ter, "termination_date")
+
+    if opt_days is not None:
+        add_term("auto_renew_opt_out_days", str(opt_days), opt_conf, _status_for(opt_conf), opt_page, opt_snip, opt_offsets)
+
+    if termination_notice_days is not None:
+        add_term("termination_notice_days", str(termination_notice_days), termination_notice_conf, _status_for(termination_notice_conf), termination_notice_page, termination_notice_snip, termination_notice_offsets)
 
-        if term_length:
-            _insert_term(conn, contract_id, "term_length", term_length, term_length, term_length_conf, _status_for(term_length_conf), term_length_page, term_length_snip)
+    if opt_date:
+        add_term("auto_renew_opt_out_date", opt_date, 0.95, "smart", None, "calculated: renewal_date - opt_out_days", None)
+        add_event("auto_opt_out", opt_date, "auto_renew_opt_out_date")
 
+    if law:
+        add_term("governing_law", law, law_conf, _status_for(law_conf), law_page, law_snip, law_offsets)
+
+    if term_length:
+        add_term("term_length", term_length, term_length_conf, _status_for(term_length_conf), term_length_page, term_length_snip, term_length_offsets)
+
+    with _db(db_path) as conn:
+        _clear_previous_processing(conn, contract_id)
+        _insert_ocr_pages(conn, page_rows)
+        _set_contract_pages(conn, contract_id, len(page_texts))
+        _upsert_fts(conn, contract_id, ocr_all)
+        _insert_terms(conn, term_rows)
+        _insert_events(conn, event_rows)
         _set_contract_status(conn, contract_id, "processed")
 
     return {
@@ -422,8 +912,8 @@ def process_contract(
         "termination_date": ter,
         "auto_renew_opt_out_days": opt_days,
         "termination_notice_days": termination_notice_days,
-        "auto_renew_opt_out_date": _compute_opt_out_date(ren, opt_days) if (ren and opt_days is not None) else None,
+        "auto_renew_opt_out_date": opt_date,
         "governing_law": law,
         "term_length": term_length,
-        "pages_ocrd": len(images),
+        "pages_ocrd": len(page_texts),
     }
@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS contracts (
 );
 
 CREATE INDEX IF NOT EXISTS idx_contracts_uploaded_at ON contracts(uploaded_at);
+CREATE INDEX IF NOT EXISTS idx_contracts_uploaded_at_id ON contracts(uploaded_at, id);
 CREATE INDEX IF NOT EXISTS idx_contracts_vendor ON contracts(vendor);
 CREATE INDEX IF NOT EXISTS idx_contracts_agreement_type ON contracts(agreement_type);
 CREATE UNIQUE INDEX IF NOT EXISTS ux_contracts_sha256 ON contracts(sha256);
@@ -162,6 +163,7 @@ CREATE TABLE IF NOT EXISTS action_logs (
 );
 CREATE INDEX IF NOT EXISTS idx_action_logs_entity ON action_logs(entity_type, entity_id);
 CREATE INDEX IF NOT EXISTS idx_action_logs_user ON action_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_action_logs_created_at_id ON action_logs(created_at, id);
 
 -- =========================
 -- OCR text (per page)
@@ -171,6 +173,7 @@ CREATE TABLE IF NOT EXISTS ocr_pages (
   contract_id   TEXT NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
   page_number   INTEGER NOT NULL,
   text          TEXT NOT NULL,
+  source        TEXT NOT NULL DEFAULT 'ocr',  -- text_layer | ocr
   created_at    TEXT NOT NULL
 );
 CREATE UNIQUE INDEX IF NOT EXISTS ux_ocr_pages_contract_page ON ocr_pages(contract_id, page_number);
@@ -202,6 +205,8 @@ CREATE TABLE IF NOT EXISTS term_instances (
   status          TEXT NOT NULL DEFAULT 'smart',
   source_page     INTEGER,
   source_snippet  TEXT,
+  source_start    INTEGER,   -- character offsets of the source text within ocr_pages.text
+  source_end      INTEGER,
   updated_at      TEXT NOT NULL
 );
 
@@ -248,6 +253,17 @@ CREATE TABLE IF NOT EXISTS reminder_sends (
 CREATE UNIQUE INDEX IF NOT EXISTS ux_reminder_sends_unique
   ON reminder_sends(event_id, offset_days, scheduled_for);
 
+-- One row per enabled (event, offset); kept in step with reminder_settings and events
+CREATE TABLE IF NOT EXISTS reminder_schedule (
+  event_id      TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+  offset_days   INTEGER NOT NULL,
+  scheduled_for TEXT NOT NULL,
+  PRIMARY KEY (event_id, offset_days)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_reminder_schedule_scheduled_for
+  ON reminder_schedule(scheduled_for);
+
 -- =========================
 -- Notification users
 -- =========================
@@ -324,6 +340,16 @@ CREATE TABLE IF NOT EXISTS auth_oidc_states (
 
 CREATE INDEX IF NOT EXISTS idx_auth_oidc_states_expires ON auth_oidc_states(expires_at);
 
+-- Materialized per-user contract visibility (non-admin users only).
+-- Maintained by triggers installed in app._install_contract_visibility_index.
+CREATE TABLE IF NOT EXISTS contract_visibility (
+  user_id       INTEGER NOT NULL REFERENCES auth_users(id) ON DELETE CASCADE,
+  contract_id   TEXT NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
+  PRIMARY KEY (user_id, contract_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_contract_visibility_contract ON contract_visibility(contract_id);
+
 -- =========================
 -- Notification delivery logs
 -- =========================
@@ -337,12 +363,36 @@ CREATE TABLE IF NOT EXISTS notification_logs (
   error          TEXT,
   related_id     TEXT,
   metadata_json  TEXT,
-  created_at     TEXT NOT NULL
+  created_at     TEXT NOT NULL,
+  attempts       INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at TEXT,
+  sent_at        TEXT,
+  log_seq        INTEGER,
+  claimed_by     TEXT,
+  claim_expires_at TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_notification_logs_created_at ON notification_logs(created_at);
 CREATE INDEX IF NOT EXISTS idx_notification_logs_kind ON notification_logs(kind);
 CREATE INDEX IF NOT EXISTS idx_notification_logs_status ON notification_logs(status);
+CREATE INDEX IF NOT EXISTS idx_notification_logs_created_at_id
+  ON notification_logs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_notification_logs_outbox
+  ON notification_logs(next_attempt_at) WHERE status = 'queued';
+-- Stable integer key for notification_logs_fts; implicit rowids can change on VACUUM
+CREATE UNIQUE INDEX IF NOT EXISTS ux_notification_logs_log_seq
+  ON notification_logs(log_seq);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS notification_logs_fts USING fts5(
+  subject,
+  recipients_json,
+  body,
+  kind,
+  related_id,
+  metadata_json,
+  content='notification_logs',
+  content_rowid='log_seq'
+);
 
 -- =========================
 -- Pending agreements queue
@@ -398,6 +448,8 @@ CREATE TABLE IF NOT EXISTS pending_agreement_notes (
 
 CREATE INDEX IF NOT EXISTS idx_pending_agreement_notes_agreement
   ON pending_agreement_notes(pending_agreement_id);
+CREATE INDEX IF NOT EXISTS idx_pending_agreement_notes_latest
+  ON pending_agreement_notes(pending_agreement_id, created_at);
 
 -- =========================
 -- Pending agreement reminder rules
@@ -434,6 +486,16 @@ CREATE INDEX IF NOT EXISTS idx_tasks_created_at
   ON tasks(created_at);
 CREATE INDEX IF NOT EXISTS idx_tasks_completed
   ON tasks(completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id
+  ON tasks(created_at DESC, id);
+
+CREATE TABLE IF NOT EXISTS task_assignees (
+  task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+  email TEXT NOT NULL,
+  PRIMARY KEY (task_id, email)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_assignees_email
+  ON task_assignees(email, task_id);
 
 -- =========================
 -- Job runs
@@ -444,7 +506,23 @@ CREATE TABLE IF NOT EXISTS job_runs (
   started_at   TEXT NOT NULL,
   finished_at  TEXT,
   status       TEXT NOT NULL,
-  detail       TEXT
+  detail       TEXT,
+  contract_id  TEXT,
+  progress     INTEGER NOT NULL DEFAULT 0,
+  claimed_by   TEXT,
+  heartbeat_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_name_status
+  ON job_runs(job_name, status);
+CREATE INDEX IF NOT EXISTS idx_job_runs_contract_id
+  ON job_runs(contract_id);
+
+-- One row per scheduled job while a worker is running it
+CREATE TABLE IF NOT EXISTS job_leases (
+  job_name     TEXT PRIMARY KEY,
+  holder       TEXT NOT NULL,
+  expires_at   TEXT NOT NULL
 );
 
 -- =========================
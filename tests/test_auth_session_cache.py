@@ -0,0 +1,170 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import db_pool
+
+
+class AuthSessionCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.app_module._invalidate_session_cache()
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM auth_sessions")
+            conn.execute("DELETE FROM auth_users WHERE email NOT IN ('admin@local.com')")
+            now = self.app_module.now_iso()
+            self.user_id = conn.execute(
+                """
+                INSERT INTO auth_users (name, email, password_hash, is_active, created_at, updated_at)
+                VALUES ('Member', 'member@example.com', ?, 1, ?, ?)
+                """,
+                (self.app_module.hash_password("secret"), now, now),
+            ).lastrowid
+
+    def _login(self, email, password):
+        client = TestClient(self.app_module.app)
+        res = client.post("/api/auth/login", json={"email": email, "password": password})
+        self.assertEqual(res.status_code, 200)
+        return client
+
+    def _statements_touching(self, client, url, table):
+        statements = []
+        original_db = self.app_module.db
+
+        def counting_db():
+            conn = original_db()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        self.app_module.db = counting_db
+        try:
+            res = client.get(url)
+        finally:
+            self.app_module.db = original_db
+        return res, len([sql for sql in statements if table in sql])
+
+    def test_session_resolved_once_per_request_then_cached(self):
+        client = self._login("member@example.com", "secret")
+        self.app_module._invalidate_session_cache()
+
+        res, lookups = self._statements_touching(client, "/api/contracts", "auth_sessions")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(lookups, 1)
+
+        res, lookups = self._statements_touching(client, "/api/contracts", "auth_sessions")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(lookups, 0)
+
+    def test_authenticated_request_holds_one_connection_at_a_time(self):
+        client = self._login("member@example.com", "secret")
+        self.app_module._invalidate_session_cache()
+        acquire, release = db_pool.ConnectionPool.acquire, db_pool.ConnectionPool.release
+        checked_out = [0, 0]
+
+        def counting_acquire(pool):
+            checked_out[0] += 1
+            checked_out[1] = max(checked_out)
+            return acquire(pool)
+
+        def counting_release(pool, conn):
+            checked_out[0] -= 1
+            release(pool, conn)
+
+        with patch.object(db_pool.ConnectionPool, "acquire", counting_acquire), patch.object(
+            db_pool.ConnectionPool, "release", counting_release
+        ):
+            self.assertEqual(client.get("/api/contracts").status_code, 200)
+
+        self.assertEqual(checked_out, [0, 1])
+
+    def test_logout_invalidates_cached_session(self):
+        client = self._login("member@example.com", "secret")
+        token = client.cookies.get(self.app_module.AUTH_COOKIE_NAME)
+        self.assertEqual(client.get("/api/contracts").status_code, 200)
+
+        client.post("/api/auth/logout")
+        client.cookies.set(self.app_module.AUTH_COOKIE_NAME, token)
+        self.assertEqual(client.get("/api/contracts").status_code, 401)
+
+    def test_role_change_applies_to_cached_session(self):
+        member = self._login("member@example.com", "secret")
+        self.assertEqual(member.get("/api/admin/users").status_code, 403)
+
+        with self.app_module.db() as conn:
+            admin_role_id = conn.execute(
+                "SELECT id FROM auth_roles WHERE name = 'admin'"
+            ).fetchone()["id"]
+        admin = self._login("admin@local.com", "password")
+        res = admin.put(f"/api/admin/users/{self.user_id}", json={"roles": [admin_role_id]})
+        self.assertEqual(res.status_code, 200)
+
+        self.assertEqual(member.get("/api/admin/users").status_code, 200)
+
+    def test_permission_matrix_is_cached_until_permissions_change(self):
+        with self.app_module.db() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO auth_roles (name, created_at) VALUES ('legal', ?)",
+                (self.app_module.now_iso(),),
+            )
+            role_id = conn.execute("SELECT id FROM auth_roles WHERE name = 'legal'").fetchone()["id"]
+            self.app_module._set_user_roles(conn, self.user_id, [role_id])
+        member = self._login("member@example.com", "secret")
+        admin = self._login("admin@local.com", "password")
+
+        before = member.get("/api/permissions/me").json()["permissions"]
+        self.assertNotIn("user_directory_manage", before)
+        res, lookups = self._statements_touching(member, "/api/permissions/me", "role_permissions")
+        self.assertEqual(res.json()["permissions"], before)
+        self.assertEqual(lookups, 0)
+
+        res = admin.put("/api/permissions/user_directory_manage", json={"roles": [role_id]})
+        self.assertEqual(res.status_code, 200)
+        after = member.get("/api/permissions/me").json()["permissions"]
+        self.assertIn("user_directory_manage", after)
+
+    def test_permission_defaults_are_committed_before_the_cache_is_invalidated(self):
+        app_module = self.app_module
+        with app_module.db() as conn:
+            conn.execute(
+                "DELETE FROM role_permissions WHERE permission_key = 'user_directory_manage'"
+            )
+        restored = []
+
+        def recording_invalidate():
+            # A reader rebuilding the matrix now must already see the restored default.
+            with app_module.db() as reader:
+                restored.append(
+                    reader.execute(
+                        "SELECT COUNT(1) FROM role_permissions WHERE permission_key = 'user_directory_manage'"
+                    ).fetchone()[0]
+                )
+
+        with patch.object(app_module, "_invalidate_permission_matrix", recording_invalidate):
+            app_module.init_db()
+
+        self.assertEqual(restored, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
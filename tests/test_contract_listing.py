@@ -0,0 +1,205 @@
+import os
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+
+class ContractListingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+        cls.client = TestClient(cls.app_module.app)
+        res = cls.client.post(
+            "/api/auth/login", json={"email": "admin@local.com", "password": "password"}
+        )
+        assert res.status_code == 200
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM contracts")
+            conn.execute("DELETE FROM tags")
+
+    def _add_contracts(self, count, start=0):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            for name, color in (("red", "#f00"), ("blue", "#00f")):
+                conn.execute(
+                    "INSERT OR IGNORE INTO tags (name, color, created_at) VALUES (?, ?, ?)",
+                    (name, color, now),
+                )
+            tag_ids = {
+                row["name"]: row["id"] for row in conn.execute("SELECT id, name FROM tags")
+            }
+            for i in range(start, start + count):
+                contract_id = f"c{i:03d}"
+                conn.execute(
+                    """
+                    INSERT INTO contracts
+                      (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                    VALUES (?, ?, 'c.pdf', ?, 'c.pdf', 'application/pdf', ?, 'processed')
+                    """,
+                    (contract_id, f"Contract {i}", contract_id, now),
+                )
+                names = ["red"] if i % 2 else ["red", "blue"]
+                for tag_id in (tag_ids[name] for name in names):
+                    conn.execute(
+                        "INSERT INTO contract_tags (contract_id, tag_id, auto_generated, created_at) VALUES (?, ?, 0, ?)",
+                        (contract_id, tag_id, now),
+                    )
+                conn.execute(
+                    """
+                    INSERT INTO events (id, contract_id, event_type, event_date, derived_from_term_key, created_at)
+                    VALUES (?, ?, 'renewal', '2026-03-01', 'renewal_date', ?)
+                    """,
+                    (f"e{i:03d}", contract_id, now),
+                )
+
+    def _count_selects(self, url):
+        statements = []
+        original_db = self.app_module.db
+        self.app_module._invalidate_session_cache()
+
+        def counting_db():
+            conn = original_db()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        self.app_module.db = counting_db
+        try:
+            res = self.client.get(url)
+        finally:
+            self.app_module.db = original_db
+        self.assertEqual(res.status_code, 200)
+        return res.json(), len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+
+    def test_tags_are_loaded_in_one_query_regardless_of_page_size(self):
+        self._add_contracts(3)
+        small, small_queries = self._count_selects("/api/contracts?limit=200")
+        self._add_contracts(12, start=3)
+        large, large_queries = self._count_selects("/api/contracts?limit=200")
+
+        self.assertEqual(len(small), 3)
+        self.assertEqual(len(large), 15)
+        self.assertEqual(small_queries, large_queries)
+        tags_by_id = {item["id"]: [t["name"] for t in item["tags"]] for item in large}
+        self.assertEqual(tags_by_id["c000"], ["red", "blue"])
+        self.assertEqual(tags_by_id["c001"], ["red"])
+
+    def test_calendar_events_use_batched_tags(self):
+        self._add_contracts(2)
+        _, small_queries = self._count_selects("/api/calendar/events?start=2026-01-01&end=2026-12-31")
+        self._add_contracts(8, start=2)
+        events, large_queries = self._count_selects(
+            "/api/calendar/events?start=2026-01-01&end=2026-12-31"
+        )
+
+        self.assertEqual(len(events), 10)
+        self.assertEqual(small_queries, large_queries)
+        event = next(e for e in events if e["contract_id"] == "c000")
+        self.assertEqual(
+            event["tags"], [{"name": "red", "color": "#f00"}, {"name": "blue", "color": "#00f"}]
+        )
+
+    def _add_reminders(self, event_ids):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            for event_id in event_ids:
+                conn.execute(
+                    """
+                    INSERT INTO reminder_settings (event_id, recipients, offsets_json, enabled, updated_at)
+                    VALUES (?, 'a@example.com,b@example.com', '[30, 7, 90]', 1, ?)
+                    """,
+                    (event_id, now),
+                )
+
+    def test_events_batch_reminder_settings(self):
+        self._add_contracts(2)
+        self._add_reminders(["e000"])
+        _, small_queries = self._count_selects("/api/events?month=all")
+        self._add_contracts(8, start=2)
+        self._add_reminders(["e005", "e009"])
+        events, large_queries = self._count_selects("/api/events?month=all")
+
+        self.assertEqual(len(events), 10)
+        self.assertEqual(small_queries, large_queries)
+        by_id = {event["id"]: event["reminder"] for event in events}
+        self.assertEqual(
+            by_id["e005"],
+            {"enabled": True, "offsets": [7, 30, 90], "recipients": ["a@example.com", "b@example.com"]},
+        )
+        self.assertIsNone(by_id["e001"])
+
+        detail = self.client.get("/api/contracts/c000").json()
+        self.assertEqual(detail["reminders"]["e000"]["offsets"], [30, 7, 90])
+
+    def test_events_pagination(self):
+        self._add_contracts(5)
+        first = self.client.get("/api/events?month=2026-03&limit=2&offset=0").json()
+        second = self.client.get("/api/events?month=2026-03&limit=2&offset=2").json()
+        third = self.client.get("/api/events?month=2026-03&limit=2&offset=4").json()
+
+        self.assertEqual(first["total"], 5)
+        self.assertEqual((first["limit"], second["offset"]), (2, 2))
+        ids = [e["id"] for page in (first, second, third) for e in page["items"]]
+        self.assertEqual(ids, ["e000", "e001", "e002", "e003", "e004"])
+        self.assertIsInstance(self.client.get("/api/events?month=2026-03").json(), list)
+
+
+    def test_contract_cursor_pages_match_offset_pages(self):
+        self._add_contracts(7)
+        with self.app_module.db() as conn:
+            conn.execute("UPDATE contracts SET uploaded_at = '2026-01-0' || (CAST(substr(id, 2) AS INTEGER) % 3 + 1)")
+
+        offset_ids = [item["id"] for item in self.client.get("/api/contracts?limit=50").json()]
+        cursor_ids = []
+        cursor = ""
+        while True:
+            page = self.client.get(
+                "/api/contracts", params={"limit": 3, "cursor": cursor, "include_tags": "false"}
+            ).json()
+            cursor_ids.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(cursor_ids, offset_ids)
+        self.assertEqual(len(set(cursor_ids)), 7)
+
+        res = self.client.get("/api/contracts", params={"cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, 400)
+        for values in (({"a": 1}, "c001"), ("2026-01-01", ["c001"]), ("2026-01-01", None)):
+            token = self.app_module.encode_cursor(*values)
+            for url in ("/api/contracts", "/api/action-logs", "/api/notification-logs"):
+                res = self.client.get(url, params={"cursor": token})
+                self.assertEqual(res.status_code, 400, (url, values))
+
+    def test_action_log_cursor(self):
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM action_logs")
+            conn.executemany(
+                "INSERT INTO action_logs (action, entity_type, entity_id, created_at) VALUES ('edit', 'contract', ?, '2026-01-01')",
+                [(f"c{i}",) for i in range(5)],
+            )
+        first = self.client.get("/api/action-logs?limit=3").json()
+        second = self.client.get(f"/api/action-logs?limit=3&cursor={first['next_cursor']}").json()
+        ids = [item["entity_id"] for item in first["items"] + second["items"]]
+        self.assertEqual(ids, ["c4", "c3", "c2", "c1", "c0"])
+        self.assertIsNone(second["next_cursor"])
+
+if __name__ == "__main__":
+    unittest.main()
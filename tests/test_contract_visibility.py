@@ -0,0 +1,228 @@
+import os
+import random
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+
+class ContractVisibilityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM contracts")
+            conn.execute("DELETE FROM tags")
+            conn.execute("DELETE FROM profit_centers")
+            conn.execute("DELETE FROM auth_sessions")
+            conn.execute("DELETE FROM auth_users WHERE email NOT IN ('admin@local.com')")
+            conn.execute("DELETE FROM auth_roles WHERE name LIKE 'vis-%'")
+
+    def _seed(self, rng, contracts=60):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            role_ids = [
+                conn.execute(
+                    "INSERT INTO auth_roles (name, created_at) VALUES (?, ?)", (f"vis-{i}", now)
+                ).lastrowid
+                for i in range(3)
+            ]
+            tag_ids = [
+                conn.execute(
+                    "INSERT INTO tags (name, created_at) VALUES (?, ?)", (f"tag-{i}", now)
+                ).lastrowid
+                for i in range(4)
+            ]
+            # tag-0 and tag-1 are role-restricted, the others are open.
+            for tag_id, roles in ((tag_ids[0], role_ids[:1]), (tag_ids[1], role_ids[1:])):
+                for role_id in roles:
+                    conn.execute(
+                        "INSERT INTO tag_roles (tag_id, role_id, created_at) VALUES (?, ?, ?)",
+                        (tag_id, role_id, now),
+                    )
+            center_ids = [
+                conn.execute(
+                    "INSERT INTO profit_centers (code, name, group_name, created_at) VALUES (?, ?, ?, ?)",
+                    (f"PC{i}", f"Center {i}", group, now),
+                ).lastrowid
+                for i, group in enumerate(["east", "east", "west", None])
+            ]
+            contract_ids = []
+            for i in range(contracts):
+                contract_id = f"c{i:03d}"
+                contract_ids.append(contract_id)
+                conn.execute(
+                    """
+                    INSERT INTO contracts
+                      (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                    VALUES (?, ?, 'c.pdf', ?, 'c.pdf', 'application/pdf', ?, 'processed')
+                    """,
+                    (contract_id, f"Contract {i}", contract_id, f"2024-01-01T00:00:{i:02d}Z"),
+                )
+                for tag_id in rng.sample(tag_ids, rng.randint(0, 2)):
+                    conn.execute(
+                        "INSERT INTO contract_tags (contract_id, tag_id, created_at) VALUES (?, ?, ?)",
+                        (contract_id, tag_id, now),
+                    )
+                for center_id in rng.sample(center_ids, rng.randint(0, 2)):
+                    conn.execute(
+                        "INSERT INTO contract_profit_centers (contract_id, profit_center_id, created_at) VALUES (?, ?, ?)",
+                        (contract_id, center_id, now),
+                    )
+        return contract_ids, role_ids, center_ids
+
+    def _create_user(self, conn, email, role_ids, center_ids, groups):
+        now = self.app_module.now_iso()
+        user_id = conn.execute(
+            """
+            INSERT INTO auth_users (name, email, password_hash, is_active, created_at, updated_at)
+            VALUES (?, ?, ?, 1, ?, ?)
+            """,
+            (email, email, self.app_module.hash_password("secret"), now, now),
+        ).lastrowid
+        for role_id in role_ids:
+            conn.execute(
+                "INSERT INTO auth_user_roles (user_id, role_id, created_at) VALUES (?, ?, ?)",
+                (user_id, role_id, now),
+            )
+        self.app_module._set_user_profit_centers(conn, user_id, center_ids)
+        self.app_module._set_user_profit_center_groups(conn, user_id, groups)
+        return user_id
+
+    def _assert_index_matches_rules(self, conn, user_ids):
+        contract_ids = [row["id"] for row in conn.execute("SELECT id FROM contracts ORDER BY id")]
+        for user_id in user_ids:
+            expected = self.app_module._filter_contract_visibility(
+                conn,
+                contract_ids,
+                self.app_module._get_user_role_ids(conn, user_id),
+                self.app_module._get_user_profit_center_ids(conn, user_id),
+                self.app_module._get_user_profit_center_groups(conn, user_id),
+                False,
+            )
+            rows = conn.execute(
+                "SELECT contract_id FROM contract_visibility WHERE user_id = ? ORDER BY contract_id",
+                (user_id,),
+            ).fetchall()
+            self.assertEqual([row["contract_id"] for row in rows], expected, user_id)
+
+    def test_index_matches_filter_function_through_changes(self):
+        rng = random.Random(1234)
+        contract_ids, role_ids, center_ids = self._seed(rng)
+        now = self.app_module.now_iso()
+
+        with self.app_module.db() as conn:
+            user_ids = [
+                self._create_user(
+                    conn,
+                    f"user{i}@example.com",
+                    rng.sample(role_ids, rng.randint(0, 2)),
+                    rng.sample(center_ids, rng.randint(0, 2)),
+                    rng.sample(["east", "west", "north"], rng.randint(0, 2)),
+                )
+                for i in range(12)
+            ]
+            self._assert_index_matches_rules(conn, user_ids)
+
+            tag_ids = [row["id"] for row in conn.execute("SELECT id FROM tags ORDER BY id")]
+            conn.execute(
+                "INSERT INTO tag_roles (tag_id, role_id, created_at) VALUES (?, ?, ?)",
+                (tag_ids[2], role_ids[2], now),
+            )
+            self._assert_index_matches_rules(conn, user_ids)
+
+            conn.execute("DELETE FROM tags WHERE id = ?", (tag_ids[0],))
+            self._assert_index_matches_rules(conn, user_ids)
+
+            conn.execute(
+                "UPDATE profit_centers SET group_name = 'west' WHERE id = ?", (center_ids[0],)
+            )
+            self._assert_index_matches_rules(conn, user_ids)
+
+            self.app_module._set_contract_profit_centers(conn, contract_ids[0], [center_ids[2]])
+            self.app_module._set_user_profit_center_groups(conn, user_ids[0], ["west"])
+            conn.execute("DELETE FROM auth_user_roles WHERE user_id = ?", (user_ids[1],))
+            self._assert_index_matches_rules(conn, user_ids)
+
+            conn.execute(
+                """
+                INSERT INTO contracts
+                  (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                VALUES ('new', 'New', 'n.pdf', 'new', 'n.pdf', 'application/pdf', ?, 'processed')
+                """,
+                (now,),
+            )
+            conn.execute(
+                "INSERT INTO contract_profit_centers (contract_id, profit_center_id, created_at) VALUES ('new', ?, ?)",
+                (center_ids[1], now),
+            )
+            self._assert_index_matches_rules(conn, user_ids)
+
+            admin_role = conn.execute("SELECT id FROM auth_roles WHERE name = 'admin'").fetchone()
+            conn.execute(
+                "INSERT INTO auth_user_roles (user_id, role_id, created_at) VALUES (?, ?, ?)",
+                (user_ids[2], admin_role["id"], now),
+            )
+            count = conn.execute(
+                "SELECT COUNT(1) FROM contract_visibility WHERE user_id = ?", (user_ids[2],)
+            ).fetchone()[0]
+            self.assertEqual(count, 0)
+
+    def test_restricted_user_gets_full_pages(self):
+        rng = random.Random(99)
+        contract_ids, role_ids, _ = self._seed(rng)
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            user_id = conn.execute(
+                """
+                INSERT INTO auth_users (name, email, password_hash, is_active, created_at, updated_at)
+                VALUES ('Viewer', 'viewer@example.com', ?, 1, ?, ?)
+                """,
+                (self.app_module.hash_password("secret"), now, now),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO auth_user_roles (user_id, role_id, created_at) VALUES (?, ?, ?)",
+                (user_id, role_ids[0], now),
+            )
+            conn.execute(
+                "INSERT INTO user_profit_center_groups (user_id, group_name, created_at) VALUES (?, 'east', ?)",
+                (user_id, now),
+            )
+            # Newest first, matching the endpoints' uploaded_at DESC ordering.
+            visible = self.app_module._filter_contract_visibility(
+                conn, contract_ids[::-1], [role_ids[0]], [], ["east"], False
+            )
+        self.assertGreater(len(visible), 6)
+        self.assertLess(len(visible), len(contract_ids))
+
+        client = TestClient(self.app_module.app)
+        res = client.post("/api/auth/login", json={"email": "viewer@example.com", "password": "secret"})
+        self.assertEqual(res.status_code, 200)
+
+        first = client.get("/api/contracts?limit=3&offset=0&include_tags=false").json()
+        second = client.get("/api/contracts?limit=3&offset=3&include_tags=false").json()
+        self.assertEqual([item["id"] for item in first + second], visible[:6])
+
+        found = client.get("/api/search?mode=quick&q=Contract&limit=4").json()
+        self.assertEqual([item["id"] for item in found], visible[:4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import db_pool
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "pool.db")
+        with db_pool.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.execute("INSERT INTO items (name) VALUES ('first')")
+
+    def tearDown(self):
+        db_pool.close_pools()
+        self.temp_dir.cleanup()
+
+    def test_connections_are_tuned_and_reused(self):
+        with db_pool.connect(self.db_path) as conn:
+            first_id = id(conn)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(
+                conn.execute("PRAGMA busy_timeout").fetchone()[0],
+                db_pool.SQLITE_BUSY_TIMEOUT_MS,
+            )
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+            self.assertEqual(conn.execute("SELECT name FROM items").fetchone()["name"], "first")
+
+        with db_pool.connect(self.db_path) as conn:
+            self.assertEqual(id(conn), first_id)
+
+    def test_failed_block_rolls_back_before_reuse(self):
+        with self.assertRaises(RuntimeError):
+            with db_pool.connect(self.db_path) as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('discarded')")
+                raise RuntimeError("boom")
+
+        with db_pool.connect(self.db_path) as conn:
+            self.assertFalse(conn.in_transaction)
+            count = conn.execute("SELECT COUNT(1) FROM items").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_readers_are_not_blocked_by_open_write_transaction(self):
+        writer_started = threading.Event()
+        reader_done = threading.Event()
+        seen = []
+
+        def writer():
+            with db_pool.connect(self.db_path) as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('pending')")
+                writer_started.set()
+                reader_done.wait(timeout=5)
+
+        def reader():
+            writer_started.wait(timeout=5)
+            with db_pool.connect(self.db_path) as conn:
+                seen.append(conn.execute("SELECT COUNT(1) FROM items").fetchone()[0])
+            reader_done.set()
+
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertTrue(reader_done.is_set())
+        self.assertEqual(seen, [1])
+        with db_pool.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(1) FROM items").fetchone()[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
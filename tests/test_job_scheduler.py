@@ -0,0 +1,201 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+
+class JobSchedulerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM job_runs")
+            conn.execute("DELETE FROM job_leases")
+            conn.execute("DELETE FROM notification_logs")
+            conn.execute("DELETE FROM pending_agreement_reminders")
+
+    def _runs(self):
+        with self.app_module.db() as conn:
+            return [
+                (row["job_name"], row["status"])
+                for row in conn.execute("SELECT job_name, status FROM job_runs ORDER BY id")
+            ]
+
+    def test_lease_is_exclusive_until_released_or_expired(self):
+        acquire = self.app_module._acquire_job_lease
+        self.assertTrue(acquire("event_reminders", holder="worker-a"))
+        self.assertFalse(acquire("event_reminders", holder="worker-b"))
+        # A live lease is never re-entered, not even by the holder that owns it.
+        self.assertFalse(acquire("event_reminders", holder="worker-a"))
+
+        self.app_module._release_job_lease("event_reminders", holder="worker-b")
+        self.assertFalse(acquire("event_reminders", holder="worker-b"))
+        self.app_module._release_job_lease("event_reminders", holder="worker-a")
+        self.assertTrue(acquire("event_reminders", holder="worker-b"))
+
+        with self.app_module.db() as conn:
+            conn.execute("UPDATE job_leases SET expires_at = '2000-01-01T00:00:00Z'")
+        self.assertTrue(acquire("event_reminders", holder="worker-a"))
+
+    def test_scheduled_jobs_run_once_per_day_and_skip_leased_jobs(self):
+        today = date(2026, 3, 2)
+        outcomes = self.app_module._run_scheduled_jobs(today)
+        self.assertEqual(set(outcomes.values()), {"processed"})
+        self.assertEqual(
+            sorted(self._runs()),
+            [("event_reminders", "processed"), ("pending_agreement_reminders", "processed")],
+        )
+
+        again = self.app_module._run_scheduled_jobs(today)
+        self.assertEqual(set(again.values()), {"up_to_date"})
+        self.assertEqual(len(self._runs()), 2)
+
+        # Another worker holding the lease keeps this one from running the job.
+        self.app_module._acquire_job_lease("event_reminders", holder="other-worker")
+        outcomes = self.app_module._run_scheduled_jobs(date(2026, 3, 3))
+        self.assertEqual(outcomes["event_reminders"], "leased")
+        self.assertEqual(outcomes["pending_agreement_reminders"], "processed")
+        with self.app_module.db() as conn:
+            holders = [row["holder"] for row in conn.execute("SELECT holder FROM job_leases")]
+        self.assertEqual(holders, ["other-worker"])
+
+    def test_manual_and_scheduled_runs_send_once_per_day(self):
+        self._add_daily_digest()
+        client = TestClient(self.app_module.app)
+
+        first = client.post("/api/pending-agreement-reminders/send").json()
+        self.assertEqual((first["status"], first["queued"]), ("processed", 1))
+        self.assertEqual(client.post("/api/pending-agreement-reminders/send").json()["status"], "up_to_date")
+        outcomes = self.app_module._run_scheduled_jobs(date.today())
+        self.assertEqual(outcomes["pending_agreement_reminders"], "up_to_date")
+
+        # The event reminder endpoint takes the same lease as the scheduler.
+        self.app_module._acquire_job_lease("event_reminders", holder="other-worker")
+        self.assertEqual(client.post("/api/reminders/send").json()["status"], "leased")
+
+        with self.app_module.db() as conn:
+            sent = conn.execute(
+                "SELECT COUNT(1) FROM notification_logs WHERE kind = 'pending_agreement_reminder'"
+            ).fetchone()[0]
+        self.assertEqual(sent, 1)
+        pending_runs = [run for run in self._runs() if run[0] == "pending_agreement_reminders"]
+        self.assertEqual(pending_runs, [("pending_agreement_reminders", "processed")])
+
+    def _add_daily_digest(self):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO pending_agreement_reminders
+                  (id, frequency, roles_json, recipients_json, message, created_at, updated_at)
+                VALUES ('r1', 'daily', '[]', '["legal@example.com"]', 'Daily digest', ?, ?)
+                """,
+                (now, now),
+            )
+
+    def test_concurrent_runs_in_one_process_send_one_digest(self):
+        self._add_daily_digest()
+        job_name = "pending_agreement_reminders"
+        runner = self.app_module.SCHEDULED_JOBS[job_name]
+
+        def slow_runner(today):
+            time.sleep(0.3)
+            return runner(today)
+
+        barrier = threading.Barrier(2)
+        statuses = []
+
+        def run():
+            barrier.wait()
+            statuses.append(self.app_module._run_scheduled_job(job_name, date.today())["status"])
+
+        with patch.dict(self.app_module.SCHEDULED_JOBS, {job_name: slow_runner}):
+            threads = [threading.Thread(target=run) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(statuses), ["leased", "processed"])
+        with self.app_module.db() as conn:
+            sent = conn.execute(
+                "SELECT COUNT(1) FROM notification_logs WHERE kind = 'pending_agreement_reminder'"
+            ).fetchone()[0]
+            leases = conn.execute("SELECT COUNT(1) FROM job_leases").fetchone()[0]
+        self.assertEqual(sent, 1)
+        self.assertEqual(leases, 0)
+
+    def test_long_runs_renew_their_lease(self):
+        job_name = "event_reminders"
+        expiries = []
+
+        def read_expiry():
+            with self.app_module.db() as conn:
+                return conn.execute(
+                    "SELECT expires_at FROM job_leases WHERE job_name = ?", (job_name,)
+                ).fetchone()["expires_at"]
+
+        def slow_runner(today):
+            expiries.append(read_expiry())
+            time.sleep(1.5)
+            expiries.append(read_expiry())
+            return {"through": today.isoformat()}
+
+        with patch.object(self.app_module, "JOB_LEASE_SECONDS", 3), patch.dict(
+            self.app_module.SCHEDULED_JOBS, {job_name: slow_runner}
+        ):
+            outcome = self.app_module._run_scheduled_job(job_name, date(2026, 3, 2))
+
+        self.assertEqual(outcome["status"], "processed")
+        self.assertGreater(expiries[1], expiries[0])
+
+    def test_status_endpoint_reports_recent_runs_and_durations(self):
+        self.app_module._run_scheduled_jobs(date(2026, 3, 2))
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                UPDATE job_runs
+                SET started_at = '2026-03-02T08:00:00Z', finished_at = '2026-03-02T08:00:03Z'
+                WHERE job_name = 'event_reminders'
+                """
+            )
+        client = TestClient(self.app_module.app)
+        client.post("/api/auth/login", json={"email": "admin@local.com", "password": "password"})
+        data = client.get("/api/jobs/status").json()
+
+        jobs = {job["job_name"]: job for job in data["jobs"]}
+        reminders = jobs["event_reminders"]
+        self.assertEqual(reminders["last_run"]["status"], "processed")
+        self.assertEqual(reminders["last_run"]["detail"]["through"], "2026-03-02")
+        self.assertEqual(reminders["average_duration_seconds"], 3.0)
+        self.assertEqual(reminders["last_success_at"], "2026-03-02T08:00:03Z")
+        self.assertIsNone(reminders["lease"])
+        self.assertEqual(len(jobs["pending_agreement_reminders"]["recent_runs"]), 1)
+
+        self.assertEqual(TestClient(self.app_module.app).get("/api/jobs/status").status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
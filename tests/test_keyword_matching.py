@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+
+class KeywordMatchingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+        cls.client = TestClient(cls.app_module.app)
+        res = cls.client.post(
+            "/api/auth/login", json={"email": "admin@local.com", "password": "password"}
+        )
+        assert res.status_code == 200
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _keyword_queries(self, func, *args):
+        statements = []
+        original_db = self.app_module.db
+
+        def tracing_db():
+            conn = original_db()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        self.app_module.db = tracing_db
+        try:
+            result = func(*args)
+        finally:
+            self.app_module.db = original_db
+        return result, len([sql for sql in statements if "_keywords" in sql])
+
+    def test_longest_keyword_wins_and_type_names_are_a_fallback(self):
+        detect = self.app_module.detect_agreement_type
+        self.assertEqual(
+            detect("This Mutual Non-Disclosure Agreement is confidential.", "scan.pdf"),
+            "Mutual Non Disclosure Agreement",
+        )
+        self.assertEqual(detect("Nothing relevant here.", "SOW-2026.pdf"), "Statement of Work")
+        self.assertEqual(detect("Plain text.", "scan.pdf"), "Uncategorized")
+
+    def test_matcher_is_cached_until_keywords_change(self):
+        detect = self.app_module.detect_agreement_type
+        detect("warm up", "scan.pdf")
+        result, queries = self._keyword_queries(detect, "A widget supply deal.", "scan.pdf")
+        self.assertEqual((result, queries), ("Uncategorized", 0))
+
+        with self.app_module.db() as conn:
+            type_id = conn.execute(
+                "SELECT id FROM agreement_types WHERE name = 'Order Form'"
+            ).fetchone()["id"]
+        res = self.client.post(
+            "/api/agreement-type-keywords",
+            json={"agreement_type_id": type_id, "keyword": "widget supply"},
+        )
+        self.assertEqual(res.status_code, 200)
+        result, queries = self._keyword_queries(detect, "A widget supply deal.", "scan.pdf")
+        self.assertEqual(result, "Order Form")
+        self.assertGreater(queries, 0)
+
+        self.client.delete(f"/api/agreement-type-keywords/{res.json()['id']}")
+        self.assertEqual(detect("A widget supply deal.", "scan.pdf"), "Uncategorized")
+
+    def test_auto_tags_are_inserted_once_per_matching_tag(self):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO contracts
+                  (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                VALUES ('k1', 'Lease', 'k1.pdf', 'k1', 'k1.pdf', 'application/pdf', ?, 'processed')
+                """,
+                (now,),
+            )
+        text = "CONFIDENTIAL lease of the premises and property; offer letter attached."
+        self.app_module.auto_tag_contract("k1", text)
+        self.app_module.auto_tag_contract("k1", text)
+        with self.app_module.db() as conn:
+            names = [
+                row["name"]
+                for row in conn.execute(
+                    """
+                    SELECT t.name FROM contract_tags ct JOIN tags t ON t.id = ct.tag_id
+                    WHERE ct.contract_id = 'k1' ORDER BY t.name
+                    """
+                )
+            ]
+        self.assertEqual(names, ["Confidential", "Employment", "Real Estate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+
+class NotificationLogTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+        cls.client = TestClient(cls.app_module.app)
+        res = cls.client.post(
+            "/api/auth/login", json={"email": "admin@local.com", "password": "password"}
+        )
+        assert res.status_code == 200
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.app_module._notification_log_total_cache.clear()
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM notification_logs")
+            conn.execute("INSERT INTO notification_logs_fts(notification_logs_fts) VALUES ('rebuild')")
+
+    def _log(self, count):
+        with self.app_module.db() as conn:
+            for i in range(count):
+                self.app_module._enqueue_notification(
+                    conn,
+                    [f"person{i}@example.com"],
+                    f"Renewal notice {i}",
+                    f"Contract number {i} renews soon.",
+                    kind="reminder" if i % 2 else "task_nudge",
+                    related_id=f"event-{i}",
+                )
+            # Several rows share a timestamp so the id tie-break is exercised.
+            conn.execute(
+                "UPDATE notification_logs SET created_at = '2026-01-0' || (rowid % 3 + 1) || 'T00:00:00Z'"
+            )
+
+    def test_concurrent_enqueues_get_distinct_sequence_numbers(self):
+        errors = []
+
+        def enqueue_second():
+            try:
+                with self.app_module.db() as conn:
+                    self.app_module._enqueue_notification(
+                        conn, ["b@example.com"], "Second", "Second body", kind="reminder"
+                    )
+            except Exception as exc:
+                errors.append(exc)
+
+        with self.app_module.db() as conn:
+            self.app_module._enqueue_notification(
+                conn, ["a@example.com"], "First", "First body", kind="reminder"
+            )
+            # The second enqueue starts while the first transaction is still open.
+            second = threading.Thread(target=enqueue_second)
+            second.start()
+            time.sleep(0.3)
+        second.join()
+
+        self.assertEqual(errors, [])
+        with self.app_module.db() as conn:
+            rows = conn.execute(
+                "SELECT subject, log_seq FROM notification_logs ORDER BY log_seq"
+            ).fetchall()
+            indexed = conn.execute(
+                "SELECT rowid FROM notification_logs_fts WHERE notification_logs_fts MATCH 'body'"
+            ).fetchall()
+        self.assertEqual([row["subject"] for row in rows], ["First", "Second"])
+        self.assertEqual(len({row["log_seq"] for row in rows}), 2)
+        self.assertEqual(sorted(r[0] for r in indexed), [row["log_seq"] for row in rows])
+
+    def test_keyset_pages_cover_every_row_once(self):
+        self._log(7)
+        seen = []
+        cursor = None
+        for _ in range(5):
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get("/api/notification-logs", params=params).json()
+            self.assertEqual(data["total"], 7)
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        with self.app_module.db() as conn:
+            expected = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM notification_logs ORDER BY created_at DESC, id DESC"
+                )
+            ]
+        self.assertEqual(seen, expected)
+
+    def test_search_uses_full_text_index(self):
+        self._log(4)
+        data = self.client.get(
+            "/api/notification-logs", params={"query": "person3@example.com"}
+        ).json()
+        self.assertEqual([item["subject"] for item in data["items"]], ["Renewal notice 3"])
+        self.assertEqual(data["total"], 1)
+
+        data = self.client.get(
+            "/api/notification-logs", params={"query": "renew", "kind": "reminder"}
+        ).json()
+        self.assertEqual(data["total"], 2)
+
+    def test_migration_rebuilds_index_for_existing_rows(self):
+        self._log(2)
+        with self.app_module.db() as conn:
+            conn.execute("DROP TABLE notification_logs_fts")
+            self.app_module._apply_migrations(conn)
+        data = self.client.get("/api/notification-logs", params={"query": "event 1"}).json()
+        self.assertEqual([item["related_id"] for item in data["items"]], ["event-1"])
+
+    def test_index_survives_vacuum_renumbering_rowids(self):
+        self._log(3)
+        with self.app_module.db() as conn:
+            first = conn.execute(
+                "SELECT id, log_seq, subject, recipients_json, body, kind, related_id, metadata_json"
+                " FROM notification_logs WHERE related_id = 'event-0'"
+            ).fetchone()
+            conn.execute(
+                """
+                INSERT INTO notification_logs_fts (
+                  notification_logs_fts, rowid, subject, recipients_json, body, kind,
+                  related_id, metadata_json
+                )
+                VALUES ('delete', ?, ?, ?, ?, ?, ?, ?)
+                """,
+                tuple(first)[1:],
+            )
+            conn.execute("DELETE FROM notification_logs WHERE id = ?", (first["id"],))
+            conn.commit()
+            conn.execute("VACUUM")
+        data = self.client.get("/api/notification-logs", params={"query": "event 2"}).json()
+        self.assertEqual([item["related_id"] for item in data["items"]], ["event-2"])
+
+    def test_migration_keys_old_index_on_log_seq(self):
+        self._log(2)
+        with self.app_module.db() as conn:
+            conn.executescript(
+                """
+                DROP TABLE notification_logs_fts;
+                CREATE VIRTUAL TABLE notification_logs_fts USING fts5(
+                  subject, recipients_json, body, kind, related_id, metadata_json,
+                  content='notification_logs', content_rowid='rowid'
+                );
+                """
+            )
+            self.app_module._apply_migrations(conn)
+        data = self.client.get("/api/notification-logs", params={"query": "event 1"}).json()
+        self.assertEqual([item["related_id"] for item in data["items"]], ["event-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
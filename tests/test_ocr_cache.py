@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import processor
+
+
+class OcrCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "ocr_cache")
+        self.counters = patch.dict(
+            processor._ocr_cache_counters,
+            {"hits": 0, "misses": 0, "writes": 0, "evictions": 0},
+        )
+        self.counters.start()
+        processor._ocr_cache_sizes.pop(self.cache_dir, None)
+
+    def tearDown(self):
+        self.counters.stop()
+        processor._ocr_cache_sizes.pop(self.cache_dir, None)
+        self.temp_dir.cleanup()
+
+    def _path(self, page_number: int) -> str:
+        return processor._ocr_cache_path(self.cache_dir, "abc", page_number, 300, "5.3.0", "eng")
+
+    def test_get_put_round_trip_updates_counters(self):
+        path = self._path(1)
+        self.assertIsNone(processor._ocr_cache_get(path))
+        processor._ocr_cache_put(self.cache_dir, path, "page one", 0)
+        self.assertEqual(processor._ocr_cache_get(path), "page one")
+        self.assertEqual(
+            processor._ocr_cache_counters,
+            {"hits": 1, "misses": 1, "writes": 1, "evictions": 0},
+        )
+
+    def test_size_is_counted_once_per_write(self):
+        path = self._path(1)
+        processor._ocr_cache_put(self.cache_dir, path, "x" * 1000, 0)
+        self.assertEqual(processor._ocr_cache_sizes[self.cache_dir], 1000)
+
+        processor._ocr_cache_put(self.cache_dir, path, "y" * 400, 0)
+        self.assertEqual(processor._ocr_cache_sizes[self.cache_dir], 400)
+
+        processor._ocr_cache_put(self.cache_dir, self._path(2), "z" * 100, 0)
+        self.assertEqual(processor._ocr_cache_sizes[self.cache_dir], 500)
+
+    def test_eviction_drops_least_recently_used_entries(self):
+        paths = [self._path(n) for n in range(1, 4)]
+        for age, path in zip((300, 200, 100), paths):
+            processor._ocr_cache_put(self.cache_dir, path, "x" * 400, 0)
+            stamp = os.path.getmtime(path) - age
+            os.utime(path, (stamp, stamp))
+        # A hit refreshes the oldest entry so the second one is evicted instead.
+        self.assertIsNotNone(processor._ocr_cache_get(paths[0]))
+
+        processor._ocr_cache_put(self.cache_dir, self._path(4), "x" * 400, 1500)
+
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[2]))
+        self.assertEqual(processor._ocr_cache_counters["evictions"], 1)
+        self.assertEqual(processor._ocr_cache_sizes[self.cache_dir], 1200)
+
+    def test_admin_endpoint_reports_cache_stats(self):
+        processor._ocr_cache_put(self.cache_dir, self._path(1), "x" * 250, 0)
+        processor._ocr_cache_get(self._path(1))
+        processor._ocr_cache_get(self._path(2))
+
+        with patch.dict(
+            os.environ,
+            {
+                "CONTRACT_DB": os.path.join(self.temp_dir.name, "test.db"),
+                "CONTRACT_DATA": os.path.join(self.temp_dir.name, "data"),
+                "AUTH_REQUIRED": "false",
+                "OCR_CACHE_DIR": self.cache_dir,
+                "OCR_CACHE_MAX_MB": "1",
+            },
+        ):
+            import importlib
+            import app as app_module
+
+            app_module = importlib.reload(app_module)
+            app_module.init_db()
+            res = TestClient(app_module.app).get("/api/admin/ocr-cache")
+
+        self.assertEqual(res.status_code, 200)
+        stats = res.json()
+        self.assertTrue(stats["enabled"])
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["size_bytes"], 250)
+        self.assertEqual(stats["max_bytes"], 1024 * 1024)
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual((stats["hits"], stats["misses"], stats["writes"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+
+class OcrQueueTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(cls.temp_dir.name, "test.db")
+        data_path = os.path.join(cls.temp_dir.name, "data")
+        os.environ["CONTRACT_DB"] = db_path
+        os.environ["CONTRACT_DATA"] = data_path
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+        cls.client = TestClient(cls.app_module.app)
+        res = cls.client.post(
+            "/api/auth/login", json={"email": "admin@local.com", "password": "password"}
+        )
+        assert res.status_code == 200
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM job_runs")
+
+    def _upload(self, content):
+        res = self.client.post(
+            "/api/contracts/upload",
+            files={"file": ("contract.txt", BytesIO(content), "text/plain")},
+        )
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def _run_next_job(self):
+        job = self.app_module._claim_next_ocr_job()
+        self.assertIsNotNone(job)
+        self.app_module._run_ocr_job(job["id"], job["contract_id"])
+
+    def test_upload_is_queued_and_worker_marks_processed(self):
+        payload = self._upload(b"queued contract body")
+        self.assertEqual(payload["status"], "queued")
+        contract_id = payload["contract_id"]
+
+        status = self.client.get(f"/api/contracts/{contract_id}/status").json()
+        self.assertEqual(status["status"], "queued")
+        self.assertEqual(status["progress"], 0)
+        self.assertEqual(status["job"]["queue_position"], 1)
+
+        def fake_process_contract(**kwargs):
+            kwargs["progress_callback"](1, 2)
+            with self.app_module.db() as conn:
+                row = conn.execute(
+                    "SELECT progress FROM job_runs WHERE contract_id = ?", (contract_id,)
+                ).fetchone()
+                self.assertEqual(row["progress"], 50)
+            kwargs["progress_callback"](2, 2)
+            return {"ocr_text": "This Non-Disclosure Agreement", "pages_ocrd": 2}
+
+        with patch.object(self.app_module, "process_contract", side_effect=fake_process_contract):
+            self._run_next_job()
+
+        status = self.client.get(f"/api/contracts/{contract_id}/status").json()
+        self.assertEqual(status["status"], "processed")
+        self.assertEqual(status["progress"], 100)
+        self.assertEqual(status["job"]["status"], "processed")
+        self.assertIsNone(self.app_module._claim_next_ocr_job())
+
+    def test_workers_are_woken_after_the_job_commits(self):
+        app_module = self.app_module
+        claimable = []
+
+        class RecordingEvent:
+            def set(self):
+                # What a worker woken right now would find on its own connection.
+                claimable.append(app_module._claim_next_ocr_job() is not None)
+
+        with patch.object(app_module, "_ocr_wakeup", RecordingEvent()):
+            self._upload(b"wake-up contract body")
+
+        self.assertEqual(claimable, [True])
+
+    def test_failed_job_reports_error(self):
+        contract_id = self._upload(b"failing contract body")["contract_id"]
+
+        with patch.object(
+            self.app_module, "process_contract", side_effect=RuntimeError("tesseract missing")
+        ):
+            self._run_next_job()
+
+        status = self.client.get(f"/api/contracts/{contract_id}/status").json()
+        self.assertEqual(status["status"], "error")
+        self.assertEqual(status["job"]["status"], "error")
+        self.assertIn("tesseract missing", status["job"]["detail"])
+
+    def test_only_jobs_without_a_live_heartbeat_are_requeued(self):
+        live_id = self._upload(b"contract on a live worker")["contract_id"]
+        dead_id = self._upload(b"contract on a dead worker")["contract_id"]
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                UPDATE job_runs
+                SET status = 'processing', claimed_by = 'other-worker',
+                    heartbeat_at = CASE contract_id WHEN ? THEN ? ELSE '2000-01-01T00:00:00Z' END
+                """,
+                (live_id, self.app_module.now_iso()),
+            )
+            conn.execute("UPDATE contracts SET status = 'processing'")
+            self.assertEqual(self.app_module._requeue_stale_ocr_jobs(conn), 1)
+            statuses = {
+                row["id"]: row["status"]
+                for row in conn.execute("SELECT id, status FROM contracts WHERE id IN (?, ?)", (live_id, dead_id))
+            }
+        self.assertEqual(statuses, {live_id: "processing", dead_id: "queued"})
+
+        job = self.app_module._claim_next_ocr_job()
+        self.assertEqual(job["contract_id"], dead_id)
+        self.assertIsNone(self.app_module._claim_next_ocr_job())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,6 @@ import os
 import tempfile
 import unittest
 from io import BytesIO
-from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
@@ -37,7 +36,12 @@ class PendingAgreementTests(unittest.TestCase):
             conn.execute("DELETE FROM pending_agreement_notes")
             conn.execute("DELETE FROM pending_agreements")
             conn.execute("DELETE FROM auth_sessions")
-            conn.execute("DELETE FROM auth_user_roles")
+            conn.execute(
+                """
+                DELETE FROM auth_user_roles
+                WHERE user_id NOT IN (SELECT id FROM auth_users WHERE email = 'admin@local.com')
+                """
+            )
             conn.execute("DELETE FROM auth_users WHERE email NOT IN ('admin@local.com')")
 
     def _create_user(self, email, name, password="secret"):
@@ -63,24 +67,29 @@ class PendingAgreementTests(unittest.TestCase):
         client = self.client
         self._login(client, "requester@example.com", "secret")
 
-        with patch.object(self.app_module, "_send_email") as send_email:
-            res = client.post(
-                "/api/pending-agreements/intake",
-                data={
-                    "internal_company": "Acme LLC",
-                    "team_member": "Requester One",
-                    "requester_email": "requester@example.com",
-                    "attorney_assigned": "legal@acme.com",
-                    "matter": "Vendor NDA",
-                    "status_notes": "Need review ASAP.",
-                },
-            )
-            self.assertEqual(res.status_code, 200)
-            payload = res.json()
-            self.assertEqual(payload["status"], "Pending Legal Review")
-            self.assertEqual(payload["matter"], "Vendor NDA")
-            self.assertIsNone(payload.get("file"))
-            self.assertGreaterEqual(send_email.call_count, 1)
+        res = client.post(
+            "/api/pending-agreements/intake",
+            data={
+                "internal_company": "Acme LLC",
+                "team_member": "Requester One",
+                "requester_email": "requester@example.com",
+                "attorney_assigned": "legal@acme.com",
+                "matter": "Vendor NDA",
+                "status_notes": "Need review ASAP.",
+            },
+        )
+        self.assertEqual(res.status_code, 200)
+        payload = res.json()
+        self.assertEqual(payload["status"], "Pending Legal Review")
+        self.assertEqual(payload["matter"], "Vendor NDA")
+        self.assertIsNone(payload.get("file"))
+
+        with self.app_module.db() as conn:
+            queued = conn.execute(
+                "SELECT COUNT(1) AS count FROM notification_logs WHERE related_id = ? AND status = 'queued'",
+                (payload["id"],),
+            ).fetchone()
+            self.assertGreaterEqual(queued["count"], 1)
 
         with self.app_module.db() as conn:
             row = conn.execute(
@@ -92,34 +101,33 @@ class PendingAgreementTests(unittest.TestCase):
         self._create_user("user1@example.com", "User One", "secret")
         self._create_user("user2@example.com", "User Two", "secret")
 
-        with patch.object(self.app_module, "_send_email"):
-            client1 = self.client
-            self._login(client1, "user1@example.com", "secret")
-            client1.post(
-                "/api/pending-agreements/intake",
-                data={
-                    "internal_company": "Entity A",
-                    "team_member": "User One",
-                    "requester_email": "user1@example.com",
-                    "attorney_assigned": "",
-                    "matter": "Lease Agreement",
-                    "status_notes": "Initial draft.",
-                },
-            )
+        client1 = self.client
+        self._login(client1, "user1@example.com", "secret")
+        client1.post(
+            "/api/pending-agreements/intake",
+            data={
+                "internal_company": "Entity A",
+                "team_member": "User One",
+                "requester_email": "user1@example.com",
+                "attorney_assigned": "",
+                "matter": "Lease Agreement",
+                "status_notes": "Initial draft.",
+            },
+        )
 
-            client2 = TestClient(self.app_module.app)
-            self._login(client2, "user2@example.com", "secret")
-            client2.post(
-                "/api/pending-agreements/intake",
-                data={
-                    "internal_company": "Entity B",
-                    "team_member": "User Two",
-                    "requester_email": "user2@example.com",
-                    "attorney_assigned": "",
-                    "matter": "Master Services Agreement",
-                    "status_notes": "Please review.",
-                },
-            )
+        client2 = TestClient(self.app_module.app)
+        self._login(client2, "user2@example.com", "secret")
+        client2.post(
+            "/api/pending-agreements/intake",
+            data={
+                "internal_company": "Entity B",
+                "team_member": "User Two",
+                "requester_email": "user2@example.com",
+                "attorney_assigned": "",
+                "matter": "Master Services Agreement",
+                "status_notes": "Please review.",
+            },
+        )
 
         res_user1 = client1.get("/api/pending-agreements")
         self.assertEqual(res_user1.status_code, 200)
@@ -133,24 +141,64 @@ class PendingAgreementTests(unittest.TestCase):
         self.assertEqual(res_admin.status_code, 200)
         self.assertGreaterEqual(res_admin.json()["total"], 2)
 
+    def test_list_paginates_in_sql_with_latest_note(self):
+        self._create_user("user1@example.com", "User One", "secret")
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            for i in range(7):
+                email = "user1@example.com" if i % 2 == 0 else "other@example.com"
+                conn.execute(
+                    """
+                    INSERT INTO pending_agreements
+                      (id, title, owner, owner_email, requester_email, matter, created_at, updated_at)
+                    VALUES (?, ?, 'Someone', ?, ?, ?, ?, ?)
+                    """,
+                    (f"pa{i}", f"Matter {i}", email, email, f"Matter {i}", f"2024-01-0{i + 1}T00:00:00Z", now),
+                )
+            for pending_id, text, created_at in (
+                ("pa6", "older", "2024-02-01T00:00:00Z"),
+                ("pa6", "newest", "2024-02-02T00:00:00Z"),
+                ("pa2", "only", "2024-02-01T00:00:00Z"),
+            ):
+                conn.execute(
+                    """
+                    INSERT INTO pending_agreement_notes (pending_agreement_id, note_text, created_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (pending_id, text, created_at),
+                )
+
+        self._login(self.client, "user1@example.com", "secret")
+        first = self.client.get("/api/pending-agreements?limit=2&offset=0").json()
+        second = self.client.get("/api/pending-agreements?limit=2&offset=2").json()
+
+        self.assertEqual(first["total"], 4)
+        self.assertEqual([item["id"] for item in first["items"]], ["pa6", "pa4"])
+        self.assertEqual([item["id"] for item in second["items"]], ["pa2", "pa0"])
+        notes = {item["id"]: item["latest_note"] for item in first["items"] + second["items"]}
+        self.assertEqual(notes, {"pa6": "newest", "pa4": None, "pa2": "only", "pa0": None})
+
+        searched = self.client.get("/api/pending-agreements?query=matter%202").json()
+        self.assertEqual([item["id"] for item in searched["items"]], ["pa2"])
+        self.assertEqual(searched["total"], 1)
+
     def test_file_upload_attaches_to_pending_record(self):
         self._create_user("uploader@example.com", "Uploader", "secret")
         client = self.client
         self._login(client, "uploader@example.com", "secret")
 
-        with patch.object(self.app_module, "_send_email"):
-            res = client.post(
-                "/api/pending-agreements/intake",
-                data={
-                    "internal_company": "Entity C",
-                    "team_member": "Uploader",
-                    "requester_email": "uploader@example.com",
-                    "attorney_assigned": "",
-                    "matter": "Consulting Agreement",
-                    "status_notes": "Draft attached.",
-                },
-            )
-            agreement_id = res.json()["id"]
+        res = client.post(
+            "/api/pending-agreements/intake",
+            data={
+                "internal_company": "Entity C",
+                "team_member": "Uploader",
+                "requester_email": "uploader@example.com",
+                "attorney_assigned": "",
+                "matter": "Consulting Agreement",
+                "status_notes": "Draft attached.",
+            },
+        )
+        agreement_id = res.json()["id"]
 
         file_content = BytesIO(b"draft file content")
         res_upload = client.post(
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import processor
+
+
+SAMPLE_CONTRACT = """This Agreement is made and entered into as of the 5th day of January 2024 by and between Acme and Vendor.
+The initial term of this Agreement is three (3) years.
+This Agreement shall automatically renew unless either party gives written notice 60 days prior to renewal.
+Either party may terminate this Agreement upon 30 days written notice of termination.
+Renewal Date: 01/05/2027.
+This Agreement shall be governed by the laws of the State of Delaware."""
+
+
+class KeywordAutomatonTests(unittest.TestCase):
+    def test_reports_overlapping_and_nested_keywords(self):
+        automaton = processor.KeywordAutomaton(
+            ["termination", "termination date", "nation", "date of agreement", "of"]
+        )
+        found = automaton.find("the termination date of agreement")
+        self.assertEqual(
+            found,
+            {"termination", "termination date", "nation", "date of agreement", "of"},
+        )
+        self.assertEqual(automaton.find("nothing relevant"), set())
+
+
+class ExtractTermsTests(unittest.TestCase):
+    def test_single_pass_extracts_every_term(self):
+        extracted = processor._extract_terms(SAMPLE_CONTRACT)
+
+        self.assertEqual(extracted["effective_date"][0], "2024-01-05")
+        self.assertEqual(extracted["agreement_date"][0], "2024-01-05")
+        self.assertAlmostEqual(extracted["agreement_date"][1], 0.92)
+        self.assertEqual(extracted["renewal_date"][:2], ("2027-01-05", 0.9))
+        self.assertEqual(extracted["termination_date"], (None, 0.0, None, None, None))
+        self.assertEqual(extracted["auto_renew_opt_out_days"][:2], (60, 0.85))
+        self.assertEqual(extracted["termination_notice_days"][:2], (30, 0.86))
+        self.assertEqual(
+            extracted["governing_law"][0], "governed by the laws of the State of Delaware."
+        )
+        self.assertEqual(extracted["term_length"][0], "3 years")
+
+    def test_dates_follow_pattern_order_within_a_chunk(self):
+        extracted = processor._extract_terms(
+            "Effective date January 5, 2024 or 02/03/2023."
+        )
+        self.assertEqual(extracted["effective_date"][0], "2023-02-03")
+
+    def test_terms_carry_source_page_and_offsets(self):
+        page_texts = [
+            "Cover page\nAcme / Vendor",
+            "Recitals.\n  Renewal Date: 01/05/2027.\nMore text",
+            "This Agreement shall be governed by the laws of the State of Delaware.",
+        ]
+        extracted = processor._extract_terms(
+            "\n".join(page_texts), processor._build_page_index(page_texts)
+        )
+
+        value, _, _, page, (start, end) = extracted["renewal_date"]
+        self.assertEqual((value, page), ("2027-01-05", 2))
+        self.assertEqual(page_texts[1][start:end], "Renewal Date: 01/05/2027.")
+
+        _, _, _, page, (start, end) = extracted["governing_law"]
+        self.assertEqual(page, 3)
+        self.assertEqual(page_texts[2][start:end], page_texts[2])
+
+
+class ParseDateTests(unittest.TestCase):
+    def test_numeric_fast_path_matches_dateutil(self):
+        for raw in ["2024-01-05", "01/05/2027", "1-5-27", "12/31/99", "02/29/2024"]:
+            fast = processor._parse_numeric_date(raw)
+            self.assertIsNotNone(fast, raw)
+            self.assertEqual(fast, processor._parse_date_fuzzy(raw), raw)
+
+    def test_ambiguous_and_textual_dates_fall_back_to_dateutil(self):
+        self.assertIsNone(processor._parse_numeric_date("13/05/2020"))
+        self.assertIsNone(processor._parse_numeric_date("March 3, 2023"))
+        self.assertEqual(processor._parse_date("13/05/2020"), "2020-05-13")
+        self.assertEqual(processor._parse_date("March 3, 2023"), "2023-03-03")
+        self.assertIsNone(processor._parse_date("02/30/2024"))
+
+
+class ProcessContractPersistenceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(self.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(self.temp_dir.name, "data")
+
+        import importlib
+        import app as app_module
+
+        self.app_module = importlib.reload(app_module)
+        self.app_module.init_db()
+        self.stored_path = os.path.join(self.temp_dir.name, "contract.pdf")
+        with open(self.stored_path, "wb") as handle:
+            handle.write(b"%PDF")
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO contracts
+                  (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                VALUES ('c1', 'Sample', 'contract.pdf', 'abc', ?, 'application/pdf', ?, 'queued')
+                """,
+                (self.stored_path, self.app_module.now_iso()),
+            )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _process(self, page_texts, progress_callback=None):
+        with patch.object(processor, "_test_poppler"), patch.object(
+            processor, "_pdf_page_count", return_value=len(page_texts)
+        ), patch.object(processor, "_extract_text_layer", return_value=page_texts):
+            return processor.process_contract(
+                self.app_module.DB_PATH,
+                "c1",
+                self.stored_path,
+                "tesseract",
+                progress_callback=progress_callback,
+            )
+
+    def _counts(self):
+        with self.app_module.db() as conn:
+            return tuple(
+                conn.execute(f"SELECT COUNT(1) FROM {table} WHERE contract_id = 'c1'").fetchone()[0]
+                for table in ("ocr_pages", "term_instances", "events")
+            )
+
+    def test_reprocessing_replaces_results_in_one_transaction(self):
+        self._process(SAMPLE_CONTRACT.split("\n"))
+        first = self._counts()
+        self.assertEqual(first[0], 6)
+        self.assertGreater(first[1], 0)
+
+        seen_during_run = []
+        self._process(
+            ["Cover page text only, nothing else here."] * 2,
+            progress_callback=lambda done, total: seen_during_run.append(self._counts()),
+        )
+
+        self.assertEqual(seen_during_run, [first, first])
+        self.assertEqual(self._counts(), (2, 0, 0))
+        with self.app_module.db() as conn:
+            row = conn.execute("SELECT status, pages FROM contracts WHERE id = 'c1'").fetchone()
+        self.assertEqual((row["status"], row["pages"]), ("processed", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest.mock import patch
+
+from PIL import Image
+
+import processor
+
+
+def _page(number: int) -> Image.Image:
+    # The page number is carried in the image width so the fake OCR can report it.
+    return Image.new("L", (number, 4), color=255)
+
+
+def _fake_ocr(img, lang="eng"):
+    # Later pages finish first, so ordering has to come from _ocr_pages itself.
+    time.sleep(0.02 / img.size[0])
+    return f"page {img.size[0]}"
+
+
+def _ppm(number: int) -> bytes:
+    buffer = BytesIO()
+    _page(number).save(buffer, format="PPM")
+    return buffer.getvalue()
+
+
+class OcrPagesTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        patcher = patch.object(processor, "_get_ocr_pool", return_value=self.pool)
+        self.get_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+        ocr = patch.object(processor, "_ocr_image", side_effect=_fake_ocr)
+        ocr.start()
+        self.addCleanup(ocr.stop)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_pool_results_keep_page_order(self):
+        pages = [_page(n) for n in range(1, 13)]
+        texts = list(processor._ocr_pages(pages, "tesseract", workers=4))
+        self.assertEqual(texts, [f"page {n}" for n in range(1, 13)])
+
+    def test_in_flight_pages_are_capped_and_closed(self):
+        consumed = []
+
+        def images():
+            for n in range(1, 31):
+                img = _page(n)
+                consumed.append(img)
+                yield img
+
+        closed = []
+        original_close = Image.Image.close
+
+        def tracking_close(img):
+            closed.append(id(img))
+            original_close(img)
+
+        in_flight = []
+        with patch.object(Image.Image, "close", tracking_close):
+            results = processor._ocr_pages(images(), "tesseract", workers=64)
+            for yielded, _ in enumerate(results, start=1):
+                in_flight.append(len(consumed) - yielded + 1)
+                # Every page handed to the pool has already been released.
+                self.assertTrue(all(id(img) in closed for img in consumed))
+
+        self.assertEqual(len(consumed), 30)
+        self.assertLessEqual(max(in_flight), processor.OCR_MAX_PAGES_IN_FLIGHT)
+        self.get_pool.assert_called_once_with(processor.OCR_MAX_PAGES_IN_FLIGHT, "tesseract")
+
+    def test_palette_images_are_converted_before_submit(self):
+        img = Image.new("P", (3, 4))
+        self.assertEqual(list(processor._ocr_pages([img], "tesseract", workers=2)), ["page 3"])
+
+
+# A digital page: enough running text to skip OCR.
+PAGE_TEXT = (
+    "This Agreement is made between Acme Corporation and Vendor LLC.\n"
+    "The initial term of this Agreement is three years from the Effective Date,\n"
+    "and it renews automatically unless either party gives written notice."
+)
+# A scanned page whose only text is the e-signature envelope stamp.
+STAMP_TEXT = "DocuSign Envelope ID: 3F2504E0-4F89-11D3-9A0C-0305E82C3301\n"
+
+
+class TextLayerTests(unittest.TestCase):
+    LONG = PAGE_TEXT
+
+    def _run(self, stdout=b"", side_effect=None):
+        result = subprocess.CompletedProcess([], 0, stdout=stdout, stderr=b"")
+        with patch.object(processor.subprocess, "run", return_value=result, side_effect=side_effect) as run:
+            pages = processor._extract_text_layer("contract.pdf", 4, None)
+        return pages, run
+
+    def test_short_and_empty_pages_fall_back_to_ocr(self):
+        stdout = f"{self.LONG}\f\fPage 3\f{self.LONG}\f".encode("utf-8")
+        pages, run = self._run(stdout)
+        self.assertEqual(pages, [self.LONG, "", "", self.LONG])
+        cmd = run.call_args.args[0]
+        self.assertEqual(cmd[1:5], ["-f", "1", "-l", "4"])
+        self.assertEqual(run.call_count, 1)
+
+    def test_scanned_page_with_an_id_stamp_is_ocrd(self):
+        stdout = f"{STAMP_TEXT}\f{STAMP_TEXT}{self.LONG}\f{STAMP_TEXT}Page 3 of 4\f\f".encode("utf-8")
+        pages, _ = self._run(stdout)
+        self.assertEqual(pages, ["", f"{STAMP_TEXT}{self.LONG}", "", ""])
+
+    def test_missing_trailing_pages_are_padded(self):
+        pages, _ = self._run(f"{self.LONG}\f".encode("utf-8"))
+        self.assertEqual(pages, [self.LONG, "", "", ""])
+
+    def test_pdftotext_failure_sends_every_page_to_ocr(self):
+        pages, _ = self._run(side_effect=subprocess.CalledProcessError(1, "pdftotext"))
+        self.assertEqual(pages, ["", "", "", ""])
+
+
+class IterPdfPagesTests(unittest.TestCase):
+    def test_one_pdftoppm_call_per_requested_page(self):
+        def fake_run(cmd, **kwargs):
+            page_number = int(cmd[cmd.index("-f") + 1])
+            return subprocess.CompletedProcess(cmd, 0, stdout=_ppm(page_number), stderr=b"")
+
+        with patch.object(processor.subprocess, "run", side_effect=fake_run) as run, patch.object(
+            processor, "pdfinfo_from_path"
+        ) as pdfinfo:
+            images = list(processor._iter_pdf_pages("contract.pdf", [2, 5], 200, "/opt/poppler"))
+
+        self.assertEqual([img.size[0] for img in images], [2, 5])
+        self.assertEqual(run.call_count, 2)
+        first = run.call_args_list[0].args[0]
+        self.assertEqual(first[0], os.path.join("/opt/poppler", "pdftoppm.exe" if os.name == "nt" else "pdftoppm"))
+        self.assertEqual(first[1:], ["-r", "200", "-f", "2", "-l", "2", "contract.pdf"])
+        pdfinfo.assert_not_called()
+        self.assertEqual(run.call_args.kwargs["timeout"], processor.POPPLER_TIMEOUT_SECONDS)
+
+    def test_hung_pdftoppm_fails_instead_of_blocking(self):
+        timeout = subprocess.TimeoutExpired("pdftoppm", processor.POPPLER_TIMEOUT_SECONDS)
+        with patch.object(processor.subprocess, "run", side_effect=timeout):
+            with self.assertRaisesRegex(RuntimeError, "pdftoppm timed out .* page 3"):
+                list(processor._iter_pdf_pages("contract.pdf", [3], 200, None))
+
+
+class TextLayerFastPathTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        os.environ["CONTRACT_DB"] = os.path.join(self.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(self.temp_dir.name, "data")
+
+        import importlib
+        import app as app_module
+
+        self.app_module = importlib.reload(app_module)
+        self.app_module.init_db()
+        self.stored_path = os.path.join(self.temp_dir.name, "contract.pdf")
+        with open(self.stored_path, "wb") as handle:
+            handle.write(b"%PDF")
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO contracts
+                  (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                VALUES ('c1', 'Sample', 'contract.pdf', 'abc', ?, 'application/pdf', ?, 'queued')
+                """,
+                (self.stored_path, self.app_module.now_iso()),
+            )
+
+    def test_only_pages_without_a_text_layer_are_ocrd(self):
+        layer = PAGE_TEXT
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(os.path.basename(cmd[0]))
+            if calls[-1].startswith("pdftotext"):
+                stdout = f"{layer}\f{STAMP_TEXT}\f{layer}\f\f".encode("utf-8")
+            else:
+                stdout = _ppm(int(cmd[cmd.index("-f") + 1]))
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=b"")
+
+        with patch.object(processor, "_test_poppler"), patch.object(
+            processor, "_pdf_page_count", return_value=4
+        ), patch.object(processor.subprocess, "run", side_effect=fake_run), patch.object(
+            processor, "_ocr_image", side_effect=lambda img, lang="eng": f"OCR page {img.size[0]}"
+        ):
+            processor.process_contract(self.app_module.DB_PATH, "c1", self.stored_path, "tesseract")
+
+        self.assertEqual(calls, ["pdftotext", "pdftoppm", "pdftoppm"])
+        with self.app_module.db() as conn:
+            rows = conn.execute(
+                "SELECT page_number, text, source FROM ocr_pages WHERE contract_id = 'c1' ORDER BY page_number"
+            ).fetchall()
+        self.assertEqual(
+            [tuple(row) for row in rows],
+            [
+                (1, layer, "text_layer"),
+                (2, "OCR page 2", "ocr"),
+                (3, layer, "text_layer"),
+                (4, "OCR page 4", "ocr"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,308 @@
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept plain-text mail; records every DATA payload."""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.wfile.write(b"220 stand-in ESMTP\r\n")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith("EHLO") or command.startswith("HELO"):
+                self.wfile.write(b"250 stand-in\r\n")
+            elif command.startswith("RCPT TO:"):
+                if "REJECT" in command:
+                    self.wfile.write(b"550 no such user\r\n")
+                else:
+                    recipients.append(command)
+                    self.wfile.write(b"250 OK\r\n")
+            elif command.startswith("DATA"):
+                self.wfile.write(b"354 go ahead\r\n")
+                payload = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b".\r\n", b""):
+                        break
+                    payload.append(data_line)
+                with server.lock:
+                    server.messages.append(b"".join(payload))
+                recipients = []
+                self.wfile.write(b"250 queued\r\n")
+            elif command.startswith("QUIT"):
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                # MAIL FROM, RSET, NOOP
+                self.wfile.write(b"250 OK\r\n")
+
+
+class _SmtpStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+
+
+class ReminderDeliveryTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "false"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.server = _SmtpStandIn()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.env = patch.dict(
+            os.environ,
+            {
+                "SMTP_HOST": "127.0.0.1",
+                "SMTP_PORT": str(self.server.server_address[1]),
+                "SMTP_USE_TLS": "false",
+                "SMTP_FROM": "reminders@example.com",
+            },
+        )
+        self.env.start()
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM contracts")
+            conn.execute("DELETE FROM notification_logs")
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _seed(self, count, reject=()):
+        now = self.app_module.now_iso()
+        with self.app_module.db() as conn:
+            for i in range(count):
+                contract_id = f"c{i:03d}"
+                conn.execute(
+                    """
+                    INSERT INTO contracts
+                      (id, title, original_filename, sha256, stored_path, mime_type, uploaded_at, status)
+                    VALUES (?, ?, 'c.pdf', ?, 'c.pdf', 'application/pdf', ?, 'processed')
+                    """,
+                    (contract_id, f"Contract {i}", contract_id, now),
+                )
+                conn.execute(
+                    """
+                    INSERT INTO events (id, contract_id, event_type, event_date, derived_from_term_key, created_at)
+                    VALUES (?, ?, 'renewal', '2026-03-31', 'renewal_date', ?)
+                    """,
+                    (f"e{i:03d}", contract_id, now),
+                )
+                recipient = "reject@example.com" if i in reject else f"owner{i}@example.com"
+                conn.execute(
+                    """
+                    INSERT INTO reminder_settings (event_id, recipients, offsets_json, enabled, updated_at)
+                    VALUES (?, ?, '[30, 7]', 1, ?)
+                    """,
+                    (f"e{i:03d}", recipient, now),
+                )
+            self.app_module._refresh_reminder_schedule(conn)
+
+    def _statuses(self):
+        with self.app_module.db() as conn:
+            return {
+                row["event_id"]: (row["status"], row["error"])
+                for row in conn.execute(
+                    "SELECT event_id, status, error FROM reminder_sends WHERE offset_days = 30"
+                )
+            }
+
+    def _drain(self):
+        while self.app_module._dispatch_outbox_batch():
+            pass
+
+    def test_outbox_batch_reuses_a_bounded_number_of_sessions(self):
+        self._seed(12)
+        result = self.app_module._send_due_reminders(date(2026, 3, 1))
+        self.assertEqual((result["queued"], result["skipped"]), (12, 0))
+        self.assertEqual(self.server.messages, [])
+        self.assertEqual({status for status, _ in self._statuses().values()}, {"pending"})
+
+        # Queued but undelivered reminders are not queued twice.
+        again = self.app_module._send_due_reminders(date(2026, 3, 1))
+        self.assertEqual((again["queued"], again["skipped"]), (0, 12))
+
+        with patch.object(self.app_module, "SMTP_MAX_CONNECTIONS", 3):
+            self._drain()
+
+        self.assertEqual(len(self.server.messages), 12)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual({status for status, _ in self._statuses().values()}, {"sent"})
+        with self.app_module.db() as conn:
+            logged = conn.execute(
+                "SELECT COUNT(1) FROM notification_logs WHERE kind = 'event_reminder' AND status = 'sent'"
+            ).fetchone()[0]
+        self.assertEqual(logged, 12)
+
+    def test_refused_recipient_is_retried_then_recorded_without_stopping_the_batch(self):
+        self._seed(4, reject={1})
+        self.app_module._send_due_reminders(date(2026, 3, 1))
+        with patch.object(self.app_module, "SMTP_MAX_CONNECTIONS", 1), patch.object(
+            self.app_module, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 2
+        ):
+            self._drain()
+            statuses = self._statuses()
+            self.assertEqual(statuses["e003"], ("sent", None))
+            self.assertEqual(statuses["e001"][0], "pending")
+            with self.app_module.db() as conn:
+                row = conn.execute(
+                    "SELECT status, attempts, next_attempt_at FROM notification_logs WHERE related_id = 'e001'"
+                ).fetchone()
+                self.assertEqual((row["status"], row["attempts"]), ("queued", 1))
+                self.assertGreater(row["next_attempt_at"], self.app_module.now_iso())
+                conn.execute(
+                    "UPDATE notification_logs SET next_attempt_at = ? WHERE related_id = 'e001'",
+                    (self.app_module.now_iso(),),
+                )
+            self._drain()
+
+        statuses = self._statuses()
+        self.assertEqual(statuses["e001"][0], "error")
+        self.assertIn("SMTPRecipientsRefused", statuses["e001"][1])
+        self.assertEqual(len(self.server.messages), 3)
+        self.assertEqual(self.server.connections, 2)
+
+        # A failed reminder is queued again by the next run.
+        again = self.app_module._send_due_reminders(date(2026, 3, 1))
+        self.assertEqual(again["queued"], 1)
+
+    def _scheduled(self, event_id):
+        with self.app_module.db() as conn:
+            return [
+                (row["offset_days"], row["scheduled_for"])
+                for row in conn.execute(
+                    """
+                    SELECT offset_days, scheduled_for FROM reminder_schedule
+                    WHERE event_id = ? ORDER BY offset_days
+                    """,
+                    (event_id,),
+                )
+            ]
+
+    def test_schedule_follows_reminder_and_event_changes(self):
+        self._seed(1)
+        client = TestClient(self.app_module.app)
+        self.assertEqual(self._scheduled("e000"), [(7, "2026-03-24"), (30, "2026-03-01")])
+
+        res = client.put(
+            "/api/events/e000/reminders",
+            json={"recipients": ["owner0@example.com"], "offsets": [0, 10], "enabled": True},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._scheduled("e000"), [(0, "2026-03-31"), (10, "2026-03-21")])
+
+        res = client.put("/api/events/e000", json={"event_date": "2026-04-10"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._scheduled("e000"), [(0, "2026-04-10"), (10, "2026-03-31")])
+
+        client.put(
+            "/api/events/e000/reminders",
+            json={"recipients": ["owner0@example.com"], "offsets": [0, 10], "enabled": False},
+        )
+        self.assertEqual(self._scheduled("e000"), [])
+
+        client.put("/api/events/e000/reminders", json={"recipients": ["owner0@example.com"]})
+        self.assertEqual(client.delete("/api/events/e000").status_code, 200)
+        self.assertEqual(self._scheduled("e000"), [])
+
+    def test_daily_job_catches_up_on_missed_days(self):
+        self._seed(1)
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM job_runs WHERE job_name = ?", (self.app_module.REMINDER_JOB_NAME,))
+
+        first = self.app_module._run_reminder_job(date(2026, 2, 27))
+        self.assertEqual(first["queued"], 0)
+
+        # The 2026-03-01 reminder falls between runs and is still queued.
+        second = self.app_module._run_reminder_job(date(2026, 3, 5))
+        self.assertEqual((second["since"], second["queued"]), ("2026-02-27", 1))
+        self.assertEqual(self._statuses()["e000"][0], "pending")
+
+        third = self.app_module._run_reminder_job(date(2026, 3, 5))
+        self.assertEqual(third["queued"], 0)
+        with self.app_module.db() as conn:
+            statuses = [
+                row["status"]
+                for row in conn.execute(
+                    "SELECT status FROM job_runs WHERE job_name = ?",
+                    (self.app_module.REMINDER_JOB_NAME,),
+                )
+            ]
+        self.assertEqual(statuses, ["processed"] * 3)
+
+    def test_only_expired_claims_are_requeued(self):
+        self._seed(2)
+        self.app_module._send_due_reminders(date(2026, 3, 1))
+        with self.app_module.db() as conn:
+            # e000 is mid-send on another live worker; e001's worker died.
+            conn.execute(
+                """
+                UPDATE notification_logs
+                SET status = 'sending', claimed_by = 'other-worker',
+                    claim_expires_at = CASE related_id
+                      WHEN 'e000' THEN '2999-01-01T00:00:00Z' ELSE '2000-01-01T00:00:00Z' END
+                """
+            )
+            self.assertEqual(self.app_module._requeue_expired_outbox_claims(conn), 1)
+
+        self._drain()
+        self.assertEqual(len(self.server.messages), 1)
+        with self.app_module.db() as conn:
+            rows = {
+                row["related_id"]: (row["status"], row["claimed_by"])
+                for row in conn.execute("SELECT related_id, status, claimed_by FROM notification_logs")
+            }
+        self.assertEqual(rows, {"e000": ("sending", "other-worker"), "e001": ("sent", None)})
+
+    def test_nudge_returns_before_delivery(self):
+        self._seed(1)
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO tasks (id, title, due_date, reminders_json, assignees_json, created_at)
+                VALUES ('t1', 'Review', '2026-01-01', '[]', '["owner@example.com"]', ?)
+                """,
+                (self.app_module.now_iso(),),
+            )
+        res = TestClient(self.app_module.app).post("/api/tasks/t1/nudge")
+        self.assertEqual(res.json()["nudge"], "queued")
+        self.assertEqual(self.server.connections, 0)
+        self._drain()
+        self.assertEqual(len(self.server.messages), 1)
+
+if __name__ == "__main__":
+    unittest.main()
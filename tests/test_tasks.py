@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+
+class TaskListingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        os.environ["CONTRACT_DB"] = os.path.join(cls.temp_dir.name, "test.db")
+        os.environ["CONTRACT_DATA"] = os.path.join(cls.temp_dir.name, "data")
+        os.environ["AUTH_REQUIRED"] = "true"
+        os.environ["ADMIN_EMAIL"] = "admin@local.com"
+        os.environ["ADMIN_PASSWORD"] = "password"
+
+        import importlib
+        import app as app_module
+
+        cls.app_module = importlib.reload(app_module)
+        cls.app_module.init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.app_module._invalidate_session_cache()
+        with self.app_module.db() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM auth_sessions")
+            conn.execute("DELETE FROM auth_users WHERE email NOT IN ('admin@local.com')")
+            now = self.app_module.now_iso()
+            conn.execute(
+                """
+                INSERT INTO auth_users (name, email, password_hash, is_active, created_at, updated_at)
+                VALUES ('Member', 'member@example.com', ?, 1, ?, ?)
+                """,
+                (self.app_module.hash_password("secret"), now, now),
+            )
+
+    def _login(self, email, password):
+        client = TestClient(self.app_module.app)
+        res = client.post("/api/auth/login", json={"email": email, "password": password})
+        self.assertEqual(res.status_code, 200)
+        return client
+
+    def _create_tasks(self, admin, count):
+        for i in range(count):
+            assignees = ["Member@Example.com"] if i % 3 == 0 else ["other@example.com"]
+            res = admin.post(
+                "/api/tasks",
+                json={"title": f"Task {i}", "due_date": "2026-01-01", "assignees": assignees},
+            )
+            self.assertEqual(res.status_code, 200)
+
+    def test_assignee_filter_and_pagination_run_in_sql(self):
+        admin = self._login("admin@local.com", "password")
+        self._create_tasks(admin, 9)
+        with self.app_module.db() as conn:
+            admin_role_id = conn.execute(
+                "SELECT id FROM auth_roles WHERE name = 'admin'"
+            ).fetchone()["id"]
+            conn.execute("UPDATE tasks SET created_at = '2025-01-01T00:00:00Z'")
+        res = admin.put("/api/permissions/tasks_manage", json={"roles": [admin_role_id]})
+        self.assertEqual(res.status_code, 200)
+
+        self.assertEqual(admin.get("/api/tasks?limit=5").json()["total"], 9)
+
+        member = self._login("member@example.com", "secret")
+        first = member.get("/api/tasks?limit=2&offset=0").json()
+        second = member.get("/api/tasks?limit=2&offset=2").json()
+        self.assertEqual(first["total"], 3)
+        titles = sorted(item["title"] for item in first["items"] + second["items"])
+        self.assertEqual(titles, ["Task 0", "Task 3", "Task 6"])
+        self.assertEqual(first["items"][0]["assignees"], ["Member@Example.com"])
+
+        searched = member.get("/api/tasks?query=task%203").json()
+        self.assertEqual([item["title"] for item in searched["items"]], ["Task 3"])
+
+    def test_migration_backfills_assignees_from_json(self):
+        with self.app_module.db() as conn:
+            conn.execute(
+                """
+                INSERT INTO tasks (id, title, due_date, reminders_json, assignees_json, created_at)
+                VALUES ('legacy', 'Legacy', '2026-01-01', '[]', ?, '2024-01-01T00:00:00Z')
+                """,
+                (json.dumps(["A@example.com", " b@example.com ", "", "a@example.com"]),),
+            )
+            conn.execute("DROP TABLE task_assignees")
+            self.app_module._apply_migrations(conn)
+            rows = conn.execute(
+                "SELECT email FROM task_assignees WHERE task_id = 'legacy' ORDER BY email"
+            ).fetchall()
+        self.assertEqual([row["email"] for row in rows], ["a@example.com", "b@example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
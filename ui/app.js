@@ -10,7 +10,7 @@ const state = {
   contracts: [],
   allContracts: [],
   allContractsQuery: "",
-  allContractsOffset: 0,
+  allContractsCursor: "",
   allContractsLimit: 200,
   allContractsStatusFilter: "all",
   allContractsTypeFilter: "all",
@@ -45,6 +45,7 @@ const state = {
   notificationLogLimit: 40,
   notificationLogTotal: 0,
   notificationLogHasMore: false,
+  notificationLogCursor: null,
   notificationEventReminders: [],
   notificationPendingReminders: [],
   notificationTaskReminders: [],
@@ -1071,10 +1072,18 @@ async function updateTagPermissions(tagId, roles) {
   return res.json();
 }
 
-async function fetchNotificationLogs({ query = "", status = "all", kind = "all", limit = 40, offset = 0 } = {}) {
+async function fetchNotificationLogs({
+  query = "",
+  status = "all",
+  kind = "all",
+  limit = 40,
+  offset = 0,
+  cursor = null,
+} = {}) {
   const params = new URLSearchParams();
   params.set("limit", String(limit));
   params.set("offset", String(offset));
+  if (cursor) params.set("cursor", cursor);
   if (query) params.set("query", query);
   if (status) params.set("status", status);
   if (kind) params.set("kind", kind);
@@ -1389,7 +1398,7 @@ function renderAllContractsFilters() {
   const statusSelect = $("allContractsStatus");
   const typeSelect = $("allContractsType");
   if (statusSelect) {
-    const options = ["all", "processed", "processing", "error"];
+    const options = ["all", "processed", "queued", "processing", "error"];
     statusSelect.innerHTML = options
       .map((opt) => `<option value="${opt}">${titleCase(opt)}</option>`)
       .join("");
@@ -1537,14 +1546,14 @@ async function loadAllContracts(reset = true) {
   const status = $("allContractsStatus");
   const loadMoreBtn = $("allContractsLoadMore");
   if (reset) {
-    state.allContractsOffset = 0;
+    state.allContractsCursor = "";
     state.allContracts = [];
     if (status) status.textContent = "Loading contracts…";
   }
 
   const params = new URLSearchParams({
     limit: String(state.allContractsLimit),
-    offset: String(state.allContractsOffset),
+    cursor: state.allContractsCursor || "",
     include_tags: "false",
   });
   if (state.allContractsStatusFilter && state.allContractsStatusFilter !== "all") {
@@ -1560,17 +1569,18 @@ async function loadAllContracts(reset = true) {
 
   try {
     const res = await apiFetch(`/api/contracts?${params.toString()}`);
-    const rows = await res.json();
+    const data = await res.json();
+    const rows = data.items || [];
     state.allContracts = reset ? rows : state.allContracts.concat(rows);
     renderAllContractsTable(rows, !reset);
-    state.allContractsOffset += rows.length;
+    state.allContractsCursor = data.next_cursor || "";
 
     if (status) {
       status.textContent = `Showing ${state.allContracts.length} contract${state.allContracts.length === 1 ? "" : "s"}.`;
     }
 
     if (loadMoreBtn) {
-      loadMoreBtn.disabled = rows.length < state.allContractsLimit;
+      loadMoreBtn.disabled = !data.next_cursor;
     }
   } catch (e) {
     if (status) status.textContent = e.message;
@@ -1777,6 +1787,11 @@ function renderContractDetail(data) {
             </select>
             <button class="save-term" data-term="${t.term_key}">Save</button>
             <button class="delete-term" data-term="${t.term_key}">Delete</button>
+            ${
+              t.source_page
+                ? `<button class="link-button view-term-source" type="button" data-page="${t.source_page}" data-start="${t.source_start ?? ""}" data-end="${t.source_end ?? ""}">Source: page ${t.source_page}</button>`
+                : ""
+            }
           </div>
         </details>`
         )
@@ -2027,7 +2042,8 @@ function renderContractDetail(data) {
   const contentDetails = $("contractContent");
   if (contentDetails) {
     const loadPreview = () => {
-      if (contentDetails.dataset.loaded) return;
+      // A term's source page is showing; the full text loads the next time the panel opens.
+      if (contentDetails.dataset.loaded || contentDetails.dataset.sourceShown) return;
       contentDetails.dataset.loaded = "true";
       loadContractText(c.id);
     };
@@ -2035,7 +2051,10 @@ function renderContractDetail(data) {
       loadPreview();
     }
     contentDetails.addEventListener("toggle", () => {
-      if (!contentDetails.open) return;
+      if (!contentDetails.open) {
+        delete contentDetails.dataset.sourceShown;
+        return;
+      }
       loadPreview();
     });
   }
@@ -2087,6 +2106,21 @@ function renderContractDetail(data) {
     }
   });
 
+  document.querySelectorAll(".view-term-source").forEach((btn) => {
+    btn.addEventListener("click", () => {
+      if (contentDetails) {
+        // Show just the source page instead of loading the whole document text.
+        delete contentDetails.dataset.loaded;
+        contentDetails.dataset.sourceShown = "true";
+        contentDetails.open = true;
+        contentDetails.scrollIntoView({ behavior: "smooth", block: "start" });
+      }
+      const start = btn.dataset.start === "" ? null : Number(btn.dataset.start);
+      const end = btn.dataset.end === "" ? null : Number(btn.dataset.end);
+      loadContractPage(c.id, Number(btn.dataset.page), start, end);
+    });
+  });
+
   document.querySelectorAll(".save-term").forEach((btn) => {
     btn.addEventListener("click", async () => {
       const termKey = btn.dataset.term;
@@ -2281,6 +2315,33 @@ async function loadContractText(contractId) {
   }
 }
 
+async function loadContractPage(contractId, pageNumber, start, end) {
+  const textEl = $("contractText");
+  if (!textEl) return;
+  textEl.textContent = `Loading page ${pageNumber}…`;
+  try {
+    const res = await apiFetch(`/api/contracts/${contractId}/ocr-text?page=${pageNumber}`);
+    const data = await res.json();
+    const page = (data.pages || [])[0];
+    if (!page) {
+      textEl.textContent = `Page ${pageNumber} has no OCR text.`;
+      return;
+    }
+    const header = `--- Page ${page.page_number} ---\n`;
+    const text = page.text || "";
+    if (start === null || end === null || end <= start) {
+      textEl.textContent = header + text;
+      return;
+    }
+    textEl.innerHTML = `${escapeHtml(header + text.slice(0, start))}<mark>${escapeHtml(
+      text.slice(start, end)
+    )}</mark>${escapeHtml(text.slice(end))}`;
+    textEl.querySelector("mark")?.scrollIntoView({ block: "center" });
+  } catch (e) {
+    textEl.textContent = `Unable to load OCR text: ${e.message}`;
+  }
+}
+
 async function reprocessContract(contractId) {
   const ok = await showConfirm("Reprocess this contract? This will re-run OCR and extraction.", {
     confirmText: "Reprocess",
@@ -2350,21 +2411,27 @@ function delay(ms) {
 
 async function pollContractStatus(contractId, fileName) {
   const log = $("uploadLog");
-  const maxAttempts = 12;
+  const maxAttempts = 120;
   for (let attempt = 1; attempt <= maxAttempts; attempt += 1) {
     await delay(2500);
     try {
-      const res = await apiFetch(`/api/contracts/${contractId}`);
+      const res = await apiFetch(`/api/contracts/${contractId}/status`);
       const data = await res.json();
       const status = (data.status || "processing").toLowerCase();
-      const note =
-        status === "processing"
-          ? `Checking processing… (${attempt}/${maxAttempts})`
-          : "Processing complete.";
+      const pending = status === "queued" || status === "processing";
+      let note = "Processing complete.";
+      if (status === "queued") {
+        const position = data.job?.queue_position;
+        note = position ? `Waiting in queue (position ${position})…` : "Waiting in queue…";
+      } else if (status === "processing") {
+        note = `Processing… ${data.progress || 0}%`;
+      } else if (status === "error") {
+        note = data.job?.detail ? `Processing failed: ${escapeHtml(data.job.detail)}` : "Processing failed.";
+      }
       if (log) {
         log.innerHTML = `Uploaded: <b>${escapeHtml(fileName)}</b> → ${badge(status)} <span class="muted small">${contractId}</span> <span class="muted small">${note}</span>`;
       }
-      if (status !== "processing") {
+      if (!pending) {
         await loadRecent();
         return;
       }
@@ -2397,7 +2464,7 @@ async function uploadFiles(files) {
       const j = await res.json();
       log.innerHTML = `Uploaded: <b>${escapeHtml(file.name)}</b> → ${badge(j.status)} <span class="muted small">${j.contract_id}</span>`;
       await loadRecent();
-      if ((j.status || "").toLowerCase() === "processing") {
+      if (["queued", "processing"].includes((j.status || "").toLowerCase())) {
         await pollContractStatus(j.contract_id, file.name);
       }
     } catch (e) {
@@ -3884,8 +3951,8 @@ function renderPendingAgreementsQueue() {
       try {
         const response = await nudgePendingAgreement(agreement.id);
         const recipients = response.recipients?.join(", ") || agreement.owner;
-        await showAlert(`Nudge email sent for "${agreement.matter || agreement.title}" to ${recipients}.`, {
-          title: "Nudge sent",
+        await showAlert(`Nudge email queued for "${agreement.matter || agreement.title}" to ${recipients}.`, {
+          title: "Nudge queued",
         });
       } catch (err) {
         await showAlert(`Unable to send nudge. ${err.message}`, { title: "Nudge failed" });
@@ -3985,8 +4052,8 @@ function renderTaskTable() {
       try {
         const response = await nudgeTask(task.id);
         const recipients = response.recipients?.join(", ") || "assigned users";
-        await showAlert(`Nudge email sent for "${task.title}" to ${recipients}.`, {
-          title: "Nudge sent",
+        await showAlert(`Nudge email queued for "${task.title}" to ${recipients}.`, {
+          title: "Nudge queued",
         });
       } catch (err) {
         await showAlert(`Unable to send nudge. ${err.message}`, { title: "Nudge failed" });
@@ -4510,6 +4577,7 @@ async function loadNotificationOverview() {
 async function loadNotificationLogs({ reset = false } = {}) {
   if (reset) {
     state.notificationLogOffset = 0;
+    state.notificationLogCursor = null;
     state.notificationLogs = [];
   }
   const res = await fetchNotificationLogs({
@@ -4518,6 +4586,7 @@ async function loadNotificationLogs({ reset = false } = {}) {
     kind: state.notificationLogKind,
     limit: state.notificationLogLimit,
     offset: state.notificationLogOffset,
+    cursor: state.notificationLogCursor,
   });
   const data = await res.json();
   const items = data.items || [];
@@ -4528,8 +4597,9 @@ async function loadNotificationLogs({ reset = false } = {}) {
   }
   state.notificationLogTotal = data.total || 0;
   state.notificationLogLimit = data.limit || state.notificationLogLimit;
-  state.notificationLogOffset = (data.offset || 0) + items.length;
-  state.notificationLogHasMore = state.notificationLogOffset < state.notificationLogTotal;
+  state.notificationLogOffset = state.notificationLogs.length;
+  state.notificationLogCursor = data.next_cursor || null;
+  state.notificationLogHasMore = Boolean(state.notificationLogCursor);
   $("notificationLogLoadMore")?.classList.toggle("hidden", !state.notificationLogHasMore);
   renderNotificationLogTable();
 }